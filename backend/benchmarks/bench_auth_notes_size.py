@@ -0,0 +1,75 @@
+"""
+Benchmark of the auth dependency cost as a function of notes size
+
+Compares get_current_user() with the deferred goals/notes columns against
+eagerly loading them (the previous mapping). Run from the backend directory:
+    python -m benchmarks.bench_auth_notes_size
+"""
+
+import os
+import statistics
+import tempfile
+import time
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_auth_notes_size.db"
+
+from sqlalchemy.orm import undefer_group  # noqa: E402
+
+from src.repository.database import SessionLocal, User, init_db  # noqa: E402
+from src.services.auth_service import (  # noqa: E402
+    create_access_token,
+    get_current_user,
+    get_user_id_from_token,
+)
+
+NOTES_SIZES = [0, 1_024, 16_384, 262_144, 1_048_576]
+ITERATIONS = 500
+
+
+def eager_current_user(db, token):
+    """get_current_user() as it behaved before the columns were deferred"""
+    user_id = get_user_id_from_token(token)
+    return (
+        db.query(User)
+        .options(undefer_group("context"))
+        .filter(User.id == user_id)
+        .first()
+    )
+
+
+def measure(lookup, token) -> float:
+    samples = []
+    for _ in range(ITERATIONS):
+        db = SessionLocal()
+        started = time.perf_counter()
+        lookup(db, token)
+        samples.append((time.perf_counter() - started) * 1_000_000)
+        db.close()
+    return statistics.median(samples)
+
+
+def main():
+    init_db()
+    db = SessionLocal()
+    tokens = {}
+    for size in NOTES_SIZES:
+        user = User(
+            email=f"bench-{size}@example.com",
+            hashed_password="x" * 60,
+            goals="g" * (size // 4),
+            notes="n" * size,
+        )
+        db.add(user)
+        db.commit()
+        tokens[size] = create_access_token({"sub": str(user.id)})
+    db.close()
+
+    print(f"{'notes bytes':>12}  {'deferred p50':>14}  {'eager p50':>12}")
+    for size, token in tokens.items():
+        deferred = measure(get_current_user, token)
+        eager = measure(eager_current_user, token)
+        print(f"{size:>12}  {deferred:>11.1f} us  {eager:>9.1f} us")
+
+
+if __name__ == "__main__":
+    main()
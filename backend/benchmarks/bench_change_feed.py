@@ -0,0 +1,75 @@
+"""
+Change feed benchmark
+
+Times the cost the change feed adds to task writes: staging and publishing
+for a user with no connections (the common case), and fan-out to N
+subscribed connections of one user (default 1000) until every queue has
+received the event. Run from the backend directory:
+    python -m benchmarks.bench_change_feed [connections]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_change_feed.db"
+
+from src.repository.change_feed import ChangeFeed  # noqa: E402
+from src.repository.database import SessionLocal, User, init_db  # noqa: E402
+from src.repository.repositories import TaskRepository  # noqa: E402
+from src.schemas import TaskCreate  # noqa: E402
+
+ROUNDS = 2000
+WRITES = 500
+
+
+def bench_writes():
+    """Median create_task latency; publishing finds no subscribers"""
+    init_db()
+    db = SessionLocal()
+    user = User(email="bench@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    samples = []
+    for i in range(WRITES):
+        started = time.perf_counter()
+        TaskRepository.create_task(db, user.id, TaskCreate(title=f"task {i}"))
+        samples.append((time.perf_counter() - started) * 1000)
+    db.close()
+    print(f"create_task, no connections: {statistics.median(samples):.3f} ms median")
+
+
+async def bench_fanout(connections: int):
+    feed = ChangeFeed(queue_size=ROUNDS + 1)
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        feed.publish(1, {"type": "tasks.changed", "changed": [1], "deleted": []})
+    idle = (time.perf_counter() - started) / ROUNDS * 1e6
+    print(f"publish, no connections: {idle:.2f} us")
+
+    subscriptions = [feed.subscribe(1) for _ in range(connections)]
+    samples = []
+    for i in range(200):
+        started = time.perf_counter()
+        feed.publish(1, {"type": "tasks.changed", "changed": [i], "deleted": []})
+        # Let the loop run the queued deliveries
+        await asyncio.sleep(0)
+        samples.append((time.perf_counter() - started) * 1000)
+    delivered = sum(sub.queue.qsize() for sub in subscriptions)
+    print(
+        f"publish to {connections:,} connections: "
+        f"{statistics.median(samples):.2f} ms median ({delivered:,} events queued)"
+    )
+
+
+def main():
+    connections = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    bench_writes()
+    asyncio.run(bench_fanout(connections))
+
+
+if __name__ == "__main__":
+    main()
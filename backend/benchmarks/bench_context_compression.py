@@ -0,0 +1,127 @@
+"""
+Storage and read-latency benchmark for compressed context text
+
+Builds the same synthetic goals/notes corpus in three SQLite files (plain,
+zstd, zstd with a trained dictionary) and reports file size and the latency
+of UserRepository.get_user_context(). Run from the backend directory:
+    python -m benchmarks.bench_context_compression
+"""
+
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.repository import compression
+from src.repository.database import Base, User
+from src.repository.repositories import UserRepository
+
+USERS = 2000
+READS = 5000
+
+VOCABULARY = (
+    "learn build ship fastapi langchain gemini react native mobile app backend "
+    "frontend portfolio project documentation tests deploy weekly daily goal "
+    "focus habit routine morning evening workout run sleep read book course "
+    "chapter notes meeting team mentor career job interview resume budget save "
+    "invest family friends health energy priority deadline sprint review plan"
+).split()
+PHRASES = [
+    "Currently focused on {} and {}.",
+    "Want to spend more time on {} this {}.",
+    "- [ ] {} the {}",
+    "Remember: {} before {}!",
+    "Idea: combine {} with {} for the next release.",
+]
+
+
+def synthetic_text(rng: random.Random) -> str:
+    target = int(rng.lognormvariate(7.5, 1.2))  # median ~1.8 KB, long tail
+    parts, size = [], 0
+    while size < target:
+        words = rng.choices(VOCABULARY, k=2)
+        line = rng.choice(PHRASES).format(*words)
+        parts.append(line)
+        size += len(line) + 1
+    return "\n".join(parts)
+
+
+def configure(threshold: int, dictionary=None):
+    compression.CONTEXT_COMPRESSION_THRESHOLD = threshold
+    compression._write_dictionary = dictionary
+    compression._dictionaries = {dictionary.dict_id(): dictionary} if dictionary else {}
+    compression._local = threading.local()
+
+
+def run(label: str, corpus, directory: str):
+    path = os.path.join(directory, f"{label}.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+
+    db = Session()
+    started = time.perf_counter()
+    for i, (goals, notes) in enumerate(corpus):
+        db.add(
+            User(
+                email=f"u{i}@example.com", hashed_password="x", goals=goals, notes=notes
+            )
+        )
+    db.commit()
+    write_s = time.perf_counter() - started
+    ids = [row.id for row in db.query(User.id)]
+    db.close()
+
+    with engine.connect() as conn:
+        conn.exec_driver_sql("VACUUM")
+    engine.dispose()
+    engine = create_engine(f"sqlite:///{path}")
+    Session = sessionmaker(bind=engine)
+
+    rng = random.Random(7)
+    samples = []
+    db = Session()
+    for _ in range(READS):
+        user_id = rng.choice(ids)
+        started = time.perf_counter()
+        UserRepository.get_user_context(db, user_id)
+        samples.append((time.perf_counter() - started) * 1_000_000)
+    db.close()
+    engine.dispose()
+
+    samples.sort()
+    print(
+        f"{label:<10} file={os.path.getsize(path) / 1024:9.1f} KB  "
+        f"write={write_s:6.2f} s  read p50={statistics.median(samples):7.1f} us  "
+        f"p99={samples[int(len(samples) * 0.99)]:7.1f} us"
+    )
+
+
+def main():
+    rng = random.Random(42)
+    corpus = [(synthetic_text(rng), synthetic_text(rng)) for _ in range(USERS)]
+    raw = sum(len(g.encode()) + len(n.encode()) for g, n in corpus)
+    print(f"corpus: {USERS} users, {raw / 1024:.1f} KB of goals+notes text")
+
+    directory = tempfile.mkdtemp()
+    configure(threshold=1 << 62)
+    run("plain", corpus, directory)
+
+    configure(threshold=1024)
+    run("zstd", corpus, directory)
+
+    samples = [text for pair in corpus[: USERS // 2] for text in pair]
+    dictionary = compression.zstandard.ZstdCompressionDict(
+        compression.train_dictionary(samples)
+    )
+    configure(threshold=256, dictionary=dictionary)
+    run("zstd+dict", corpus, directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Latency benchmark for the local (LLM-free) suggestion engine
+
+Run from the backend directory:
+    python -m benchmarks.bench_local_suggestions
+"""
+
+import random
+import statistics
+import time
+
+from src.services.local_suggestion_service import (
+    DEFAULT_TASK_TEMPLATES,
+    LocalSuggestionService,
+)
+
+GOALS = [
+    "Learn FastAPI and LangChain for AI backend development",
+    "Build a portfolio project to showcase full-stack skills",
+    "Get fit and run a half marathon this year",
+    "Save money for a house and stick to a monthly budget",
+    "Find a new job as a mobile developer",
+]
+NOTES = [
+    "Currently focused on backend development with AI integration",
+    "Prefer short tasks (30 mins) over long ones",
+    "Available 2 hours per day for side projects",
+    "Struggling with distractions and sleep",
+]
+QUERIES = [
+    "Suggest tasks for today",
+    "What should I work on to reach my goals?",
+    "Give me quick wins for this week",
+    "Help me improve my productivity",
+]
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def run(library_size: int, iterations: int = 2000):
+    templates = [
+        {
+            "title": f"{t['title']} #{i}",
+            "reason": t["reason"],
+            "keywords": t["keywords"],
+        }
+        for i in range(library_size // len(DEFAULT_TASK_TEMPLATES) + 1)
+        for t in DEFAULT_TASK_TEMPLATES
+    ][:library_size]
+
+    started = time.perf_counter()
+    service = LocalSuggestionService(templates)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    rng = random.Random(42)
+    samples = []
+    for _ in range(iterations):
+        goals = " ".join(rng.sample(GOALS, 2)) * rng.randint(1, 10)
+        notes = " ".join(rng.sample(NOTES, 2)) * rng.randint(1, 10)
+        query = rng.choice(QUERIES)
+        started = time.perf_counter()
+        service.suggest(goals, notes, query)
+        samples.append((time.perf_counter() - started) * 1000)
+
+    print(
+        f"templates={service.template_count:>6}  build={build_ms:8.2f} ms  "
+        f"p50={statistics.median(samples):.3f} ms  "
+        f"p99={_percentile(samples, 0.99):.3f} ms  max={max(samples):.3f} ms"
+    )
+
+
+if __name__ == "__main__":
+    for size in (len(DEFAULT_TASK_TEMPLATES), 1_000, 10_000):
+        run(size)
@@ -0,0 +1,144 @@
+"""
+Metrics overhead benchmark
+
+Times what metric collection adds to a request: the metrics middleware
+around a minimal ASGI app against the bare app, a histogram observation and
+a counter increment on their own, and the query instrumentation around a
+trivial query. Finally N threads record concurrently to check that the
+per-thread shards lose no updates, and a scrape is timed. Run from the
+backend directory:
+    python -m benchmarks.bench_metrics [threads]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_metrics.db"
+
+from sqlalchemy import create_engine, text  # noqa: E402
+
+from src.metrics import Counter, Histogram, instrument_engine, registry  # noqa: E402
+from src.middleware.metrics import MetricsMiddleware  # noqa: E402
+
+ROUNDS = 20
+CALLS = 20_000
+PER_THREAD = 100_000
+
+
+def best_of(fn, calls: int = CALLS) -> float:
+    """Median microseconds per call over ROUNDS batches"""
+    samples = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        fn(calls)
+        samples.append((time.perf_counter() - started) / calls * 1e6)
+    return statistics.median(samples)
+
+
+class _Route:
+    path = "/api/v1/tasks/{task_id}"
+
+
+async def bare_app(scope, receive, send):
+    scope["route"] = _Route
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _noop(message):
+    pass
+
+
+def bench_middleware():
+    loop = asyncio.new_event_loop()
+    measured = MetricsMiddleware(bare_app)
+
+    def requests(app):
+        async def run(calls):
+            for _ in range(calls):
+                scope = {"type": "http", "method": "GET", "path": "/api/v1/tasks/1"}
+                await app(scope, None, _noop)
+
+        return lambda calls: loop.run_until_complete(run(calls))
+
+    bare = best_of(requests(bare_app))
+    wrapped = best_of(requests(measured))
+    loop.close()
+    print(f"request, bare app            {bare:6.2f} us")
+    print(f"request, metrics middleware  {wrapped:6.2f} us  (+{wrapped - bare:.2f} us)")
+
+
+def bench_primitives():
+    histogram = Histogram("bench_seconds", "Benchmark", ("route",))
+    counter = Counter("bench_total", "Benchmark", ("route", "status"))
+
+    def observe(calls):
+        for _ in range(calls):
+            histogram.observe(("GET", "/x"), 0.0042)
+
+    def inc(calls):
+        for _ in range(calls):
+            counter.inc(("GET", "/x", 200))
+
+    print(f"histogram observe            {best_of(observe):6.2f} us")
+    print(f"counter inc                  {best_of(inc):6.2f} us")
+
+
+def bench_queries():
+    plain = create_engine("sqlite://")
+    measured = create_engine("sqlite://")
+    instrument_engine(measured, "bench")
+
+    def queries(engine):
+        def run(calls):
+            with engine.connect() as conn:
+                for _ in range(calls):
+                    conn.execute(text("SELECT 1"))
+
+        return run
+
+    bare = best_of(queries(plain), 5000)
+    wrapped = best_of(queries(measured), 5000)
+    print(f"query, plain engine          {bare:6.2f} us")
+    print(f"query, instrumented engine   {wrapped:6.2f} us  (+{wrapped - bare:.2f} us)")
+
+
+def bench_threads(threads: int):
+    counter = Counter("bench_threads_total", "Benchmark")
+
+    def work():
+        for _ in range(PER_THREAD):
+            counter.inc()
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    total = counter._totals()[()]
+    print(
+        f"{threads} threads x {PER_THREAD:,} increments: {total:,} counted "
+        f"({'no' if total == threads * PER_THREAD else 'LOST'} lost updates)"
+    )
+
+    started = time.perf_counter()
+    body = registry.render()
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"scrape: {elapsed:.2f} ms for {len(body.splitlines())} lines")
+
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    bench_middleware()
+    bench_primitives()
+    bench_queries()
+    bench_threads(threads)
+
+
+if __name__ == "__main__":
+    main()
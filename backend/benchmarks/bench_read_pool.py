@@ -0,0 +1,148 @@
+"""
+Read pool benchmark - mixed read/write workload
+
+Runs reader threads (task stats and a task list for a random user) next to
+writer threads that insert tasks inside deliberately slow transactions,
+first with every session on the primary engine and then with readers on
+the read-only pool. Reports read latency percentiles and throughput.
+Run from the backend directory:
+    python -m benchmarks.bench_read_pool [readers] [seconds]
+"""
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_read_pool.db"
+
+from sqlalchemy import insert  # noqa: E402
+
+from src.repository.database import (  # noqa: E402
+    ReadSessionLocal,
+    SessionLocal,
+    Task,
+    User,
+    init_db,
+)
+from src.repository.repositories import TaskRepository  # noqa: E402
+
+USERS = 50
+TASKS_PER_USER = 200
+WRITERS = 2
+WRITE_BATCH = 50
+# Time a write transaction stays open, as in a large import or archive batch
+WRITE_HOLD_SECONDS = 0.02
+
+
+def load(db):
+    users = [
+        User(email=f"bench{i}@example.com", hashed_password="x") for i in range(USERS)
+    ]
+    db.add_all(users)
+    db.commit()
+    now = datetime.now(timezone.utc)
+    db.execute(
+        insert(Task),
+        [
+            {
+                "user_id": user.id,
+                "title": f"task {i} for user {user.id}",
+                "is_completed": i % 3 == 0,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for user in users
+            for i in range(TASKS_PER_USER)
+        ],
+    )
+    db.commit()
+    return [user.id for user in users]
+
+
+def run(read_factory, user_ids, readers: int, seconds: float):
+    stop = threading.Event()
+    latencies, writes = [], [0]
+    lock = threading.Lock()
+
+    def reader():
+        rng = random.Random()
+        samples = []
+        while not stop.is_set():
+            user_id = rng.choice(user_ids)
+            started = time.perf_counter()
+            db = read_factory()
+            try:
+                TaskRepository.get_task_statistics(db, user_id)
+                TaskRepository.get_task_rows(db, user_id, ("id", "title"))
+            finally:
+                db.close()
+            samples.append((time.perf_counter() - started) * 1000)
+        with lock:
+            latencies.extend(samples)
+
+    def writer():
+        rng = random.Random()
+        while not stop.is_set():
+            user_id = rng.choice(user_ids)
+            db = SessionLocal()
+            try:
+                db.execute(
+                    insert(Task),
+                    [
+                        {"user_id": user_id, "title": "written", "is_completed": False}
+                        for _ in range(WRITE_BATCH)
+                    ],
+                )
+                time.sleep(WRITE_HOLD_SECONDS)
+                db.commit()
+                with lock:
+                    writes[0] += 1
+            finally:
+                db.close()
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer) for _ in range(WRITERS)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    return (
+        statistics.median(latencies),
+        p99,
+        len(latencies) / seconds,
+        writes[0] / seconds,
+    )
+
+
+def main():
+    readers = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5
+    init_db()
+    db = SessionLocal()
+    user_ids = load(db)
+    db.close()
+
+    print(f"{readers} readers, {WRITERS} writers, {seconds:.0f} s per run")
+    for label, factory in (
+        ("primary engine only", SessionLocal),
+        ("read-only pool", ReadSessionLocal),
+    ):
+        p50, p99, reads, writes = run(factory, user_ids, readers, seconds)
+        print(
+            f"{label:<20} read p50 {p50:6.2f} ms  p99 {p99:7.2f} ms  "
+            f"{reads:7.0f} reads/s  {writes:5.1f} write txns/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
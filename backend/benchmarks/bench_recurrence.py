@@ -0,0 +1,123 @@
+"""
+Recurring task benchmark
+
+Times next-occurrence evaluation over a mix of rules and timezones, then
+loads N recurrence rules (default 100k) of which about 1% are due and times
+the scheduler: one sweep that creates the due occurrences, and an idle
+sweep where nothing is due. Run from the backend directory:
+    python -m benchmarks.bench_recurrence [rule_count]
+"""
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_recurrence.db"
+
+from sqlalchemy import insert  # noqa: E402
+
+from src.repository.database import (  # noqa: E402
+    RecurrenceRule,
+    SessionLocal,
+    User,
+    init_db,
+)
+from src.repository.recurrence import next_occurrence, parse_rrule  # noqa: E402
+from src.repository.repositories import RecurrenceRepository  # noqa: E402
+
+ROUNDS = 20
+USERS = 100
+DUE_EVERY = 100
+
+RULES = (
+    "FREQ=DAILY",
+    "FREQ=DAILY;INTERVAL=3",
+    "FREQ=WEEKLY;BYDAY=MO,WE,FR",
+    "FREQ=WEEKLY;INTERVAL=2;BYDAY=TU",
+    "FREQ=MONTHLY;BYMONTHDAY=1,15",
+    "FREQ=MONTHLY;BYMONTHDAY=-1",
+)
+ZONES = ("UTC", "America/New_York", "Europe/Berlin", "Asia/Kolkata")
+
+
+def bench_evaluation(count: int):
+    rng = random.Random(7)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    cases = [
+        (
+            parse_rrule(rng.choice(RULES)),
+            now - timedelta(days=rng.randint(0, 3650), minutes=rng.randint(0, 1440)),
+            ZoneInfo(rng.choice(ZONES)),
+        )
+        for _ in range(count)
+    ]
+    started = time.perf_counter()
+    for rule, start, tz in cases:
+        next_occurrence(rule, start, now, tz)
+    elapsed = time.perf_counter() - started
+    print(
+        f"next_occurrence: {count:,} rules in {elapsed:.2f} s "
+        f"({elapsed / count * 1e6:.1f} us/rule)"
+    )
+
+
+def load(db, count: int, now: datetime):
+    users = [
+        User(email=f"bench{i}@example.com", hashed_password="x", timezone=ZONES[i % 4])
+        for i in range(USERS)
+    ]
+    db.add_all(users)
+    db.commit()
+    naive = now.replace(tzinfo=None)
+    db.execute(
+        insert(RecurrenceRule),
+        [
+            {
+                "user_id": users[i % USERS].id,
+                "title": f"recurring task {i}",
+                "rule": RULES[i % len(RULES)],
+                "starts_at": naive - timedelta(days=30),
+                "next_due_at": naive
+                - timedelta(minutes=1 if i % DUE_EVERY == 0 else -60 * 24),
+                "occurrence_count": 0,
+                "created_at": naive - timedelta(days=30),
+            }
+            for i in range(count)
+        ],
+    )
+    db.commit()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    bench_evaluation(count)
+
+    init_db()
+    db = SessionLocal()
+    now = datetime.now(timezone.utc)
+    load(db, count, now)
+
+    started = time.perf_counter()
+    created = RecurrenceRepository.materialize_due(db, now, batch_size=count)
+    elapsed = time.perf_counter() - started
+    print(
+        f"due sweep: {created:,} occurrences from {count:,} rules in "
+        f"{elapsed * 1000:.1f} ms ({elapsed / max(created, 1) * 1000:.2f} ms each)"
+    )
+
+    samples = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        RecurrenceRepository.materialize_due(db, now)
+        samples.append((time.perf_counter() - started) * 1000)
+    print(f"idle sweep: {statistics.median(samples):.2f} ms median")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
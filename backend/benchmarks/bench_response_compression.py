@@ -0,0 +1,102 @@
+"""
+Response compression benchmark
+
+Compresses representative payloads with each encoding the middleware can
+negotiate and reports bytes on the wire and CPU time per response: a 5-item
+AI suggestion response, 1k and 10k task lists (single body) and a 10k-row
+NDJSON export (streamed in 1000-row chunks, flushed per chunk). Run from
+the backend directory:
+    python -m benchmarks.bench_response_compression
+"""
+
+import statistics
+import time
+from datetime import datetime, timezone
+
+from src.api.serialization import ai_suggestion_adapter, task_list_response
+from src.middleware.compression import SUPPORTED_ENCODINGS, _Encoder
+from src.repository.database import Tag, Task
+from src.schemas import AISuggestionResponse, SuggestedTask
+from src.services.export_service import encode_ndjson
+
+ROUNDS = 20
+
+
+def make_tasks(count: int):
+    now = datetime.now(timezone.utc)
+    tags = [Tag(id=1, user_id=1, name="work"), Tag(id=2, user_id=1, name="health")]
+    titles = ["Review pull requests", "Plan sprint", "Write report", "Call dentist"]
+    return [
+        Task(
+            id=i,
+            user_id=1,
+            title=f"{titles[i % len(titles)]} #{i}",
+            is_completed=i % 2 == 0,
+            created_at=now,
+            updated_at=now,
+            completed_at=now if i % 2 == 0 else None,
+            tags=tags[: i % 3],
+            version=1,
+        )
+        for i in range(count)
+    ]
+
+
+class _Row:
+    def __init__(self, task: Task):
+        self.id, self.title, self.is_completed = task.id, task.title, task.is_completed
+        self.created_at, self.updated_at = task.created_at, task.updated_at
+        self.completed_at = task.completed_at
+        self.tags = "\x1f".join(tag.name for tag in task.tags) or None
+
+
+def measure(encoding: str, chunks) -> tuple:
+    samples, size = [], 0
+    for _ in range(ROUNDS):
+        started = time.thread_time()
+        encoder = _Encoder(encoding)
+        size = sum(len(encoder.chunk(chunk)) for chunk in chunks[:-1])
+        size += len(encoder.finish(chunks[-1]))
+        samples.append((time.thread_time() - started) * 1000)
+    return size, statistics.median(samples)
+
+
+def main():
+    suggestions = AISuggestionResponse(
+        success=True,
+        suggestions=[
+            SuggestedTask(
+                title=f"Suggested task {i}",
+                reason="Breaking the goal into small steps keeps momentum",
+            )
+            for i in range(5)
+        ],
+        message="Generated 5 suggestions",
+        query_context="Goals: ship the app, learn FastAPI | Notes: mornings are best",
+    )
+    stats = {"total": 0, "completed": 0, "pending": 0}
+    export_tasks = [_Row(t) for t in make_tasks(10_000)]
+    payloads = {
+        "AI suggestions": [ai_suggestion_adapter.dump_json(suggestions)],
+        "task list 1k": [task_list_response(make_tasks(1000), stats).body],
+        "task list 10k": [task_list_response(make_tasks(10_000), stats).body],
+        "export 10k (stream)": list(
+            encode_ndjson(
+                export_tasks[i : i + 1000] for i in range(0, len(export_tasks), 1000)
+            )
+        ),
+    }
+
+    for name, chunks in payloads.items():
+        raw = sum(map(len, chunks))
+        print(f"{name}: {raw:,} bytes uncompressed")
+        for encoding in SUPPORTED_ENCODINGS:
+            size, cpu_ms = measure(encoding, chunks)
+            print(
+                f"  {encoding:5s} {size:>10,} bytes ({raw / size:5.1f}x)  "
+                f"{cpu_ms:7.3f} ms CPU"
+            )
+
+
+if __name__ == "__main__":
+    main()
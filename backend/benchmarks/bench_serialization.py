@@ -0,0 +1,125 @@
+"""
+Response serialization benchmark
+
+Compares the previous GET /tasks serialization path (per-task
+model_validate, then FastAPI's serialize_response and JSONResponse) with
+the precompiled TypeAdapter path in src.api.serialization, for 1k and 10k
+task payloads and for an AISuggestionResponse. No database or HTTP is
+involved. Run from the backend directory:
+    python -m benchmarks.bench_serialization
+"""
+
+import asyncio
+import statistics
+import time
+from datetime import datetime, timezone
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from src.api.serialization import (
+    ai_suggestion_adapter,
+    json_response,
+    task_list_response,
+)
+from src.repository.database import Tag, Task
+from src.schemas import (
+    AISuggestionResponse,
+    SuggestedTask,
+    TaskListResponse,
+    TaskResponse,
+)
+
+ROUNDS = 30
+
+task_list_field = create_model_field("response", TaskListResponse)
+ai_field = create_model_field("response", AISuggestionResponse)
+
+
+def make_tasks(count: int):
+    now = datetime.now(timezone.utc)
+    tags = [Tag(id=1, user_id=1, name="work"), Tag(id=2, user_id=1, name="health")]
+    return [
+        Task(
+            id=i,
+            user_id=1,
+            title=f"Synthetic task number {i} for the benchmark",
+            is_completed=i % 2 == 0,
+            created_at=now,
+            updated_at=now,
+            completed_at=now if i % 2 == 0 else None,
+            tags=tags[: i % 3],
+            version=1,
+        )
+        for i in range(count)
+    ]
+
+
+async def fastapi_render(field, content, response_class=JSONResponse) -> bytes:
+    """What FastAPI does with a model returned from an async endpoint"""
+    serialized = await serialize_response(field=field, response_content=content)
+    return response_class(serialized).body
+
+
+async def old_task_list(tasks, stats, response_class=JSONResponse) -> bytes:
+    content = TaskListResponse(
+        tasks=[TaskResponse.model_validate(t) for t in tasks],
+        total=stats["total"],
+        completed=stats["completed"],
+        pending=stats["pending"],
+    )
+    return await fastapi_render(task_list_field, content, response_class)
+
+
+async def new_task_list(tasks, stats) -> bytes:
+    return task_list_response(tasks, stats).body
+
+
+async def measure(fn, rounds: int = ROUNDS) -> float:
+    """Median milliseconds per call of an async function"""
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+async def main():
+    for count in (1000, 10_000):
+        tasks = make_tasks(count)
+        stats = {"total": count, "completed": count // 2, "pending": count - count // 2}
+        size = len(task_list_response(tasks, stats).body)
+        before = await measure(lambda: old_task_list(tasks, stats))
+        orjson_only = await measure(lambda: old_task_list(tasks, stats, ORJSONResponse))
+        after = await measure(lambda: new_task_list(tasks, stats))
+        print(
+            f"task list {count:>6,} tasks ({size / 1e6:.1f} MB): "
+            f"before {before:7.1f} ms  orjson response only {orjson_only:7.1f} ms  "
+            f"adapter {after:7.1f} ms  ({before / after:.1f}x)"
+        )
+
+    suggestions = AISuggestionResponse(
+        success=True,
+        suggestions=[
+            SuggestedTask(title=f"Suggested task {i}", reason="Because it helps")
+            for i in range(5)
+        ],
+        message="Generated 5 suggestions",
+        query_context="Goals: ship the app | Notes: mornings are best",
+    )
+
+    async def new_suggestions():
+        return json_response(ai_suggestion_adapter, suggestions).body
+
+    before = await measure(lambda: fastapi_render(ai_field, suggestions), 2000) * 1000
+    after = await measure(new_suggestions, 2000) * 1000
+    print(
+        f"AI suggestions (5 items):          before {before:7.1f} us  "
+        f"adapter {after:7.1f} us  ({before / after:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
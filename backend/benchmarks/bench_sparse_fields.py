@@ -0,0 +1,101 @@
+"""
+Sparse task list benchmark
+
+Loads N synthetic tasks (default 10k) for one user and times the GET /tasks
+data path (query plus rendering, no HTTP) for the full list with stats
+against ?fields=id,title,is_completed&include_stats=false, reporting the
+median latency and payload size of each. Run from the backend directory:
+    python -m benchmarks.bench_sparse_fields [task_count]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_sparse_fields.db"
+
+from sqlalchemy import insert  # noqa: E402
+
+from src.api.serialization import (  # noqa: E402
+    TASK_FIELDS,
+    task_list_response,
+    task_rows_response,
+)
+from src.repository.database import SessionLocal, Task, User, init_db  # noqa: E402
+from src.repository.repositories import TaskRepository  # noqa: E402
+
+ROUNDS = 20
+WIDGET_FIELDS = ("id", "title", "is_completed")
+
+
+def load(db, user_id: int, count: int):
+    now = datetime.now(timezone.utc)
+    db.execute(
+        insert(Task),
+        [
+            {
+                "user_id": user_id,
+                "title": f"synthetic task number {i} for the list benchmark",
+                "is_completed": i % 3 == 0,
+                "created_at": now,
+                "updated_at": now,
+                "completed_at": now if i % 3 == 0 else None,
+            }
+            for i in range(count)
+        ],
+    )
+    db.commit()
+
+
+def full_list(db, user_id: int) -> bytes:
+    tasks = TaskRepository.get_tasks_by_user(db, user_id)
+    stats = TaskRepository.get_task_statistics(db, user_id)
+    return task_list_response(tasks, stats).body
+
+
+def all_columns(db, user_id: int) -> bytes:
+    rows = TaskRepository.get_task_rows(db, user_id, TASK_FIELDS)
+    stats = TaskRepository.get_task_statistics(db, user_id)
+    return task_rows_response(rows, TASK_FIELDS, stats).body
+
+
+def widget_list(db, user_id: int) -> bytes:
+    rows = TaskRepository.get_task_rows(db, user_id, WIDGET_FIELDS)
+    return task_rows_response(rows, WIDGET_FIELDS).body
+
+
+def measure(fn, db, user_id: int):
+    """Median milliseconds per call and the payload size"""
+    samples = []
+    for _ in range(ROUNDS):
+        db.expunge_all()
+        started = time.perf_counter()
+        body = fn(db, user_id)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), len(body)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    init_db()
+    db = SessionLocal()
+    user = User(email="bench@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    load(db, user.id, count)
+
+    for label, fn in (
+        ("full list + stats", full_list),
+        ("?fields=<all> (column rows) + stats", all_columns),
+        ("?fields=id,title,is_completed&include_stats=false", widget_list),
+    ):
+        ms, size = measure(fn, db, user.id)
+        print(f"{label:<52} {ms:8.1f} ms  {size / 1024:8.0f} KB")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
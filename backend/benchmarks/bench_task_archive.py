@@ -0,0 +1,117 @@
+"""
+Task archiving benchmark
+
+Loads one user with N old completed tasks (default 50k) plus 200 current
+ones, then times task statistics and the pending-task list before and after
+archiving, and reports archiving throughput in 500-row batches. Run from the
+backend directory:
+    python -m benchmarks.bench_task_archive [old_task_count]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_task_archive.db"
+
+from sqlalchemy import insert  # noqa: E402
+
+from src.repository.database import SessionLocal, Task, User, init_db  # noqa: E402
+from src.repository.repositories import TaskRepository  # noqa: E402
+
+ROUNDS = 20
+LIVE_TASKS = 200
+BATCH = 500
+
+
+def load(db, user_id: int, old_count: int):
+    now = datetime.now(timezone.utc)
+    old = now - timedelta(days=400)
+    db.execute(
+        insert(Task),
+        [
+            {
+                "user_id": user_id,
+                "title": f"old completed task {i}",
+                "is_completed": True,
+                "created_at": old,
+                "updated_at": old,
+                "completed_at": old,
+            }
+            for i in range(old_count)
+        ],
+    )
+    db.execute(
+        insert(Task),
+        [
+            {
+                "user_id": user_id,
+                "title": f"current task {i}",
+                "is_completed": i % 4 == 0,
+                "created_at": now,
+                "updated_at": now,
+                "completed_at": now if i % 4 == 0 else None,
+            }
+            for i in range(LIVE_TASKS)
+        ],
+    )
+    db.commit()
+
+
+def measure(fn) -> float:
+    """Median milliseconds per call"""
+    samples = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def report(label: str, db, user_id: int):
+    stats = measure(lambda: TaskRepository.get_task_statistics(db, user_id))
+    pending = measure(lambda: TaskRepository.get_pending_tasks(db, user_id))
+    listed = measure(lambda: TaskRepository.get_task_rows(db, user_id, ("id", "title")))
+    print(
+        f"{label:<16} stats {stats:7.2f} ms  pending list {pending:7.2f} ms  "
+        f"all rows {listed:7.2f} ms"
+    )
+
+
+def main():
+    old_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    init_db()
+    db = SessionLocal()
+    user = User(email="bench@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    load(db, user.id, old_count)
+
+    report("before archiving", db, user.id)
+
+    cutoff = datetime.now(timezone.utc) - timedelta(days=90)
+    started = time.perf_counter()
+    moved = batches = 0
+    while True:
+        count = TaskRepository.archive_completed_tasks(db, cutoff, BATCH)
+        moved += count
+        batches += 1
+        if count < BATCH:
+            break
+    elapsed = time.perf_counter() - started
+    print(
+        f"archived {moved:,} tasks in {batches} batches: {elapsed:.2f} s "
+        f"({moved / elapsed:,.0f} rows/s, {elapsed / batches * 1000:.1f} ms/batch)"
+    )
+
+    report("after archiving", db, user.id)
+    stats = TaskRepository.get_task_statistics(db, user.id)
+    print(f"stats after: total {stats['total']:,}, completed {stats['completed']:,}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
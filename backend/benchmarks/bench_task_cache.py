@@ -0,0 +1,88 @@
+"""
+Task list cache benchmark
+
+Loads one user with N tasks (default 1000, a quarter completed and tagged)
+and compares listing them as ORM objects straight from SQLite with the
+cached list: the first read (miss, one column query) and later reads
+(hits), plus a create_task that writes through. Run from the backend
+directory:
+    python -m benchmarks.bench_task_cache [task_count]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_task_cache.db"
+
+from src.repository.database import SessionLocal, Task, User, init_db  # noqa: E402
+from src.repository.repositories import TaskRepository  # noqa: E402
+from src.repository.task_cache import task_cache  # noqa: E402
+from src.schemas import TaskCreate  # noqa: E402
+
+ROUNDS = 50
+
+
+def measure(fn) -> float:
+    """Median milliseconds per call"""
+    samples = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    init_db()
+    db = SessionLocal()
+    user = User(email="bench@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    for i in range(count):
+        TaskRepository.create_task(
+            db,
+            user.id,
+            TaskCreate(title=f"benchmark task {i}", tags=["home"] if i % 4 else []),
+        )
+    db.query(Task).filter(Task.id % 4 == 0).update(
+        {Task.is_completed: True}, synchronize_session=False
+    )
+    db.commit()
+    user_id = user.id
+
+    def orm_list():
+        db.expunge_all()
+        TaskRepository._user_tasks(db, user_id).order_by(Task.created_at.desc()).all()
+
+    def cache_miss():
+        task_cache.clear()
+        TaskRepository.get_tasks_by_user(db, user_id)
+
+    print(f"{count:,} tasks")
+    print(f"ORM query and hydration   {measure(orm_list):8.3f} ms")
+    print(f"cache miss (column query) {measure(cache_miss):8.3f} ms")
+    TaskRepository.get_tasks_by_user(db, user_id)
+    hit = measure(lambda: TaskRepository.get_tasks_by_user(db, user_id))
+    pending = measure(lambda: TaskRepository.get_pending_tasks(db, user_id, "home"))
+    print(f"cache hit, all tasks      {hit:8.3f} ms")
+    print(f"cache hit, pending + tag  {pending:8.3f} ms")
+
+    hits = task_cache.hits
+    write = measure(
+        lambda: TaskRepository.create_task(db, user_id, TaskCreate(title="new task"))
+    )
+    TaskRepository.get_tasks_by_user(db, user_id)
+    print(
+        f"create_task (write-through) {write:6.3f} ms; "
+        f"next read {'hit' if task_cache.hits > hits else 'miss'}"
+    )
+    print(f"cache size ~{task_cache.size / 1024:,.0f} KiB")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Streaming task export benchmark
+
+Loads N synthetic tasks (default 1M) for a single user, then drains the
+export stream for the first N/10 tasks' worth of rows and for all N,
+measuring throughput and peak Python heap (tracemalloc). Peak memory should
+be the same at both sizes. tracemalloc itself slows the export several
+times over, so treat the rows/s figures as relative. Run from the backend
+directory:
+    python -m benchmarks.bench_task_export [task_count]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_task_export.db"
+
+from sqlalchemy import insert  # noqa: E402
+
+from src.repository.database import (  # noqa: E402
+    SessionLocal,
+    Tag,
+    Task,
+    User,
+    init_db,
+    task_tags,
+)
+from src.repository.repositories import TaskRepository  # noqa: E402
+from src.services.export_service import export_stream  # noqa: E402
+
+BATCH = 10_000
+TAGS = ["work", "home", "health", "study", "errands"]
+
+
+def load(db, user_id: int, first_id: int, count: int, rng: random.Random):
+    now = datetime.now(timezone.utc)
+    for offset in range(0, count, BATCH):
+        ids = range(first_id + offset, first_id + min(offset + BATCH, count))
+        db.execute(
+            insert(Task),
+            [
+                {
+                    "id": task_id,
+                    "user_id": user_id,
+                    "title": f"synthetic task number {task_id} for export",
+                    "is_completed": rng.random() < 0.6,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for task_id in ids
+            ],
+        )
+        db.execute(
+            insert(task_tags),
+            [
+                {"task_id": task_id, "tag_id": rng.randint(1, len(TAGS))}
+                for task_id in ids
+                if rng.random() < 0.3
+            ],
+        )
+        db.commit()
+
+
+def drain(user_id: int, format: str, compression):
+    db = SessionLocal()
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = 0
+    batches = TaskRepository.iter_export_batches(db, user_id)
+    for chunk in export_stream(batches, format, compression):
+        size += len(chunk)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    db.close()
+    return elapsed, size, peak
+
+
+def main():
+    task_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    small_count = task_count // 10
+    init_db()
+    rng = random.Random(1)
+
+    db = SessionLocal()
+    db.execute(
+        insert(User),
+        [
+            {"email": "small@example.com", "hashed_password": "x"},
+            {"email": "large@example.com", "hashed_password": "x"},
+        ],
+    )
+    db.execute(insert(Tag), [{"user_id": 2, "name": name} for name in TAGS])
+    db.commit()
+
+    started = time.perf_counter()
+    load(db, 1, 1, small_count, rng)
+    load(db, 2, small_count + 1, task_count, rng)
+    print(
+        f"loaded {small_count + task_count} tasks in {time.perf_counter() - started:.1f} s"
+    )
+    db.close()
+
+    for format, compression in (
+        ("ndjson", None),
+        ("csv", None),
+        ("ndjson", "zstd"),
+        ("csv", "gzip"),
+    ):
+        label = f"{format}{'+' + compression if compression else ''}"
+        for user_id, count in ((1, small_count), (2, task_count)):
+            elapsed, size, peak = drain(user_id, format, compression)
+            print(
+                f"{label:12s} {count:>9,} rows: {elapsed:6.2f} s "
+                f"({count / elapsed:>9,.0f} rows/s)  {size / 1e6:7.1f} MB out  "
+                f"peak heap {peak / 1e6:5.2f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
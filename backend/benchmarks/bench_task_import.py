@@ -0,0 +1,114 @@
+"""
+Streaming task import benchmark
+
+Builds an N-row NDJSON and CSV body (default 100k rows, a third of them
+tagged, half completed) and feeds it to the import service in 64 KiB
+chunks, as the request stream would. Reports rows/s and the peak Python
+heap of the import itself. Run from the backend directory:
+    python -m benchmarks.bench_task_import [row_count]
+"""
+
+import asyncio
+import csv
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_task_import.db"
+
+import orjson  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from src.repository.database import SessionLocal, User, init_db  # noqa: E402
+from src.services.import_service import import_tasks  # noqa: E402
+
+CHUNK_BYTES = 64 * 1024
+TAGS = ["work", "home", "health", "study", "errands"]
+
+
+def make_rows(count: int, rng: random.Random):
+    for i in range(count):
+        yield {
+            "title": f"imported task {i} from another tool",
+            "is_completed": rng.random() < 0.5,
+            "created_at": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T09:00:00",
+            "tags": rng.sample(TAGS, 2) if rng.random() < 0.33 else [],
+        }
+
+
+def make_ndjson(count: int, rng: random.Random) -> bytes:
+    return b"".join(
+        orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE)
+        for row in make_rows(count, rng)
+    )
+
+
+def make_csv(count: int, rng: random.Random) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["title", "is_completed", "created_at", "tags"])
+    for row in make_rows(count, rng):
+        writer.writerow(
+            [
+                row["title"],
+                int(row["is_completed"]),
+                row["created_at"],
+                ";".join(row["tags"]),
+            ]
+        )
+    return buffer.getvalue().encode()
+
+
+async def stream(body: bytes):
+    for offset in range(0, len(body), CHUNK_BYTES):
+        yield body[offset : offset + CHUNK_BYTES]
+
+
+def run(user_id: int, body: bytes, format: str, trace: bool = False):
+    db = SessionLocal()
+    user = db.get(User, user_id)
+    if trace:
+        tracemalloc.start()
+    started = time.perf_counter()
+    result = asyncio.run(import_tasks(db, user, stream(body), format))
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1] if trace else 0
+    tracemalloc.stop()
+    db.close()
+    return result, elapsed, peak
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    init_db()
+    rng = random.Random(1)
+
+    db = SessionLocal()
+    db.execute(
+        insert(User),
+        [{"email": f"user{i}@example.com", "hashed_password": "x"} for i in range(4)],
+    )
+    db.commit()
+    db.close()
+
+    bodies = {"ndjson": make_ndjson(row_count, rng), "csv": make_csv(row_count, rng)}
+    for user_id, (format, body) in enumerate(bodies.items(), start=1):
+        result, elapsed, _ = run(user_id, body, format)
+        print(
+            f"{format:6s} {result.imported:>9,} rows ({len(body) / 1e6:.1f} MB): "
+            f"{elapsed:6.2f} s  {result.imported / elapsed:>9,.0f} rows/s"
+        )
+
+    # The benchmark holds the whole body; the import itself should not
+    for user_id, count in ((3, row_count // 10), (4, row_count)):
+        body = make_ndjson(count, rng)
+        _, _, peak = run(user_id, body, "ndjson", trace=True)
+        print(f"ndjson {count:>9,} rows: peak heap during import {peak / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
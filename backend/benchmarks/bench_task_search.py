@@ -0,0 +1,89 @@
+"""
+Full-text task search benchmark (SQLite FTS5)
+
+Loads N synthetic tasks (default 1M) spread over many users through the
+normal tasks table, so the FTS triggers do the indexing, then measures
+TaskRepository.search_tasks() latency. Run from the backend directory:
+    python -m benchmarks.bench_task_search [task_count]
+"""
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_task_search.db"
+
+from sqlalchemy import insert  # noqa: E402
+
+from src.repository.database import SessionLocal, Task, User, init_db  # noqa: E402
+from src.repository.repositories import TaskRepository  # noqa: E402
+
+USERS = 2000
+QUERIES = 2000
+BATCH = 10_000
+
+VERBS = "write review plan call email fix deploy refactor read study buy book".split()
+NOUNS = (
+    "budget report roadmap invoice dentist groceries backend frontend tests "
+    "documentation portfolio resume interview workout meeting agenda release "
+    "database migration newsletter presentation taxes flight hotel"
+).split()
+
+
+def main():
+    task_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    init_db()
+    rng = random.Random(1)
+
+    db = SessionLocal()
+    db.execute(
+        insert(User),
+        [
+            {"email": f"user{i}@example.com", "hashed_password": "x"}
+            for i in range(USERS)
+        ],
+    )
+    db.commit()
+
+    now = datetime.now(timezone.utc)
+    started = time.perf_counter()
+    for offset in range(0, task_count, BATCH):
+        rows = [
+            {
+                "user_id": rng.randint(1, USERS),
+                "title": f"{rng.choice(VERBS)} {rng.choice(NOUNS)} {rng.choice(NOUNS)}",
+                "is_completed": False,
+                "created_at": now,
+            }
+            for _ in range(min(BATCH, task_count - offset))
+        ]
+        db.execute(insert(Task), rows)
+        db.commit()
+    load_s = time.perf_counter() - started
+    print(f"loaded {task_count} tasks in {load_s:.1f} s ({task_count / load_s:,.0f}/s)")
+
+    for label, make_query in (
+        ("word", lambda: rng.choice(NOUNS)),
+        ("prefix", lambda: rng.choice(NOUNS)[:3]),
+        ("two words", lambda: f"{rng.choice(VERBS)} {rng.choice(NOUNS)[:4]}"),
+    ):
+        samples = []
+        for _ in range(QUERIES):
+            user_id, query = rng.randint(1, USERS), make_query()
+            started = time.perf_counter()
+            TaskRepository.search_tasks(db, user_id, query, limit=20)
+            samples.append((time.perf_counter() - started) * 1000)
+        samples.sort()
+        print(
+            f"{label:<10} p50={statistics.median(samples):6.2f} ms  "
+            f"p99={samples[int(len(samples) * 0.99)]:6.2f} ms"
+        )
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
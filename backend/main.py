@@ -3,6 +3,7 @@ Productivity Tracker App - FastAPI Backend
 Main application entry point with FastAPI setup and middleware configuration
 """
 
+import asyncio
 import logging
 import os
 from contextlib import asynccontextmanager
@@ -10,11 +11,23 @@ from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from src.api.router_ai import router as router_ai
+from src.api.router_analytics import router as router_analytics
 from src.api.router_auth import router as router_auth
 from src.api.router_context import router as router_context
+from src.api.router_dashboard import router as router_dashboard
+from src.api.router_recurrences import router as router_recurrences
 from src.api.router_tasks import router as router_tasks
-from src.repository.database import init_db
+from src.api.router_tasks import sync_horizon
+from src.api.router_ws import router as router_ws
+from src.metrics import CONTENT_TYPE, METRICS_ENABLED, registry
+from src.middleware.compression import CompressionMiddleware
+from src.middleware.metrics import MetricsMiddleware
+from src.repository.database import SessionLocal, init_db
+from src.repository.repositories import TaskRepository
+from src.services.archive_service import ARCHIVE_AFTER_DAYS, run_archiver
+from src.services.recurrence_service import run_recurrence_scheduler
 
 # Load environment variables early so they're available for submodules
 load_dotenv()
@@ -30,7 +43,18 @@ async def lifespan(app: FastAPI):
     logger.info("Application startup: Initializing database...")
     init_db()
     logger.info("Database initialized successfully")
+    db = SessionLocal()
+    try:
+        pruned = TaskRepository.prune_tombstones(db, sync_horizon())
+        logger.info(f"Pruned {pruned} expired task tombstones")
+    finally:
+        db.close()
+    archiver = asyncio.create_task(run_archiver()) if ARCHIVE_AFTER_DAYS > 0 else None
+    scheduler = asyncio.create_task(run_recurrence_scheduler())
     yield
+    scheduler.cancel()
+    if archiver is not None:
+        archiver.cancel()
     logger.info("Application shutdown")
 
 
@@ -43,6 +67,7 @@ app = FastAPI(
     redoc_url="/redoc",
     openapi_url="/openapi.json",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware configuration
@@ -65,6 +90,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Negotiated zstd/br/gzip compression for larger responses
+app.add_middleware(CompressionMiddleware)
+
+# Outermost, so latency includes CORS handling and compression
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 
 # Health check endpoint
 @app.get("/health", tags=["Health"])
@@ -79,11 +111,27 @@ async def health_check():
     }
 
 
+if METRICS_ENABLED:
+
+    @app.get("/metrics", tags=["Health"], include_in_schema=False)
+    async def metrics():
+        """
+        Metrics in the Prometheus text exposition format
+        """
+        return Response(registry.render(), media_type=CONTENT_TYPE)
+
+
 # Include routers
 app.include_router(router_auth, prefix="/api/v1/auth", tags=["Authentication"])
 app.include_router(router_tasks, prefix="/api/v1/tasks", tags=["Tasks"])
+app.include_router(
+    router_recurrences, prefix="/api/v1/recurrences", tags=["Recurring Tasks"]
+)
 app.include_router(router_ai, prefix="/api/v1/ai", tags=["AI Suggestions"])
 app.include_router(router_context, prefix="/api/v1/context", tags=["User Context"])
+app.include_router(router_analytics, prefix="/api/v1/analytics", tags=["Analytics"])
+app.include_router(router_dashboard, prefix="/api/v1/dashboard", tags=["Dashboard"])
+app.include_router(router_ws, prefix="/api/v1/ws", tags=["Change Feed"])
 
 
 # Root endpoint
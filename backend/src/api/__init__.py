@@ -4,5 +4,18 @@ from .router_auth import router as router_auth
 from .router_tasks import router as router_tasks
 from .router_ai import router as router_ai
 from .router_context import router as router_context
+from .router_analytics import router as router_analytics
+from .router_dashboard import router as router_dashboard
+from .router_recurrences import router as router_recurrences
+from .router_ws import router as router_ws
 
-__all__ = ["router_auth", "router_tasks", "router_ai", "router_context"]
+__all__ = [
+    "router_auth",
+    "router_tasks",
+    "router_ai",
+    "router_context",
+    "router_analytics",
+    "router_dashboard",
+    "router_recurrences",
+    "router_ws",
+]
@@ -0,0 +1,75 @@
+"""
+HTTP validator helpers - ETag generation and conditional request checks
+"""
+
+from typing import Optional
+
+from fastapi import Response, status
+
+
+def make_etag(*parts) -> str:
+    """Build a strong ETag from version components, e.g. "ctx-1-4" """
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """
+    ETag of a content-coded representation, e.g. "ctx-1-4" -> "ctx-1-4-zstd"
+
+    A strong ETag has to change with the bytes sent (RFC 9110 8.8.3), so
+    each encoding gets its own; weak ETags are returned unchanged.
+    """
+    if etag.startswith("W/") or not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+_ENCODING_SUFFIXES = ('-zstd"', '-br"', '-gzip"')
+
+
+def _unencoded(tag: str) -> str:
+    """The ETag a client sent, without a suffix added by encoded_etag()"""
+    for suffix in _ENCODING_SUFFIXES:
+        if tag.endswith(suffix):
+            return tag[: -len(suffix)] + '"'
+    return tag
+
+
+def _entity_tags(header: str) -> list[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def if_none_match(header: Optional[str], etag: str) -> bool:
+    """
+    True if an If-None-Match header matches the current ETag
+
+    Uses weak comparison as required for If-None-Match (RFC 9110 13.1.2),
+    and accepts the ETags of compressed representations.
+    """
+    if not header:
+        return False
+    tags = _entity_tags(header)
+    return "*" in tags or any(
+        _unencoded(tag.removeprefix("W/")) == etag for tag in tags
+    )
+
+
+def if_match(header: Optional[str], etag: str) -> bool:
+    """
+    True if an If-Match header matches the current ETag
+
+    Uses strong comparison as required for If-Match (RFC 9110 13.1.1);
+    a compressed representation's ETag matches the resource it encodes.
+    A missing header counts as a match.
+    """
+    if not header:
+        return True
+    tags = _entity_tags(header)
+    return "*" in tags or any(
+        not tag.startswith("W/") and _unencoded(tag) == etag for tag in tags
+    )
+
+
+def not_modified(etag: str) -> Response:
+    """304 response carrying the current validator"""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
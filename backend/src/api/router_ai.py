@@ -7,6 +7,7 @@ import logging
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
+from src.api.serialization import ai_suggestion_adapter, json_response
 from src.dependencies import get_authenticated_user
 from src.repository.database import get_db
 from src.repository.repositories import TaskRepository
@@ -14,9 +15,11 @@ from src.schemas import (
     AISuggestionRequest,
     AISuggestionResponse,
     ErrorResponse,
+    TaskCreate,
     TaskResponse,
 )
 from src.services.langchain_service import langchain_service
+from src.services.local_suggestion_service import local_suggestion_service
 
 logger = logging.getLogger(__name__)
 
@@ -73,7 +76,49 @@ async def generate_suggestions(
         )
 
     logger.info(f"Generated {len(response.suggestions)} suggestions for user {user.id}")
-    return response
+    return json_response(ai_suggestion_adapter, response)
+
+
+# ============================================================================
+# INSTANT LOCAL SUGGESTIONS
+# ============================================================================
+
+
+@router.post(
+    "/suggest/instant",
+    response_model=AISuggestionResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "Local suggestions generated"},
+        401: {"model": ErrorResponse, "description": "Unauthorized"},
+    },
+)
+async def generate_instant_suggestions(
+    request: AISuggestionRequest,
+    user=Depends(get_authenticated_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Generate instant task suggestions without calling the LLM
+
+    - **query**: Natural language query (e.g., "Suggest tasks for today")
+
+    Matches the user's goals, notes and query against built-in task templates
+    in a few milliseconds. Clients can show these while `/suggest` is pending.
+    """
+    if not request.query or len(request.query.strip()) == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Query cannot be empty"
+        )
+
+    response = local_suggestion_service.generate_suggestions(
+        db=db, user_id=user.id, query=request.query
+    )
+
+    logger.info(
+        f"Generated {len(response.suggestions)} instant suggestions for user {user.id}"
+    )
+    return json_response(ai_suggestion_adapter, response)
 
 
 # ============================================================================
@@ -136,7 +181,10 @@ async def suggest_and_create_tasks(
 
     - **query**: Natural language query
 
-    Returns: Suggestions and created tasks
+    Suggestions that are near-duplicates of an existing task (or of another
+    suggestion in the same batch) are skipped rather than created.
+
+    Returns: Suggestions, created tasks and skipped duplicates
     """
     if not request.query or len(request.query.strip()) == 0:
         raise HTTPException(
@@ -160,10 +208,16 @@ async def suggest_and_create_tasks(
                 status_code=status.HTTP_400_BAD_REQUEST, detail=response.message
             )
 
-    # Create tasks from suggestions
+    # Create tasks from suggestions, skipping near-duplicates
     created_tasks = []
+    skipped_duplicates = []
     for suggestion in response.suggestions:
-        from src.schemas import TaskCreate
+        duplicate = TaskRepository.find_duplicate_task(db, user.id, suggestion.title)
+        if duplicate:
+            skipped_duplicates.append(
+                {"title": suggestion.title, "existing_task_id": duplicate.id}
+            )
+            continue
 
         task_data = TaskCreate(title=suggestion.title)
         created_task = TaskRepository.create_task(db, user.id, task_data)
@@ -172,13 +226,15 @@ async def suggest_and_create_tasks(
             created_tasks.append(TaskResponse.model_validate(created_task))
 
     logger.info(
-        f"Created {len(created_tasks)} tasks from suggestions for user {user.id}"
+        f"Created {len(created_tasks)} tasks from suggestions for user {user.id} "
+        f"({len(skipped_duplicates)} duplicates skipped)"
     )
 
     return {
         "suggestions": response.suggestions,
         "created_tasks": created_tasks,
         "total_created": len(created_tasks),
+        "skipped_duplicates": skipped_duplicates,
         "message": f"Created {len(created_tasks)} task(s) from AI suggestions",
     }
 
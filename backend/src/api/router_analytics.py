@@ -0,0 +1,183 @@
+"""
+Analytics API endpoints - Completion history, heatmaps, streaks and categories
+Served from rollups and counters that are maintained as tasks are written
+"""
+
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from src.dependencies import get_authenticated_user
+from src.repository.database import get_db
+from src.repository.repositories import AnalyticsRepository, TaskRepository
+from src.schemas import (
+    CategoryCount,
+    CategoryDistributionResponse,
+    DailyCompletionPoint,
+    DailyCompletionsResponse,
+    ErrorResponse,
+    StreakResponse,
+    TimezoneUpdate,
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Longest range a single request may cover
+MAX_RANGE_DAYS = 3 * 366
+
+
+# ============================================================================
+# DAILY COMPLETIONS
+# ============================================================================
+
+
+@router.get(
+    "/daily",
+    response_model=DailyCompletionsResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "Daily completion counts retrieved successfully"},
+        400: {"model": ErrorResponse, "description": "Invalid date range"},
+        401: {"model": ErrorResponse, "description": "Unauthorized"},
+    },
+)
+async def get_daily_completions(
+    from_date: Optional[date] = Query(
+        None, alias="from", description="First day (default: 364 days before 'to')"
+    ),
+    to_date: Optional[date] = Query(
+        None, alias="to", description="Last day, inclusive (default: today)"
+    ),
+    user=Depends(get_authenticated_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Get the number of tasks completed per day in a date range
+
+    Only days with at least one completion are listed. Un-completing a task
+    removes it from its day; deleting a completed task keeps the history.
+    """
+    to_date = to_date or AnalyticsRepository.local_day(user, datetime.now(timezone.utc))
+    from_date = from_date or to_date - timedelta(days=364)
+
+    if from_date > to_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'from' must not be after 'to'",
+        )
+    if (to_date - from_date).days >= MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range must not exceed {MAX_RANGE_DAYS} days",
+        )
+
+    rows = AnalyticsRepository.get_daily_completions(db, user.id, from_date, to_date)
+
+    logger.info(f"Retrieved {len(rows)} completion days for user {user.id}")
+    return DailyCompletionsResponse(
+        from_date=from_date,
+        to_date=to_date,
+        days=[DailyCompletionPoint(date=day, completed=count) for day, count in rows],
+        total_completed=sum(count for _, count in rows),
+    )
+
+
+# ============================================================================
+# CATEGORY DISTRIBUTION
+# ============================================================================
+
+
+@router.get(
+    "/categories",
+    response_model=CategoryDistributionResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "Category distribution retrieved successfully"},
+        401: {"model": ErrorResponse, "description": "Unauthorized"},
+    },
+)
+async def get_category_distribution(
+    user=Depends(get_authenticated_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Get the number of total and completed tasks per tag
+
+    Counts are maintained on every task write, so this reads one row per tag.
+    """
+    tags = TaskRepository.get_tag_counts(db, user.id)
+    return CategoryDistributionResponse(
+        categories=[
+            CategoryCount(
+                name=tag.name, total=tag.task_count, completed=tag.completed_count
+            )
+            for tag in tags
+        ]
+    )
+
+
+# ============================================================================
+# STREAKS
+# ============================================================================
+
+
+@router.get(
+    "/streak",
+    response_model=StreakResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "Streak retrieved successfully"},
+        401: {"model": ErrorResponse, "description": "Unauthorized"},
+    },
+)
+async def get_streak(user=Depends(get_authenticated_user)):
+    """
+    Get the current and longest completion streaks
+
+    A day counts as active if at least one task was completed on it in the
+    user's timezone. Read straight from the user row, no task queries.
+    """
+    return StreakResponse(**AnalyticsRepository.get_streak(user))
+
+
+@router.put(
+    "/timezone",
+    response_model=StreakResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "Timezone updated successfully"},
+        401: {"model": ErrorResponse, "description": "Unauthorized"},
+        422: {"model": ErrorResponse, "description": "Unknown timezone"},
+    },
+)
+async def update_timezone(
+    timezone_data: TimezoneUpdate,
+    user=Depends(get_authenticated_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Set the timezone completion days and streaks are counted in
+
+    Applies to completions from now on; past days are not re-bucketed.
+    """
+    try:
+        updated_user = AnalyticsRepository.set_timezone(
+            db, user.id, timezone_data.timezone
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(e)
+        )
+
+    if not updated_user:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to update timezone",
+        )
+
+    return StreakResponse(**AnalyticsRepository.get_streak(updated_user))
@@ -4,19 +4,34 @@ These are used as context for AI suggestion generation
 """
 
 import logging
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
+from src.api.etags import if_match, if_none_match, make_etag, not_modified
 from src.dependencies import get_authenticated_user
 from src.repository.database import get_db
-from src.repository.repositories import UserRepository
-from src.schemas import ContextUpdate, ErrorResponse, UserResponse
+from src.repository.repositories import UserRepository, VersionConflictError
+from src.schemas import (
+    ContextPatchOperation,
+    ContextUpdate,
+    ErrorResponse,
+    UserResponse,
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Clients may cache context but must revalidate with If-None-Match
+CACHE_CONTROL = "private, no-cache"
+
+
+def context_etag(user) -> str:
+    """Strong ETag for the user's context, derived from its version"""
+    return make_etag("ctx", user.id, user.context_version)
+
 
 # ============================================================================
 # GET USER CONTEXT
@@ -29,17 +44,26 @@ router = APIRouter()
     status_code=status.HTTP_200_OK,
     responses={
         200: {"description": "Context retrieved successfully"},
+        304: {"description": "Context unchanged since If-None-Match"},
         401: {"model": ErrorResponse, "description": "Unauthorized"},
     },
 )
 async def get_user_context(
-    user=Depends(get_authenticated_user), db: Session = Depends(get_db)
+    response: Response,
+    if_none_match_header: Optional[str] = Header(None, alias="If-None-Match"),
+    user=Depends(get_authenticated_user),
+    db: Session = Depends(get_db),
 ):
     """
     Get the authenticated user's goals and notes
 
-    These are used as context for AI suggestion generation
+    These are used as context for AI suggestion generation.
+    Send the returned ETag as If-None-Match to get 304 when unchanged.
     """
+    etag = context_etag(user)
+    if if_none_match(if_none_match_header, etag):
+        return not_modified(etag)
+
     context = UserRepository.get_user_context(db, user.id)
 
     if not context:
@@ -49,6 +73,8 @@ async def get_user_context(
 
     goals, notes = context
 
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
     logger.info(f"Retrieved context for user {user.id}")
     return {
         "goals": goals if goals else None,
@@ -71,10 +97,13 @@ async def get_user_context(
         200: {"description": "Context updated successfully"},
         401: {"model": ErrorResponse, "description": "Unauthorized"},
         400: {"model": ErrorResponse, "description": "Bad request"},
+        412: {"model": ErrorResponse, "description": "Context changed (If-Match)"},
     },
 )
 async def update_user_context(
     context_data: ContextUpdate,
+    response: Response,
+    if_match_header: Optional[str] = Header(None, alias="If-Match"),
     user=Depends(get_authenticated_user),
     db: Session = Depends(get_db),
 ):
@@ -84,7 +113,8 @@ async def update_user_context(
     - **goals**: Your personal/professional goals (optional)
     - **notes**: Any additional notes or context (optional)
 
-    At least one field must be provided
+    At least one field must be provided. Send the ETag from `GET /context`
+    as If-Match to reject the update if the context changed in the meantime.
     """
     # Validate that at least one field is provided
     if context_data.goals is None and context_data.notes is None:
@@ -93,9 +123,24 @@ async def update_user_context(
             detail="At least one field (goals or notes) must be provided",
         )
 
+    if not if_match(if_match_header, context_etag(user)):
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Context has been modified, fetch it again before updating",
+        )
+
     logger.info(f"Updating context for user {user.id}")
 
-    updated_user = UserRepository.update_user_context(db, user.id, context_data)
+    expected_version = user.context_version if if_match_header else None
+    try:
+        updated_user = UserRepository.update_user_context(
+            db, user.id, context_data, expected_version
+        )
+    except VersionConflictError:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Context has been modified, fetch it again before updating",
+        )
 
     if not updated_user:
         raise HTTPException(
@@ -103,6 +148,7 @@ async def update_user_context(
             detail="Error updating context",
         )
 
+    response.headers["ETag"] = context_etag(updated_user)
     logger.info(f"Context updated for user {user.id}")
     return {
         "success": True,
@@ -113,6 +159,85 @@ async def update_user_context(
     }
 
 
+# ============================================================================
+# PATCH USER CONTEXT
+# ============================================================================
+
+
+@router.patch(
+    "",
+    response_model=dict,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "Context patched successfully"},
+        401: {"model": ErrorResponse, "description": "Unauthorized"},
+        412: {"model": ErrorResponse, "description": "Context version is stale"},
+        422: {"model": ErrorResponse, "description": "Patch cannot be applied"},
+        428: {"model": ErrorResponse, "description": "If-Match header required"},
+    },
+)
+async def patch_user_context(
+    response: Response,
+    operations: List[ContextPatchOperation] = Body(...),
+    if_match_header: Optional[str] = Header(None, alias="If-Match"),
+    user=Depends(get_authenticated_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Apply a JSON Patch (RFC 6902) to the authenticated user's goals and notes
+
+    The patch is applied to `{"goals": [lines], "notes": [lines]}`, so editing
+    one line only uploads that line, e.g.
+    `[{"op": "replace", "path": "/notes/3", "value": "New text"}]`.
+
+    Requires If-Match with the ETag from `GET /context`; the patch is rejected
+    with 412 if the context has changed since that version.
+    """
+    if not if_match_header or if_match_header.strip() == "*":
+        raise HTTPException(
+            status_code=status.HTTP_428_PRECONDITION_REQUIRED,
+            detail="If-Match header with the current context ETag is required",
+        )
+    if not if_match(if_match_header, context_etag(user)):
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Context has been modified, fetch it again before patching",
+        )
+
+    try:
+        updated_user = UserRepository.patch_user_context(
+            db,
+            user.id,
+            [op.model_dump(by_alias=True, exclude_unset=True) for op in operations],
+            user.context_version,
+        )
+    except VersionConflictError:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Context has been modified, fetch it again before patching",
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(e)
+        )
+
+    if not updated_user:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error patching context",
+        )
+
+    response.headers["ETag"] = context_etag(updated_user)
+    logger.info(f"Context patched for user {user.id} ({len(operations)} operations)")
+    return {
+        "success": True,
+        "message": "Context patched successfully",
+        "goals": updated_user.goals,
+        "notes": updated_user.notes,
+        "user": UserResponse.model_validate(updated_user),
+    }
+
+
 # ============================================================================
 # GET USER PROFILE WITH CONTEXT
 # ============================================================================
@@ -124,15 +249,27 @@ async def update_user_context(
     status_code=status.HTTP_200_OK,
     responses={
         200: {"description": "Profile retrieved successfully"},
+        304: {"description": "Profile unchanged since If-None-Match"},
         401: {"model": ErrorResponse, "description": "Unauthorized"},
     },
 )
 async def get_profile_with_context(
-    user=Depends(get_authenticated_user), db: Session = Depends(get_db)
+    response: Response,
+    if_none_match_header: Optional[str] = Header(None, alias="If-None-Match"),
+    user=Depends(get_authenticated_user),
+    db: Session = Depends(get_db),
 ):
     """
     Get the authenticated user's full profile including goals and notes
+
+    Supports If-None-Match with the returned ETag (304 when unchanged).
     """
+    etag = make_etag("profile", user.id, user.context_version)
+    if if_none_match(if_none_match_header, etag):
+        return not_modified(etag)
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
     logger.info(f"Retrieved profile for user {user.id}")
     return {
         "user": UserResponse.model_validate(user),
@@ -0,0 +1,152 @@
+"""
+Dashboard API endpoint - Everything the dashboard screen shows, in one request
+Replaces separate task, stats, streak and context calls on app launch
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from starlette.concurrency import run_in_threadpool
+
+from src.api.etags import if_none_match, make_etag, not_modified
+from src.dependencies import get_authenticated_user
+from src.repository.database import ReadSessionLocal
+from src.repository.repositories import (
+    AnalyticsRepository,
+    TaskRepository,
+    UserRepository,
+)
+from src.schemas import (
+    ContextSummary,
+    DashboardResponse,
+    ErrorResponse,
+    StreakResponse,
+    TaskResponse,
+    TaskStatsSummary,
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Goals and notes are cut to this many characters in the summary
+CONTEXT_SUMMARY_CHARS = int(os.getenv("DASHBOARD_CONTEXT_SUMMARY_CHARS", "280"))
+
+# Clients may cache the dashboard but must revalidate with If-None-Match
+CACHE_CONTROL = "private, no-cache"
+
+
+async def read_concurrently(read: Callable, user_id: int):
+    """
+    Run a blocking read in the threadpool with its own short-lived session
+
+    A Session must not be shared between threads, so each concurrent read
+    borrows its own connection from the read pool; results are fully loaded
+    before the session closes.
+    """
+
+    def run():
+        db = ReadSessionLocal(info={"user_id": user_id})
+        try:
+            return read(db)
+        finally:
+            db.close()
+
+    return await run_in_threadpool(run)
+
+
+def _shorten(text: str) -> str:
+    if len(text) <= CONTEXT_SUMMARY_CHARS:
+        return text
+    return text[: CONTEXT_SUMMARY_CHARS - 1].rstrip() + "…"
+
+
+def dashboard_etag(user, limit: int) -> str:
+    """
+    Strong ETag for the dashboard, from the versions of everything it shows
+
+    The streak depends on the current day in the user's timezone, so the
+    timezone and day are part of the tag.
+    """
+    today = AnalyticsRepository.local_day(user, datetime.now(timezone.utc))
+    return make_etag(
+        "dash",
+        user.id,
+        user.task_list_version,
+        user.context_version,
+        user.timezone,
+        today.isoformat(),
+        limit,
+    )
+
+
+# ============================================================================
+# DASHBOARD
+# ============================================================================
+
+
+@router.get(
+    "",
+    response_model=DashboardResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "Dashboard retrieved successfully"},
+        304: {"description": "Dashboard unchanged since If-None-Match"},
+        401: {"model": ErrorResponse, "description": "Unauthorized"},
+    },
+)
+async def get_dashboard(
+    response: Response,
+    limit: int = Query(5, ge=1, le=50, description="Maximum pending tasks"),
+    if_none_match_header: Optional[str] = Header(None, alias="If-None-Match"),
+    user=Depends(get_authenticated_user),
+):
+    """
+    Get pending tasks, task stats, streak and a context summary at once
+
+    The token is checked once; the independent reads then run concurrently.
+    Supports If-None-Match with the returned ETag (304 when unchanged).
+    """
+    etag = dashboard_etag(user, limit)
+    if if_none_match(if_none_match_header, etag):
+        return not_modified(etag)
+
+    def pending(db):
+        tasks = TaskRepository.get_pending_tasks(db, user.id, limit=limit)
+        return [TaskResponse.model_validate(task) for task in tasks]
+
+    tasks, stats, context = await asyncio.gather(
+        read_concurrently(pending, user.id),
+        read_concurrently(
+            lambda db: TaskRepository.get_task_statistics(db, user.id), user.id
+        ),
+        read_concurrently(
+            lambda db: UserRepository.get_user_context(db, user.id), user.id
+        ),
+    )
+    goals, notes = context or ("", "")
+
+    logger.info(f"Retrieved dashboard for user {user.id}")
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return DashboardResponse(
+        pending_tasks=tasks,
+        stats=TaskStatsSummary(
+            total=stats["total"],
+            completed=stats["completed"],
+            pending=stats["pending"],
+            completion_rate=round(stats["completion_rate"], 2),
+        ),
+        streak=StreakResponse(**AnalyticsRepository.get_streak(user)),
+        context=ContextSummary(
+            goals=_shorten(goals),
+            notes=_shorten(notes),
+            truncated=len(goals) > CONTEXT_SUMMARY_CHARS
+            or len(notes) > CONTEXT_SUMMARY_CHARS,
+            context_version=user.context_version,
+        ),
+    )
@@ -0,0 +1,142 @@
+"""
+Recurring task API endpoints - Create, list and delete recurrence rules
+Occurrences show up as ordinary tasks, one at a time
+"""
+
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from src.dependencies import get_authenticated_user
+from src.repository.database import get_db
+from src.repository.repositories import RecurrenceRepository
+from src.schemas import (
+    ErrorResponse,
+    RecurrenceCreate,
+    RecurrenceListResponse,
+    RecurrenceResponse,
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+# ============================================================================
+# CREATE RECURRENCE RULE
+# ============================================================================
+
+
+@router.post(
+    "",
+    response_model=RecurrenceResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        201: {"description": "Recurring task created"},
+        401: {"model": ErrorResponse, "description": "Unauthorized"},
+        422: {"model": ErrorResponse, "description": "Invalid or unsupported rule"},
+    },
+)
+async def create_recurrence(
+    data: RecurrenceCreate,
+    user=Depends(get_authenticated_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Create a recurring task
+
+    - **title**: Title of each occurrence
+    - **rule**: RRULE such as `FREQ=DAILY`, `FREQ=WEEKLY;BYDAY=MO,WE,FR` or
+      `FREQ=MONTHLY;INTERVAL=2;BYMONTHDAY=1;COUNT=6`
+    - **starts_at**: First occurrence (default: now); later occurrences keep
+      its time of day in your timezone
+    - **tags**: Tags for each occurrence
+
+    Only the next occurrence exists as a task at any time. It is created
+    when it falls due, or as soon as the previous one is completed.
+    """
+    try:
+        rule = RecurrenceRepository.create_rule(db, user, data)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(e)
+        )
+
+    if not rule:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error creating recurring task",
+        )
+
+    logger.info(f"Recurring task created: {rule.id} for user {user.id}")
+    return RecurrenceResponse.model_validate(rule)
+
+
+# ============================================================================
+# LIST RECURRENCE RULES
+# ============================================================================
+
+
+@router.get(
+    "",
+    response_model=RecurrenceListResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "Recurring tasks retrieved"},
+        401: {"model": ErrorResponse, "description": "Unauthorized"},
+    },
+)
+async def list_recurrences(
+    user=Depends(get_authenticated_user), db: Session = Depends(get_db)
+):
+    """Get the authenticated user's recurring tasks"""
+    rules = RecurrenceRepository.get_rules_by_user(db, user.id)
+    return RecurrenceListResponse(
+        rules=[RecurrenceResponse.model_validate(rule) for rule in rules]
+    )
+
+
+# ============================================================================
+# DELETE RECURRENCE RULE
+# ============================================================================
+
+
+@router.delete(
+    "/{rule_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={
+        204: {"description": "Recurring task deleted"},
+        401: {"model": ErrorResponse, "description": "Unauthorized"},
+        404: {"model": ErrorResponse, "description": "Recurring task not found"},
+    },
+)
+async def delete_recurrence(
+    rule_id: int, user=Depends(get_authenticated_user), db: Session = Depends(get_db)
+):
+    """
+    Stop a recurring task
+
+    Occurrences that already exist are kept as ordinary tasks.
+    """
+    rule = RecurrenceRepository.get_rule_by_id(db, rule_id)
+
+    if not rule:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Recurring task not found"
+        )
+
+    if rule.user_id != user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to delete this recurring task",
+        )
+
+    if not RecurrenceRepository.delete_rule(db, rule_id):
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error deleting recurring task",
+        )
+
+    logger.info(f"Recurring task deleted: {rule_id}")
+    return None
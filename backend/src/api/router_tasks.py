@@ -2,26 +2,110 @@
 Task management API endpoints - CRUD operations for tasks
 """
 
+import base64
+import json
 import logging
-
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Literal, Optional, Tuple, Union
+
+import xxhash
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from src.api.etags import if_match, if_none_match, make_etag, not_modified
+from src.api.serialization import (
+    TASK_FIELDS,
+    task_list_response,
+    task_rows_response,
+)
 from src.dependencies import get_authenticated_user
-from src.repository.database import get_db
-from src.repository.repositories import TaskRepository
+from src.repository.database import ReadSessionLocal, get_db
+from src.repository.repositories import (
+    TaskConflictError,
+    TaskRepository,
+    UserRepository,
+    normalize_tag,
+)
 from src.schemas import (
     ErrorResponse,
+    SparseTaskListResponse,
+    SyncMutationResult,
+    SyncPushResponse,
+    SyncRequest,
+    TaskBatchUpdate,
+    TaskBatchUpdateResponse,
     TaskCreate,
+    TaskImportResponse,
     TaskListResponse,
     TaskResponse,
+    TaskSearchHit,
+    TaskSearchResponse,
+    TaskSyncResponse,
     TaskUpdate,
 )
+from src.services.export_service import (
+    export_filename,
+    export_media_type,
+    export_stream,
+)
+from src.services.import_service import (
+    ImportFormatError,
+    ImportLimitError,
+    import_tasks,
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Deletions older than this are forgotten; older cursors get a full resync
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "30"))
+
+# Clients may cache task lists but must revalidate with If-None-Match
+CACHE_CONTROL = "private, no-cache"
+
+
+def task_list_etag(user, *variant) -> str:
+    """
+    Strong ETag for a view of the user's task list
+
+    Derived from the per-user task-list version, which every task write
+    bumps, so checking it needs no task query. Query parameters that shape
+    the view are hashed in (tag text may contain quotes or commas).
+    """
+    key = xxhash.xxh64_hexdigest("\x1f".join(str(part) for part in variant))
+    return make_etag("tasks", user.id, user.task_list_version, key)
+
+
+def task_etag(task) -> str:
+    """Strong ETag for a single task, derived from its version"""
+    return make_etag("task", task.id, task.version)
+
+
+def parse_task_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Parse a ?fields= list into known task fields, or None for all fields"""
+    if fields is None:
+        return None
+    selected = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [field for field in selected if field not in TASK_FIELDS]
+    if not selected or unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"fields must be a comma-separated subset of: {', '.join(TASK_FIELDS)}",
+        )
+    return selected
+
 
 # ============================================================================
 # CREATE TASK
@@ -33,12 +117,17 @@ router = APIRouter()
     response_model=TaskResponse,
     status_code=status.HTTP_201_CREATED,
     responses={
+        200: {"description": "Near-duplicate found, existing task returned"},
         201: {"description": "Task created successfully"},
         401: {"model": ErrorResponse, "description": "Unauthorized"},
     },
 )
 async def create_task(
     task_data: TaskCreate,
+    response: Response,
+    skip_duplicates: bool = Query(
+        False, description="Return an existing near-duplicate instead of creating"
+    ),
     user=Depends(get_authenticated_user),
     db: Session = Depends(get_db),
 ):
@@ -46,7 +135,17 @@ async def create_task(
     Create a new task for the authenticated user
 
     - **title**: Task title (required, 1-255 characters)
+    - **tags**: Optional category tags (up to 10)
+    - **skip_duplicates**: If true and a near-identical task already exists,
+      that task is returned with status 200 and nothing is created
     """
+    if skip_duplicates:
+        duplicate = TaskRepository.find_duplicate_task(db, user.id, task_data.title)
+        if duplicate:
+            logger.info(f"Skipped duplicate of task {duplicate.id} for user {user.id}")
+            response.status_code = status.HTTP_200_OK
+            return TaskResponse.model_validate(duplicate)
+
     created_task = TaskRepository.create_task(db, user.id, task_data)
 
     if not created_task:
@@ -66,15 +165,23 @@ async def create_task(
 
 @router.get(
     "",
-    response_model=TaskListResponse,
+    response_model=Union[TaskListResponse, SparseTaskListResponse],
     status_code=status.HTTP_200_OK,
     responses={
         200: {"description": "Tasks retrieved successfully"},
+        304: {"description": "Task list unchanged since If-None-Match"},
         401: {"model": ErrorResponse, "description": "Unauthorized"},
     },
 )
 async def get_tasks(
     status_filter: str = Query(None, description="Filter: all, completed, pending"),
+    tag: Optional[str] = Query(None, description="Only tasks with this tag"),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated task fields to return, e.g. id,title"
+    ),
+    include_stats: bool = Query(True, description="Include total/completed/pending"),
+    include_archived: bool = Query(False, description="Also list archived tasks"),
+    if_none_match_header: Optional[str] = Header(None, alias="If-None-Match"),
     user=Depends(get_authenticated_user),
     db: Session = Depends(get_db),
 ):
@@ -82,25 +189,405 @@ async def get_tasks(
     Get all tasks for the authenticated user
 
     - **status_filter**: Optional filter (all, completed, pending)
+    - **tag**: Optional tag filter; totals still cover all tasks
+    - **fields**: Optional sparse fieldset; only these columns are queried
+    - **include_stats**: Set false to omit the totals and skip their COUNTs
+    - **include_archived**: Also return archived (old completed) tasks;
+      totals always include them
+
+    Send the returned ETag as If-None-Match to get 304 when unchanged.
     """
+    selected = parse_task_fields(fields)
+    view = status_filter if status_filter in ("completed", "pending") else "all"
+    etag = task_list_etag(
+        user,
+        "list",
+        view,
+        normalize_tag(tag) if tag is not None else "",
+        ",".join(selected or ()),
+        include_stats,
+        include_archived,
+    )
+    if if_none_match(if_none_match_header, etag):
+        return not_modified(etag)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+    if selected or not include_stats or include_archived:
+        rows = TaskRepository.get_task_rows(
+            db,
+            user.id,
+            selected or TASK_FIELDS,
+            view,
+            tag,
+            include_archived=include_archived,
+        )
+        stats = (
+            TaskRepository.get_task_statistics(db, user.id) if include_stats else None
+        )
+        logger.info(f"Retrieved {len(rows)} task rows for user {user.id}")
+        return task_rows_response(rows, selected or TASK_FIELDS, stats, headers=headers)
+
     if status_filter == "completed":
-        tasks = TaskRepository.get_completed_tasks(db, user.id)
+        tasks = TaskRepository.get_completed_tasks(db, user.id, tag)
     elif status_filter == "pending":
-        tasks = TaskRepository.get_pending_tasks(db, user.id)
+        tasks = TaskRepository.get_pending_tasks(db, user.id, tag)
     else:
-        tasks = TaskRepository.get_tasks_by_user(db, user.id)
+        tasks = TaskRepository.get_tasks_by_user(db, user.id, tag)
 
     stats = TaskRepository.get_task_statistics(db, user.id)
 
     logger.info(f"Retrieved {len(tasks)} tasks for user {user.id}")
-    return TaskListResponse(
-        tasks=[TaskResponse.model_validate(t) for t in tasks],
-        total=stats["total"],
-        completed=stats["completed"],
-        pending=stats["pending"],
+    return task_list_response(tasks, stats, headers=headers)
+
+
+# ============================================================================
+# BATCH UPDATE TASKS
+# ============================================================================
+
+
+@router.patch(
+    "",
+    response_model=TaskBatchUpdateResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "All tasks updated"},
+        401: {"model": ErrorResponse, "description": "Unauthorized"},
+        404: {"model": ErrorResponse, "description": "Task not found"},
+        409: {"model": ErrorResponse, "description": "A task changed (version)"},
+    },
+)
+async def batch_update_tasks(
+    batch: TaskBatchUpdate,
+    user=Depends(get_authenticated_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Update several tasks at once as compare-and-swap, all or nothing
+
+    - **updates**: Items with the task **id**, the **expected_version** last
+      seen by the client and the fields to change (as for `PUT /tasks/{id}`)
+
+    If any task is no longer at its expected version nothing is changed and
+    409 is returned listing the ids that changed.
+    """
+    try:
+        tasks = TaskRepository.update_tasks(db, user.id, batch.updates)
+    except LookupError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except TaskConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Tasks changed since the expected version: "
+            f"{', '.join(map(str, e.task_ids))}",
+        )
+
+    if tasks is None:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error updating tasks",
+        )
+
+    logger.info(f"Batch updated {len(tasks)} tasks for user {user.id}")
+    return TaskBatchUpdateResponse(
+        tasks=[TaskResponse.model_validate(task) for task in tasks]
+    )
+
+
+# ============================================================================
+# EXPORT TASKS
+# ============================================================================
+
+
+@router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    responses={
+        200: {"description": "Task export stream"},
+        401: {"model": ErrorResponse, "description": "Unauthorized"},
+    },
+)
+async def export_tasks(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="ndjson or csv"),
+    compression: Optional[Literal["gzip", "zstd"]] = Query(
+        None, description="Compress the file on the fly (gzip or zstd)"
+    ),
+    user=Depends(get_authenticated_user),
+):
+    """
+    Download all of the authenticated user's tasks
+
+    Rows are read with a server-side cursor and streamed batch by batch,
+    so memory use stays flat regardless of how many tasks there are.
+    """
+    user_id = user.id
+
+    def generate():
+        # The stream outlives the request's dependencies, so it owns a session
+        db = ReadSessionLocal(info={"user_id": user_id})
+        try:
+            batches = TaskRepository.iter_export_batches(db, user_id)
+            yield from export_stream(batches, format, compression)
+        finally:
+            db.close()
+
+    logger.info(f"Exporting tasks for user {user_id} as {format}")
+    filename = export_filename(format, compression)
+    return StreamingResponse(
+        generate(),
+        media_type=export_media_type(format, compression),
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
 
 
+# ============================================================================
+# IMPORT TASKS
+# ============================================================================
+
+
+@router.post(
+    "/import",
+    response_model=TaskImportResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "Import finished (see failed/errors for skipped rows)"},
+        400: {"model": ErrorResponse, "description": "Body cannot be parsed"},
+        401: {"model": ErrorResponse, "description": "Unauthorized"},
+        413: {"model": ErrorResponse, "description": "Too many rows"},
+    },
+)
+async def import_task_file(
+    request: Request,
+    format: Optional[Literal["ndjson", "csv"]] = Query(
+        None, description="Body format (default: from Content-Type)"
+    ),
+    user=Depends(get_authenticated_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Bulk-import tasks from an NDJSON or CSV request body
+
+    Each row needs a title and may set is_completed, created_at,
+    completed_at and tags (a list, or ';'-separated in CSV). Files produced
+    by /tasks/export can be imported as-is. The body is parsed as it
+    streams in; invalid rows are reported and skipped, valid rows are
+    committed in one transaction.
+    """
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        format = "csv" if "csv" in content_type else "ndjson"
+
+    try:
+        result = await import_tasks(db, user, request.stream(), format)
+    except ImportLimitError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE, detail=str(e)
+        )
+    except ImportFormatError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error importing tasks",
+        )
+
+    return result
+
+
+# ============================================================================
+# SEARCH TASKS
+# ============================================================================
+
+
+def _encode_cursor(score: float, task_id: int) -> str:
+    raw = json.dumps([score, task_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        score, task_id = json.loads(raw)
+        return float(score), int(task_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
+@router.get(
+    "/search",
+    response_model=TaskSearchResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "Search results"},
+        400: {"model": ErrorResponse, "description": "Invalid cursor"},
+        401: {"model": ErrorResponse, "description": "Unauthorized"},
+    },
+)
+async def search_tasks(
+    q: str = Query(..., min_length=1, max_length=200, description="Search text"),
+    limit: int = Query(20, ge=1, le=100, description="Results per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor of previous page"),
+    include_notes: bool = Query(False, description="Also search goals and notes"),
+    user=Depends(get_authenticated_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Full-text search over the authenticated user's tasks
+
+    - **q**: Words to find; the last word and words ending in `*` match prefixes
+    - **limit**: Page size (1-100)
+    - **cursor**: Opaque cursor from the previous page
+    - **include_notes**: Also return matching lines from goals and notes
+    """
+    after = _decode_cursor(cursor) if cursor else None
+    hits = TaskRepository.search_tasks(db, user.id, q, limit=limit, after=after)
+
+    next_cursor = None
+    if len(hits) == limit:
+        last_task, last_score, _ = hits[-1]
+        next_cursor = _encode_cursor(last_score, last_task.id)
+
+    context_matches = None
+    if include_notes and not cursor:
+        context_matches = UserRepository.search_user_context(db, user.id, q)
+
+    logger.info(f"Search returned {len(hits)} tasks for user {user.id}")
+    return TaskSearchResponse(
+        tasks=[
+            TaskSearchHit(
+                **TaskResponse.model_validate(task).model_dump(),
+                score=score,
+                highlight=highlight,
+            )
+            for task, score, highlight in hits
+        ],
+        next_cursor=next_cursor,
+        context_matches=context_matches,
+    )
+
+
+# ============================================================================
+# DELTA SYNC
+# ============================================================================
+
+
+def sync_horizon() -> datetime:
+    """Oldest cursor for which deletions are still known (naive UTC)"""
+    return datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(
+        days=SYNC_TOMBSTONE_RETENTION_DAYS
+    )
+
+
+@router.get(
+    "/sync",
+    response_model=TaskSyncResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "Changes since cursor"},
+        400: {"model": ErrorResponse, "description": "Invalid cursor"},
+        401: {"model": ErrorResponse, "description": "Unauthorized"},
+    },
+)
+async def get_task_changes(
+    since: Optional[str] = Query(None, description="cursor from the previous sync"),
+    user=Depends(get_authenticated_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Get task changes since the previous sync
+
+    - **since**: Cursor returned by the previous sync (omit for a full snapshot)
+
+    Apply `deleted` first, then upsert `changed`. If `full_resync` is true,
+    replace the local list with `changed`.
+    """
+    since_version = None
+    if since:
+        try:
+            since_version = int(since)
+        except ValueError:
+            try:
+                # Timestamp cursors from before versioned sync: start over
+                datetime.fromisoformat(since)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+                )
+
+    changed, deleted, cursor, full_resync = TaskRepository.get_changes_since(
+        db, user.id, since_version
+    )
+
+    logger.info(
+        f"Sync for user {user.id}: {len(changed)} changed, {len(deleted)} deleted"
+    )
+    return TaskSyncResponse(
+        changed=[TaskResponse.model_validate(t) for t in changed],
+        deleted=deleted,
+        cursor=str(cursor),
+        full_resync=full_resync,
+    )
+
+
+@router.post(
+    "/sync",
+    response_model=SyncPushResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "Mutations processed"},
+        401: {"model": ErrorResponse, "description": "Unauthorized"},
+    },
+)
+async def push_task_changes(
+    request: SyncRequest,
+    user=Depends(get_authenticated_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Apply a batch of offline task mutations
+
+    - **mutations**: create/update/delete operations recorded while offline
+
+    Updates and deletes carry the `base_updated_at` the client last saw; if the
+    server copy is newer the mutation is reported as a conflict together with
+    the server version. Non-conflicting mutations are committed atomically.
+    """
+    results = TaskRepository.apply_sync_mutations(db, user.id, request.mutations)
+
+    if results is None:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error applying sync mutations",
+        )
+
+    response = SyncPushResponse(
+        results=[
+            SyncMutationResult(
+                client_id=result["client_id"],
+                task_id=result["task_id"],
+                status=result["status"],
+                detail=result["detail"],
+                task=(
+                    TaskResponse.model_validate(result["task"])
+                    if result["task"]
+                    else None
+                ),
+            )
+            for result in results
+        ],
+        applied=sum(1 for r in results if r["status"] == "applied"),
+        conflicts=sum(1 for r in results if r["status"] == "conflict"),
+    )
+    logger.info(
+        f"Sync push for user {user.id}: {response.applied} applied, "
+        f"{response.conflicts} conflicts"
+    )
+    return response
+
+
 # ============================================================================
 # GET SINGLE TASK
 # ============================================================================
@@ -117,12 +604,17 @@ async def get_tasks(
     },
 )
 async def get_task(
-    task_id: int, user=Depends(get_authenticated_user), db: Session = Depends(get_db)
+    task_id: int,
+    response: Response,
+    user=Depends(get_authenticated_user),
+    db: Session = Depends(get_db),
 ):
     """
     Get a specific task by ID
 
     - **task_id**: Task ID (must belong to authenticated user)
+
+    The ETag can be sent as If-Match on `PUT /tasks/{task_id}`.
     """
     task = TaskRepository.get_task_by_id(db, task_id)
 
@@ -138,6 +630,7 @@ async def get_task(
             detail="You do not have permission to access this task",
         )
 
+    response.headers["ETag"] = task_etag(task)
     return TaskResponse.model_validate(task)
 
 
@@ -154,11 +647,15 @@ async def get_task(
         200: {"description": "Task updated successfully"},
         401: {"model": ErrorResponse, "description": "Unauthorized"},
         404: {"model": ErrorResponse, "description": "Task not found"},
+        409: {"model": ErrorResponse, "description": "Task changed (version)"},
+        412: {"model": ErrorResponse, "description": "Task changed (If-Match)"},
     },
 )
 async def update_task(
     task_id: int,
     task_data: TaskUpdate,
+    response: Response,
+    if_match_header: Optional[str] = Header(None, alias="If-Match"),
     user=Depends(get_authenticated_user),
     db: Session = Depends(get_db),
 ):
@@ -168,6 +665,12 @@ async def update_task(
     - **task_id**: Task ID
     - **title**: New task title (optional)
     - **is_completed**: Mark as completed/pending (optional)
+    - **tags**: Replace the task's tags (optional)
+    - **expected_version**: Only update if the task is at this version (optional)
+
+    Send the task's ETag as If-Match, or its version as expected_version, to
+    reject the update (412 / 409) if the task changed in the meantime. A
+    concurrent write that lands between the read and the update is a 409.
     """
     task = TaskRepository.get_task_by_id(db, task_id)
 
@@ -183,7 +686,23 @@ async def update_task(
             detail="You do not have permission to update this task",
         )
 
-    updated_task = TaskRepository.update_task(db, task_id, task_data)
+    if not if_match(if_match_header, task_etag(task)):
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Task has been modified, fetch it again before updating",
+        )
+
+    try:
+        updated_task = TaskRepository.update_task(db, task_id, task_data)
+    except TaskConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=(
+                f"Task has been modified (current version {e.current_version})"
+                if e.current_version is not None
+                else "Task has been modified concurrently"
+            ),
+        )
 
     if not updated_task:
         raise HTTPException(
@@ -191,6 +710,7 @@ async def update_task(
             detail="Error updating task",
         )
 
+    response.headers["ETag"] = task_etag(updated_task)
     logger.info(f"Task updated: {task_id}")
     return TaskResponse.model_validate(updated_task)
 
@@ -253,20 +773,31 @@ async def delete_task(
     status_code=status.HTTP_200_OK,
     responses={
         200: {"description": "Statistics retrieved"},
+        304: {"description": "Statistics unchanged since If-None-Match"},
         401: {"model": ErrorResponse, "description": "Unauthorized"},
     },
 )
 async def get_statistics(
-    user=Depends(get_authenticated_user), db: Session = Depends(get_db)
+    response: Response,
+    if_none_match_header: Optional[str] = Header(None, alias="If-None-Match"),
+    user=Depends(get_authenticated_user),
+    db: Session = Depends(get_db),
 ):
     """
     Get task statistics for the authenticated user
 
-    Returns: total, completed, pending tasks and completion rate
+    Returns: total, completed, pending tasks and completion rate.
+    Supports If-None-Match with the returned ETag (304 when unchanged).
     """
+    etag = task_list_etag(user, "stats")
+    if if_none_match(if_none_match_header, etag):
+        return not_modified(etag)
+
     stats = TaskRepository.get_task_statistics(db, user.id)
 
     logger.info(f"Retrieved statistics for user {user.id}")
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
     return {
         "total_tasks": stats["total"],
         "completed_tasks": stats["completed"],
@@ -0,0 +1,127 @@
+"""
+WebSocket change feed - Pushes task and context changes to connected clients
+Replaces polling the task endpoints to stay in sync across devices
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+import orjson
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+
+from src.repository.change_feed import Subscription, change_feed
+from src.repository.database import ReadSessionLocal, User
+from src.services.auth_service import decode_token, get_current_user
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+def socket_token(websocket: WebSocket) -> Optional[str]:
+    """Bearer token from the Authorization header or the token query parameter"""
+    scheme, _, credentials = websocket.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and credentials:
+        return credentials
+    # Browsers cannot set headers on a WebSocket handshake
+    return websocket.query_params.get("token")
+
+
+async def forward_events(websocket: WebSocket, subscription: Subscription):
+    """Send queued events until the connection closes"""
+    while True:
+        await websocket.send_text(await subscription.get())
+
+
+async def discard_messages(websocket: WebSocket):
+    """Read (and ignore) client messages so a disconnect is noticed"""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+
+@router.websocket("")
+async def change_feed_socket(websocket: WebSocket):
+    """
+    Stream change events for the authenticated user
+
+    Authenticate with `Authorization: Bearer <token>` or `?token=<token>`.
+    The first message is `{"type": "ready", "task_list_version": n,
+    "context_version": n}`; compare them with cached values to decide
+    whether to sync. Then:
+
+    - `{"type": "tasks.changed", "changed": [ids], "deleted": [ids]}`
+    - `{"type": "context.updated", "version": n}`
+    - `{"type": "resync"}` - changes were not listed or events were dropped
+      because the client fell behind; pull `/tasks/sync` and `/context`
+
+    The connection is closed with code 1008 when the token expires.
+    """
+    token = socket_token(websocket)
+    payload = decode_token(token) if token else None
+    if not payload:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    subscription = None
+    db = ReadSessionLocal()
+    try:
+        user = get_current_user(db, token)
+        if user:
+            db.info["user_id"] = user.id
+            # Subscribe before reading the versions so no commit falls between
+            subscription = change_feed.subscribe(user.id)
+            versions = (
+                db.query(User.task_list_version, User.context_version)
+                .filter(User.id == user.id)
+                .one()
+            )
+    finally:
+        db.close()
+
+    if subscription is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    try:
+        await websocket.accept()
+        await websocket.send_text(
+            orjson.dumps(
+                {
+                    "type": "ready",
+                    "task_list_version": versions.task_list_version,
+                    "context_version": versions.context_version,
+                }
+            ).decode()
+        )
+        logger.info(f"Change feed connected for user {subscription.user_id}")
+
+        tasks = {
+            asyncio.create_task(forward_events(websocket, subscription)),
+            asyncio.create_task(discard_messages(websocket)),
+        }
+        expires_in = max(payload["exp"] - time.time(), 0) if "exp" in payload else None
+        done, pending = await asyncio.wait(
+            tasks, timeout=expires_in, return_when=asyncio.FIRST_COMPLETED
+        )
+        for task in pending:
+            task.cancel()
+        for task in done:
+            # A send to a vanished client fails; nothing is left to clean up
+            task.exception()
+        if not done:
+            await websocket.close(
+                code=status.WS_1008_POLICY_VIOLATION, reason="Token expired"
+            )
+
+    except WebSocketDisconnect:
+        pass
+    finally:
+        change_feed.unsubscribe(subscription)
+        logger.info(
+            f"Change feed closed for user {subscription.user_id} "
+            f"({subscription.dropped} events dropped)"
+        )
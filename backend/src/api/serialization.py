@@ -0,0 +1,87 @@
+"""
+Fast JSON responses for the hottest endpoints
+
+FastAPI's default path for a returned model is: dump it to a dict, validate
+that dict again against response_model, serialize it to JSON-compatible
+Python and finally json.dumps() it. For large task lists that costs more
+than the query. The adapters below are compiled once at import, validate
+ORM rows in a single call and emit JSON bytes straight from pydantic-core.
+Everything else goes through the app-wide ORJSONResponse.
+"""
+
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+import orjson
+from fastapi import Response, status
+from pydantic import TypeAdapter
+
+from src.repository.database import TAG_NAMES_SEPARATOR
+from src.schemas import AISuggestionResponse, TaskListResponse, TaskResponse
+
+JSON_MEDIA_TYPE = "application/json"
+
+# Fields a sparse task list may select (?fields=)
+TASK_FIELDS = tuple(TaskResponse.model_fields)
+
+task_list_adapter = TypeAdapter(TaskListResponse)
+ai_suggestion_adapter = TypeAdapter(AISuggestionResponse)
+
+
+def json_response(
+    adapter: TypeAdapter,
+    value: Any,
+    status_code: int = status.HTTP_200_OK,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """Serialize an already-validated value with its adapter"""
+    return Response(
+        content=adapter.dump_json(value),
+        status_code=status_code,
+        media_type=JSON_MEDIA_TYPE,
+        headers=headers,
+    )
+
+
+def task_list_response(
+    tasks: Iterable, stats: dict, headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """Validate Task rows and stats in one pass and render the list response"""
+    payload = task_list_adapter.validate_python(
+        {
+            "tasks": tasks,
+            "total": stats["total"],
+            "completed": stats["completed"],
+            "pending": stats["pending"],
+        },
+        from_attributes=True,
+    )
+    return json_response(task_list_adapter, payload, headers=headers)
+
+
+def task_rows_response(
+    rows: Iterable[Sequence],
+    fields: Sequence[str],
+    stats: Optional[dict] = None,
+    tag_separator: str = TAG_NAMES_SEPARATOR,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    Render a sparse task list from plain column rows
+
+    Rows come straight from the database in the order of fields, so no
+    validation is needed; orjson writes datetimes the same way pydantic does.
+    The total/completed/pending keys are only present when stats are given.
+    """
+    tasks = [dict(zip(fields, row)) for row in rows]
+    if "tags" in fields:
+        for task in tasks:
+            names = task["tags"]
+            task["tags"] = sorted(names.split(tag_separator)) if names else []
+    body = {"tasks": tasks}
+    if stats is not None:
+        body.update(
+            total=stats["total"], completed=stats["completed"], pending=stats["pending"]
+        )
+    return Response(
+        content=orjson.dumps(body), media_type=JSON_MEDIA_TYPE, headers=headers
+    )
@@ -44,4 +44,6 @@ async def get_authenticated_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # Lets read sessions honour read-your-writes for this user
+    db.info["user_id"] = user.id
     return user
@@ -0,0 +1,389 @@
+"""
+In-process metrics in the Prometheus text exposition format
+
+Counters, gauges and histograms keep their values in per-thread shards:
+each thread only ever writes to its own dict, so recording a value takes no
+lock and cannot lose updates, and a scrape sums the shards of every thread
+that has recorded something. Values read during a scrape may be a few
+observations apart (for example a histogram's sum and count), which is fine
+for metrics that are rated over minutes.
+
+Callback gauges and caches are read only when /metrics is scraped.
+"""
+
+import logging
+import os
+import threading
+from bisect import bisect_left
+from time import perf_counter
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; tuned for API requests and SQLite queries
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value) -> str:
+    if isinstance(value, float):
+        if value == float("inf"):
+            return "+Inf"
+        return repr(value)
+    return str(value)
+
+
+# ============================================================================
+# METRIC TYPES
+# ============================================================================
+
+
+class _Shards:
+    """Per-thread dicts of label values -> value, summed on scrape"""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all: List[dict] = []
+
+    def mine(self) -> dict:
+        try:
+            return self._local.values
+        except AttributeError:
+            values = self._local.values = {}
+            with self._lock:
+                self._all.append(values)
+            return values
+
+    def snapshots(self) -> List[dict]:
+        with self._lock:
+            shards = list(self._all)
+        # dict.copy() runs without releasing the GIL, so a writer cannot
+        # resize the dict halfway through
+        return [shard.copy() for shard in shards]
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._shards = _Shards()
+
+    def _totals(self) -> Dict[tuple, float]:
+        totals: Dict[tuple, float] = {}
+        for shard in self._shards.snapshots():
+            for labels, value in shard.items():
+                totals[labels] = totals.get(labels, 0) + value
+        return totals
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for labels, value in sorted(self._totals().items(), key=_label_key):
+            lines.append(
+                f"{self.name}{_format_labels(self.labelnames, labels)} "
+                f"{_format_value(value)}"
+            )
+        return lines
+
+
+def _label_key(item) -> tuple:
+    return tuple(str(value) for value in item[0])
+
+
+class Counter(_Metric):
+    """Monotonic total per label combination"""
+
+    kind = "counter"
+
+    def inc(self, labels: tuple = (), amount: float = 1):
+        shard = self._shards.mine()
+        shard[labels] = shard.get(labels, 0) + amount
+
+
+class Gauge(Counter):
+    """Value that goes up and down, such as requests in progress"""
+
+    kind = "gauge"
+
+    def dec(self, labels: tuple = (), amount: float = 1):
+        shard = self._shards.mine()
+        shard[labels] = shard.get(labels, 0) - amount
+
+
+class Histogram(_Metric):
+    """Observation counts in fixed buckets, plus their sum"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # One slot per bucket, one for +Inf, then the sum
+        self._width = len(self.buckets) + 2
+
+    def observe(self, labels: tuple, value: float):
+        shard = self._shards.mine()
+        slots = shard.get(labels)
+        if slots is None:
+            slots = shard[labels] = [0] * self._width
+        slots[bisect_left(self.buckets, value)] += 1
+        slots[-1] += value
+
+    def _totals(self) -> Dict[tuple, List[float]]:
+        totals: Dict[tuple, List[float]] = {}
+        for shard in self._shards.snapshots():
+            for labels, slots in shard.items():
+                total = totals.setdefault(labels, [0] * self._width)
+                for i, value in enumerate(list(slots)):
+                    total[i] += value
+        return totals
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        names = self.labelnames + ("le",)
+        for labels, slots in sorted(self._totals().items(), key=_label_key):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), slots):
+                cumulative += count
+                le = _format_value(float(bound))
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(names, labels + (le,))} "
+                    f"{cumulative}"
+                )
+            suffix = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{suffix} {_format_value(slots[-1])}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+class CallbackMetric(_Metric):
+    """Gauge (or counter kept elsewhere) read from a function at scrape time"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], Dict[tuple, float]],
+        labelnames: Sequence[str] = (),
+        kind: str = "gauge",
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._callback = callback
+        self.kind = kind
+
+    def _totals(self) -> Dict[tuple, float]:
+        return dict(self._callback())
+
+
+# ============================================================================
+# REGISTRY
+# ============================================================================
+
+
+class MetricsRegistry:
+    """Named metrics plus cache statistics, rendered together on scrape"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+        self._caches: Dict[str, Callable[[], Tuple[int, int]]] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback_gauge(
+        self, name: str, documentation: str, callback, labelnames=()
+    ) -> CallbackMetric:
+        return self._register(CallbackMetric(name, documentation, callback, labelnames))
+
+    def register_cache(self, name: str, stats: Callable[[], Tuple[int, int]]):
+        """Report a cache's (hits, misses) as cache_* metrics labelled by name"""
+        with self._lock:
+            self._caches[name] = stats
+
+    def _cache_metrics(self) -> List[_Metric]:
+        with self._lock:
+            caches = dict(self._caches)
+        stats = {}
+        for name, read in caches.items():
+            try:
+                stats[name] = read()
+            except Exception as e:
+                logger.error(f"Error reading stats of cache {name}: {str(e)}")
+        hits = {(name,): s[0] for name, s in stats.items()}
+        misses = {(name,): s[1] for name, s in stats.items()}
+        ratios = {
+            (name,): s[0] / (s[0] + s[1]) for name, s in stats.items() if s[0] + s[1]
+        }
+        return [
+            CallbackMetric(
+                "cache_hits_total",
+                "Cache lookups served from the cache",
+                lambda: hits,
+                ("cache",),
+                kind="counter",
+            ),
+            CallbackMetric(
+                "cache_misses_total",
+                "Cache lookups that had to load the value",
+                lambda: misses,
+                ("cache",),
+                kind="counter",
+            ),
+            CallbackMetric(
+                "cache_hit_ratio",
+                "Share of cache lookups that were hits since startup",
+                lambda: ratios,
+                ("cache",),
+            ),
+        ]
+
+    def render(self) -> str:
+        """All metrics in the text exposition format (version 0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics + self._cache_metrics():
+            try:
+                lines.extend(metric.render())
+            except Exception as e:
+                logger.error(f"Error rendering metric {metric.name}: {str(e)}")
+        return "\n".join(lines) + "\n"
+
+
+# Shared registry used across the application
+registry = MetricsRegistry()
+
+
+# ============================================================================
+# DATABASE METRICS
+# ============================================================================
+
+DB_QUERY_SECONDS = registry.histogram(
+    "db_query_duration_seconds",
+    "Time spent executing SQL statements",
+    ("engine", "operation"),
+)
+DB_ERRORS = registry.counter(
+    "db_errors_total", "SQL statements that raised an error", ("engine",)
+)
+
+_OPERATIONS = {
+    "SELECT": "select",
+    "INSERT": "insert",
+    "UPDATE": "update",
+    "DELETE": "delete",
+}
+
+_pools: Dict[str, Engine] = {}
+
+
+def _checked_out() -> Dict[tuple, float]:
+    return {
+        (name,): engine.pool.checkedout()
+        for name, engine in _pools.items()
+        if hasattr(engine.pool, "checkedout")
+    }
+
+
+registry.callback_gauge(
+    "db_pool_connections_in_use",
+    "Connections checked out of the engine's pool",
+    _checked_out,
+    ("engine",),
+)
+
+
+def _timed(execute, name: str):
+    """Wrap a dialect execute method to record the statement's duration"""
+
+    def timed(cursor, statement, *args, **kwargs):
+        operation = _OPERATIONS.get(statement[:6].upper(), "other")
+        started = perf_counter()
+        try:
+            return execute(cursor, statement, *args, **kwargs)
+        except Exception:
+            DB_ERRORS.inc((name,))
+            raise
+        finally:
+            DB_QUERY_SECONDS.observe((name, operation), perf_counter() - started)
+
+    return timed
+
+
+def instrument_engine(engine: Engine, name: str):
+    """
+    Record query counts, durations and errors for an engine
+
+    Wraps the engine's own dialect execute methods rather than listening for
+    before/after_cursor_execute: any connection event listener moves every
+    statement onto SQLAlchemy's event dispatch path, which costs ~15 us per
+    query here against ~1 us for the wrapper.
+    """
+    if not METRICS_ENABLED or name in _pools:
+        return
+    _pools[name] = engine
+    dialect = engine.dialect
+    for method in ("do_execute", "do_executemany", "do_execute_no_params"):
+        setattr(dialect, method, _timed(getattr(dialect, method), name))
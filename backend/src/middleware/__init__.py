@@ -0,0 +1,6 @@
+"""ASGI middleware package"""
+
+from .compression import CompressionMiddleware, compression_stats
+from .metrics import MetricsMiddleware
+
+__all__ = ["CompressionMiddleware", "MetricsMiddleware", "compression_stats"]
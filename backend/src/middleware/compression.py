@@ -0,0 +1,260 @@
+"""
+Negotiated response compression (zstd, br, gzip)
+
+A pure ASGI middleware, so streaming responses are compressed chunk by
+chunk as they are produced instead of being buffered. The encoding is
+picked from Accept-Encoding (zstd > br > gzip on ties); small, already
+compressed and non-compressible responses pass through untouched.
+"""
+
+import logging
+import os
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional
+
+import zstandard
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.api.etags import encoded_etag
+
+try:  # Brotli is optional; "br" is only offered when it is installed
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Responses smaller than this many bytes are sent uncompressed
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+# Server preference, used to break ties between equal q-values
+SUPPORTED_ENCODINGS = ["zstd", "br", "gzip"] if brotli else ["zstd", "gzip"]
+
+_COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick a content coding from an Accept-Encoding header
+
+    Returns:
+        "zstd", "br", "gzip" or None if the client accepts none of them
+    """
+    if not accept_encoding:
+        return None
+
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding.strip()] = q
+
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for coding in SUPPORTED_ENCODINGS:
+        q = weights.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    """Whether a media type benefits from compression"""
+    return content_type.lower().startswith(_COMPRESSIBLE_TYPES)
+
+
+# ============================================================================
+# ENCODERS
+# ============================================================================
+
+
+class _Encoder:
+    """Incremental compressor with a common interface for all codings"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "zstd":
+            self._zstd = zstandard.ZstdCompressor(
+                level=COMPRESSION_ZSTD_LEVEL
+            ).compressobj()
+        elif encoding == "br":
+            self._brotli = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+        else:
+            self._zlib = zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes) -> bytes:
+        """Compress a chunk and flush it so the client can decode it now"""
+        if self.encoding == "zstd":
+            return self._zstd.compress(data) + self._zstd.flush(
+                zstandard.COMPRESSOBJ_FLUSH_BLOCK
+            )
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        """Compress the last chunk and end the stream"""
+        if self.encoding == "zstd":
+            return self._zstd.compress(data) + self._zstd.flush()
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._zlib.compress(data) + self._zlib.flush()
+
+
+# ============================================================================
+# STATISTICS
+# ============================================================================
+
+
+class CompressionStats:
+    """Running totals of compressed traffic, per encoding"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals: Dict[str, List[float]] = {}
+
+    def record(self, encoding: str, bytes_in: int, bytes_out: int, cpu_s: float):
+        with self._lock:
+            totals = self._totals.setdefault(encoding, [0, 0, 0, 0.0])
+            totals[0] += 1
+            totals[1] += bytes_in
+            totals[2] += bytes_out
+            totals[3] += cpu_s
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Totals per encoding: responses, bytes_in, bytes_out, cpu_seconds"""
+        with self._lock:
+            return {
+                encoding: {
+                    "responses": int(t[0]),
+                    "bytes_in": int(t[1]),
+                    "bytes_out": int(t[2]),
+                    "cpu_seconds": t[3],
+                }
+                for encoding, t in self._totals.items()
+            }
+
+
+compression_stats = CompressionStats()
+
+
+# ============================================================================
+# MIDDLEWARE
+# ============================================================================
+
+
+class CompressionMiddleware:
+    """Compress HTTP responses with the best encoding the client accepts"""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(send, encoding, self.minimum_size)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """Per-response state: holds the start message until the body is seen"""
+
+    def __init__(self, send: Send, encoding: str, minimum_size: int):
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start: Optional[Message] = None
+        self.encoder: Optional[_Encoder] = None
+        self.passthrough = False
+        self.bytes_in = self.bytes_out = 0
+        self.cpu_s = 0.0
+
+    async def send(self, message: Message):
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            self.passthrough = (
+                message["status"] in (204, 304)
+                or "content-encoding" in headers
+                or not is_compressible(headers.get("content-type", ""))
+            )
+            if self.passthrough:
+                await self._send(message)
+            else:
+                self.start = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start is not None:
+            start, self.start = self.start, None
+            if not more_body and len(body) < self.minimum_size:
+                self.passthrough = True
+                await self._send(start)
+                await self._send(message)
+                return
+
+            # A strong ETag names these exact bytes, so the encoded body
+            # gets its own; the etags helpers accept it in If-None-Match
+            # and If-Match
+            headers = MutableHeaders(raw=start["headers"])
+            if "etag" in headers:
+                headers["etag"] = encoded_etag(headers["etag"], self.encoding)
+            del headers["content-length"]
+            headers["content-encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            self.encoder = _Encoder(self.encoding)
+            await self._send(start)
+
+        started = time.thread_time()
+        if more_body:
+            data = self.encoder.chunk(body) if body else b""
+        else:
+            data = self.encoder.finish(body)
+        self.cpu_s += time.thread_time() - started
+        self.bytes_in += len(body)
+        self.bytes_out += len(data)
+
+        if data or not more_body:
+            await self._send(
+                {"type": "http.response.body", "body": data, "more_body": more_body}
+            )
+        if not more_body:
+            compression_stats.record(
+                self.encoding, self.bytes_in, self.bytes_out, self.cpu_s
+            )
+            logger.debug(
+                f"{self.encoding}: {self.bytes_in} -> {self.bytes_out} bytes "
+                f"in {self.cpu_s * 1000:.2f} ms CPU"
+            )
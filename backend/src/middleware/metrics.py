@@ -0,0 +1,63 @@
+"""
+Per-route request metrics
+
+A pure ASGI middleware that records, for every HTTP request, its latency
+(until the last body chunk is sent, so streamed responses count in full)
+by method and route template, the response status, and the number of
+requests in progress. The route template ("/api/v1/tasks/{task_id}")
+comes from the matched route after routing, which keeps label cardinality
+bounded; requests that match no route are labelled "unmatched".
+"""
+
+from time import perf_counter
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.metrics import registry
+
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ("method", "route"),
+)
+HTTP_RESPONSES = registry.counter(
+    "http_responses_total",
+    "HTTP responses by route template and status code",
+    ("method", "route", "status"),
+)
+HTTP_IN_PROGRESS = registry.gauge(
+    "http_requests_in_progress", "HTTP requests being handled"
+)
+
+
+class MetricsMiddleware:
+    """Record latency, status and in-flight count of HTTP requests"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # An exception before the response starts becomes a 500 upstream
+        status = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_PROGRESS.inc()
+        started = perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = perf_counter() - started
+            HTTP_IN_PROGRESS.dec()
+            route = scope.get("route")
+            labels = (scope["method"], route.path if route else "unmatched")
+            HTTP_REQUEST_SECONDS.observe(labels, elapsed)
+            HTTP_RESPONSES.inc(labels + (status,))
@@ -1,17 +1,51 @@
 ﻿"""Data access layer package"""
 
-from .database import Base, SessionLocal, Task, User, engine, get_db, init_db, reset_db
-from .repositories import TaskRepository, UserRepository
+from .database import (
+    ArchivedTask,
+    Base,
+    DailyCompletion,
+    ReadSessionLocal,
+    RecurrenceRule,
+    SessionLocal,
+    Tag,
+    Task,
+    TaskTombstone,
+    User,
+    engine,
+    get_db,
+    init_db,
+    read_engine,
+    reset_db,
+)
+from .repositories import (
+    AnalyticsRepository,
+    RecurrenceRepository,
+    TaskConflictError,
+    TaskRepository,
+    UserRepository,
+    VersionConflictError,
+)
 
 __all__ = [
     "Base",
     "User",
     "Task",
+    "TaskTombstone",
+    "ArchivedTask",
+    "DailyCompletion",
+    "RecurrenceRule",
+    "Tag",
     "SessionLocal",
+    "ReadSessionLocal",
     "get_db",
     "init_db",
     "reset_db",
     "engine",
+    "read_engine",
     "UserRepository",
     "TaskRepository",
+    "AnalyticsRepository",
+    "RecurrenceRepository",
+    "VersionConflictError",
+    "TaskConflictError",
 ]
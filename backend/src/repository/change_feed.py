@@ -0,0 +1,187 @@
+"""
+In-process publish/subscribe for task and context change events
+
+Repository write paths stage events on their session; they are published
+only when the session commits (a rollback discards them) and are merged per
+user, so one transaction sends at most one task event and one context event
+per user. Each WebSocket connection subscribes with a bounded queue. A
+subscriber that falls behind has its queue replaced by a single "resync"
+event instead of buffering without limit; the client then catches up with
+GET /tasks/sync. Publishing for a user with no subscribers is a dict lookup.
+
+Events only reach connections served by the same process.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from typing import Dict, Iterable, Set
+
+import orjson
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from src.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Events buffered per connection before it is told to resync
+WS_QUEUE_SIZE = int(os.getenv("WS_QUEUE_SIZE", "100"))
+
+RESYNC = orjson.dumps({"type": "resync"}).decode()
+
+_STAGED = "change_feed"
+
+
+class Subscription:
+    """One connection's bounded event queue"""
+
+    __slots__ = ("user_id", "queue", "loop", "dropped", "resync_pending")
+
+    def __init__(self, user_id: int, queue_size: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.loop = asyncio.get_running_loop()
+        self.dropped = 0
+        self.resync_pending = False
+
+    def offer(self, message: str):
+        """Queue a message; on overflow replace the backlog with a resync"""
+        if self.resync_pending:
+            # The client will sync anyway, which covers this change
+            self.dropped += 1
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.dropped += self.queue.qsize() + 1
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+            self.resync_pending = True
+            logger.info(f"Change feed for user {self.user_id} fell behind; resync sent")
+
+    async def get(self) -> str:
+        message = await self.queue.get()
+        if message is RESYNC:
+            self.resync_pending = False
+        return message
+
+
+class ChangeFeed:
+    """Per-user fan-out of change events to subscribed connections"""
+
+    def __init__(self, queue_size: int = WS_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: Dict[int, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id: int) -> Subscription:
+        """Register a connection; must be called from its event loop"""
+        subscription = Subscription(user_id, self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+
+    def connection_count(self) -> int:
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def publish(self, user_id: int, payload: dict):
+        """Send an event to the user's connections; safe from any thread"""
+        with self._lock:
+            subscribers = tuple(self._subscribers.get(user_id, ()))
+        if not subscribers:
+            return
+        message = orjson.dumps(payload).decode()
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, message)
+            except RuntimeError:
+                # The connection's loop has shut down; it unsubscribes itself
+                pass
+
+    # ------------------------------------------------------------------------
+    # STAGING (published on commit)
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def _staged(db: Session, user_id: int) -> dict:
+        return db.info.setdefault(_STAGED, {}).setdefault(
+            user_id,
+            {"changed": set(), "deleted": set(), "resync": False, "context": None},
+        )
+
+    def stage_tasks(
+        self,
+        db: Session,
+        user_id: int,
+        changed: Iterable[int] = (),
+        deleted: Iterable[int] = (),
+        resync: bool = False,
+    ):
+        """
+        Record task changes to publish when the session commits
+
+        Args:
+            changed: IDs of tasks created or updated
+            deleted: IDs of tasks deleted or archived
+            resync: The changes are not listed (e.g. an import); clients
+                should pull /tasks/sync instead
+        """
+        staged = self._staged(db, user_id)
+        staged["changed"].update(changed)
+        staged["deleted"].update(deleted)
+        staged["resync"] = staged["resync"] or resync
+
+    def stage_context(self, db: Session, user_id: int, version: int):
+        """Record a context update to publish when the session commits"""
+        self._staged(db, user_id)["context"] = version
+
+    def _publish_staged(self, db: Session):
+        for user_id, staged in db.info.pop(_STAGED, {}).items():
+            if staged["resync"]:
+                self.publish(user_id, {"type": "resync"})
+            elif staged["changed"] or staged["deleted"]:
+                deleted = staged["deleted"]
+                self.publish(
+                    user_id,
+                    {
+                        "type": "tasks.changed",
+                        "changed": sorted(staged["changed"] - deleted),
+                        "deleted": sorted(deleted),
+                    },
+                )
+            if staged["context"] is not None:
+                self.publish(
+                    user_id, {"type": "context.updated", "version": staged["context"]}
+                )
+
+
+# Shared instance used by the repository layer and the WebSocket router
+change_feed = ChangeFeed()
+registry.callback_gauge(
+    "websocket_connections",
+    "Open change feed connections",
+    lambda: {(): change_feed.connection_count()},
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(db: Session):
+    if _STAGED in db.info:
+        change_feed._publish_staged(db)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(db: Session):
+    db.info.pop(_STAGED, None)
@@ -0,0 +1,128 @@
+"""
+Transparent zstd compression for large text columns
+
+Values above a size threshold are stored as zstd frames (SQLite BLOBs);
+smaller values and rows written before compression was enabled stay plain
+TEXT. Reads tell the two apart by type, so no migration is needed.
+"""
+
+import logging
+import os
+import threading
+from typing import Dict, Iterable, Optional, Union
+
+import zstandard
+from sqlalchemy.types import Text, TypeDecorator
+
+logger = logging.getLogger(__name__)
+
+# Values smaller than this many UTF-8 bytes are stored uncompressed
+CONTEXT_COMPRESSION_THRESHOLD = int(os.getenv("CONTEXT_COMPRESSION_THRESHOLD", "1024"))
+CONTEXT_COMPRESSION_LEVEL = int(os.getenv("CONTEXT_COMPRESSION_LEVEL", "6"))
+
+# Optional trained dictionaries (os.pathsep-separated paths). The first is
+# used for new writes, the others stay available to read older frames.
+CONTEXT_ZSTD_DICTIONARY = os.getenv("CONTEXT_ZSTD_DICTIONARY", "")
+
+
+def _load_dictionaries(paths: str) -> Dict[int, zstandard.ZstdCompressionDict]:
+    dictionaries = {}
+    for path in filter(None, paths.split(os.pathsep)):
+        try:
+            with open(path, "rb") as f:
+                dictionary = zstandard.ZstdCompressionDict(f.read())
+            dictionaries[dictionary.dict_id()] = dictionary
+            logger.info(f"Loaded zstd dictionary {dictionary.dict_id()} from {path}")
+        except OSError as e:
+            logger.error(f"Could not load zstd dictionary {path}: {str(e)}")
+    return dictionaries
+
+
+_dictionaries = _load_dictionaries(CONTEXT_ZSTD_DICTIONARY)
+_write_dictionary: Optional[zstandard.ZstdCompressionDict] = next(
+    iter(_dictionaries.values()), None
+)
+
+# zstd (de)compressor objects are not thread-safe, so keep one per thread
+_local = threading.local()
+
+
+def _compressor() -> zstandard.ZstdCompressor:
+    compressor = getattr(_local, "compressor", None)
+    if compressor is None:
+        compressor = zstandard.ZstdCompressor(
+            level=CONTEXT_COMPRESSION_LEVEL, dict_data=_write_dictionary
+        )
+        _local.compressor = compressor
+    return compressor
+
+
+def _decompressor(dict_id: int) -> zstandard.ZstdDecompressor:
+    decompressors = getattr(_local, "decompressors", None)
+    if decompressors is None:
+        decompressors = _local.decompressors = {}
+    decompressor = decompressors.get(dict_id)
+    if decompressor is None:
+        if dict_id and dict_id not in _dictionaries:
+            raise ValueError(f"zstd dictionary {dict_id} is not configured")
+        decompressor = zstandard.ZstdDecompressor(dict_data=_dictionaries.get(dict_id))
+        decompressors[dict_id] = decompressor
+    return decompressor
+
+
+# ============================================================================
+# COMPRESSION HELPERS
+# ============================================================================
+
+
+def compress_text(text: str) -> Union[str, bytes]:
+    """Compress text above the threshold; return shorter values unchanged"""
+    encoded = text.encode("utf-8")
+    if len(encoded) < CONTEXT_COMPRESSION_THRESHOLD:
+        return text
+    return _compressor().compress(encoded)
+
+
+def decompress_text(value: Union[str, bytes]) -> str:
+    """Inverse of compress_text(); plain strings are returned unchanged"""
+    if isinstance(value, str):
+        return value
+    dict_id = zstandard.get_frame_parameters(value).dict_id
+    return _decompressor(dict_id).decompress(value).decode("utf-8")
+
+
+def train_dictionary(samples: Iterable[str], dict_size: int = 16384) -> bytes:
+    """
+    Train a zstd dictionary from sample texts
+
+    Args:
+        samples: Representative goals/notes texts (a few hundred or more)
+        dict_size: Target dictionary size in bytes
+
+    Returns:
+        Raw dictionary bytes, suitable for CONTEXT_ZSTD_DICTIONARY
+    """
+    encoded = [sample.encode("utf-8") for sample in samples if sample]
+    return zstandard.train_dictionary(dict_size, encoded).as_bytes()
+
+
+# ============================================================================
+# COLUMN TYPE
+# ============================================================================
+
+
+class CompressedText(TypeDecorator):
+    """Text column that is transparently zstd-compressed above a threshold"""
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return compress_text(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return decompress_text(value)
@@ -4,19 +4,41 @@ Database configuration and initialization for SQLite with SQLAlchemy ORM
 
 import logging
 import os
-from datetime import datetime, timezone
-from typing import Generator, Optional
+import threading
+from datetime import date, datetime, timezone
+from typing import Generator, List, Optional
 
+from cachetools import TTLCache
+from fastapi import Request
 from sqlalchemy import (
     Boolean,
+    Column,
+    Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
+    Table,
     Text,
+    UniqueConstraint,
     create_engine,
+    event,
+    inspect,
+    text,
 )
-from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column, sessionmaker
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    Session,
+    mapped_column,
+    relationship,
+    sessionmaker,
+)
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from src.metrics import instrument_engine
+from src.repository.compression import CompressedText, train_dictionary
 
 logger = logging.getLogger(__name__)
 
@@ -26,13 +48,111 @@ DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./db/productivity_tracker.db
 # Ensure db directory exists
 os.makedirs(os.path.dirname(DATABASE_URL.replace("sqlite:///", "")), exist_ok=True)
 
+# Joins tag names stored in one column, as in archived tasks and recurrence
+# rules (never valid inside a tag name)
+TAG_NAMES_SEPARATOR = "\x1f"
+
+# Read-only pool for GET requests; defaults to the same database file
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL", DATABASE_URL)
+DATABASE_READ_POOL_SIZE = int(os.getenv("DATABASE_READ_POOL_SIZE", "20"))
+
+# Reads by a user who wrote this recently go to the primary (read-your-writes
+# when DATABASE_READ_URL is a replica that may lag)
+DATABASE_READ_PIN_SECONDS = float(os.getenv("DATABASE_READ_PIN_SECONDS", "2"))
+
 # Create SQLAlchemy engine
 engine = create_engine(
     DATABASE_URL, connect_args={"check_same_thread": False}  # For SQLite compatibility
 )
 
-# Session factory
+
+def _is_file_sqlite(url) -> bool:
+    if url.get_backend_name() != "sqlite":
+        return False
+    return url.database not in (None, "", ":memory:")
+
+
+if _is_file_sqlite(engine.url):
+
+    @event.listens_for(engine, "connect")
+    def _enable_wal(dbapi_connection, connection_record):
+        # Readers and the writer no longer block each other (persistent)
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.close()
+
+
+def _create_read_engine():
+    """Engine for read-only work, or the main engine if it cannot be separate"""
+    read_engine = create_engine(
+        DATABASE_READ_URL,
+        connect_args={"check_same_thread": False},
+        pool_size=DATABASE_READ_POOL_SIZE,
+        max_overflow=DATABASE_READ_POOL_SIZE,
+    )
+    if read_engine.url.get_backend_name() != "sqlite":
+        return read_engine
+    if not _is_file_sqlite(read_engine.url):
+        # Each in-memory connection is its own database
+        read_engine.dispose()
+        return engine
+
+    @event.listens_for(read_engine, "connect")
+    def _query_only(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA query_only = ON")
+        cursor.close()
+
+    return read_engine
+
+
+read_engine = _create_read_engine()
+
+instrument_engine(engine, "primary")
+if read_engine is not engine:
+    instrument_engine(read_engine, "read")
+
+# Users with a recent commit, pinned to the primary for reads
+_recent_writers: TTLCache = TTLCache(
+    maxsize=100_000, ttl=max(DATABASE_READ_PIN_SECONDS, 0.001)
+)
+_recent_writers_lock = threading.Lock()
+
+
+def wrote_recently(user_id: Optional[int]) -> bool:
+    if user_id is None or DATABASE_READ_PIN_SECONDS <= 0:
+        return False
+    with _recent_writers_lock:
+        return user_id in _recent_writers
+
+
+class ReadSession(Session):
+    """
+    Session for read-only work: statements go to read_engine
+
+    If info["user_id"] is set and that user committed a write in the last
+    DATABASE_READ_PIN_SECONDS, statements go to the primary engine instead.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if wrote_recently(self.info.get("user_id")):
+            return engine
+        return read_engine
+
+
+# Session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(
+    class_=ReadSession, autocommit=False, autoflush=False, bind=read_engine
+)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _remember_writer(db: Session):
+    user_id = db.info.get("user_id")
+    if user_id is not None and DATABASE_READ_PIN_SECONDS > 0:
+        with _recent_writers_lock:
+            _recent_writers[user_id] = True
 
 
 # Base class for models
@@ -53,8 +173,43 @@ class User(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     email: Mapped[str] = mapped_column(String, unique=True, index=True, nullable=False)
     hashed_password: Mapped[str] = mapped_column(String, nullable=False)
-    goals: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # Large profile text is deferred so auth and task paths only load the
+    # small columns; both fields are fetched together on first access and
+    # stored zstd-compressed above CONTEXT_COMPRESSION_THRESHOLD
+    goals: Mapped[Optional[str]] = mapped_column(
+        CompressedText, nullable=True, deferred=True, deferred_group="context"
+    )
+    notes: Mapped[Optional[str]] = mapped_column(
+        CompressedText, nullable=True, deferred=True, deferred_group="context"
+    )
+    context_version: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    # Bumped by every task write; versions the task list and stats (ETags)
+    task_list_version: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    # Highest task_list_version among pruned tombstones; older sync cursors
+    # may have missed deletions and get a full resync
+    sync_floor_version: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    # Completed tasks moved to archived_tasks, so stats need not count them
+    archived_task_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    # IANA timezone that completion days and streaks are counted in
+    timezone: Mapped[str] = mapped_column(
+        String, default="UTC", server_default="UTC", nullable=False
+    )
+    # Streak state, maintained incrementally from task completions
+    current_streak: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    longest_streak: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    last_active_day: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=lambda: datetime.now(timezone.utc), nullable=False
     )
@@ -77,39 +232,457 @@ class Task(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=lambda: datetime.now(timezone.utc), nullable=False
     )
+    # Bumped on every change; drives delta sync (backfilled from created_at)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        nullable=True,
+        info={"backfill": "created_at"},
+    )
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    # Local day the completion was counted on in daily_completions, so undoing
+    # it decrements the same day after a timezone change (NULL before this
+    # column existed: the current timezone is used)
+    completed_day: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    # Set on occurrences of a recurring task
+    due_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    recurrence_id: Mapped[Optional[int]] = mapped_column(
+        Integer, ForeignKey("recurrence_rules.id", ondelete="SET NULL"), nullable=True
+    )
+    # Optimistic concurrency: every ORM UPDATE is "... WHERE version = ?" and
+    # increments it, so a concurrent change makes the flush fail (StaleDataError)
+    version: Mapped[int] = mapped_column(
+        Integer, default=1, server_default="1", nullable=False
+    )
+    # Owner's task_list_version as of the last write to this row; the delta
+    # sync cursor. NULL only until the writing transaction stamps it.
+    list_version: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        nullable=True,
+        info={
+            "backfill": "(SELECT task_list_version FROM users "
+            "WHERE users.id = tasks.user_id)"
+        },
+    )
+    tags: Mapped[List["Tag"]] = relationship(
+        secondary=lambda: task_tags, lazy="selectin", order_by="Tag.name"
+    )
+
+    __table_args__ = (
+        Index("ix_tasks_user_updated", "user_id", "updated_at"),
+        Index("ix_tasks_user_list_version", "user_id", "list_version"),
+        # Lets the archiver find old completed tasks without a table scan
+        Index("ix_tasks_completed_at", "completed_at"),
+        # Never reuse the id of a deleted or archived task (plain rowids are
+        # max(id) + 1); existing tables are rebuilt by _rebuild_tasks_table()
+        {"sqlite_autoincrement": True},
+    )
+    __mapper_args__ = {"version_id_col": version}
 
     def __repr__(self):
         return f"<Task(id={self.id}, user_id={self.user_id}, title={self.title})>"
 
 
+# Many-to-many link between tasks and tags. The primary key serves lookups
+# by task; the (tag_id, task_id) index serves tag-filtered listing.
+task_tags = Table(
+    "task_tags",
+    Base.metadata,
+    Column(
+        "task_id",
+        Integer,
+        ForeignKey("tasks.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "tag_id",
+        Integer,
+        ForeignKey("tags.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Index("ix_task_tags_tag_task", "tag_id", "task_id"),
+)
+
+
+class Tag(Base):
+    """User-defined task category with materialized task counts"""
+
+    __tablename__ = "tags"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    name: Mapped[str] = mapped_column(String, nullable=False)
+    # Maintained by TaskRepository in the same transaction as task writes
+    task_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    completed_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    __table_args__ = (UniqueConstraint("user_id", "name", name="uq_tags_user_name"),)
+
+    def __repr__(self):
+        return f"<Tag(id={self.id}, user_id={self.user_id}, name={self.name})>"
+
+
+class ArchivedTask(Base):
+    """
+    Completed task moved out of the live tasks table by the archiver
+
+    Keeps the task's id and fields; tags are stored as names joined by
+    TAG_NAMES_SEPARATOR since tag links only exist for live tasks.
+    """
+
+    __tablename__ = "archived_tasks"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    title: Mapped[str] = mapped_column(String, nullable=False)
+    is_completed: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    due_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    recurrence_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    version: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
+    tag_names: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime, default=lambda: datetime.now(timezone.utc), nullable=False
+    )
+
+    __table_args__ = (Index("ix_archived_tasks_user_created", "user_id", "created_at"),)
+
+    def __repr__(self):
+        return f"<ArchivedTask(id={self.id}, user_id={self.user_id})>"
+
+
+class RecurrenceRule(Base):
+    """
+    Recurring task: an RRULE plus the task fields its occurrences get
+
+    Occurrences are created one at a time: when next_due_at arrives, or
+    early when the latest occurrence is completed. next_due_at is NULL once
+    the rule has ended.
+    """
+
+    __tablename__ = "recurrence_rules"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    title: Mapped[str] = mapped_column(String, nullable=False)
+    rule: Mapped[str] = mapped_column(String, nullable=False)
+    tag_names: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    # First occurrence (UTC); its local time of day is kept for all of them
+    starts_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    # Due time of the next occurrence that has not been created yet
+    next_due_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    occurrence_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Latest occurrence; completing it creates the next one
+    current_task_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=lambda: datetime.now(timezone.utc), nullable=False
+    )
+
+    __table_args__ = (
+        Index("ix_recurrence_rules_next_due", "next_due_at"),
+        Index("ix_recurrence_rules_user", "user_id"),
+    )
+
+    @property
+    def tags(self) -> List[str]:
+        return self.tag_names.split(TAG_NAMES_SEPARATOR) if self.tag_names else []
+
+    def __repr__(self):
+        return (
+            f"<RecurrenceRule(id={self.id}, user_id={self.user_id}, rule={self.rule})>"
+        )
+
+
+class TaskTombstone(Base):
+    """Record of a deleted task so offline clients can sync the deletion"""
+
+    __tablename__ = "task_tombstones"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    task_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime, default=lambda: datetime.now(timezone.utc), nullable=False
+    )
+    # Owner's task_list_version of the deleting write (see Task.list_version)
+    list_version: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        nullable=True,
+        info={
+            "backfill": "(SELECT task_list_version FROM users "
+            "WHERE users.id = task_tombstones.user_id)"
+        },
+    )
+
+    __table_args__ = (
+        Index("ix_task_tombstones_user_deleted", "user_id", "deleted_at"),
+        Index("ix_task_tombstones_user_list_version", "user_id", "list_version"),
+    )
+
+    def __repr__(self):
+        return f"<TaskTombstone(task_id={self.task_id}, user_id={self.user_id})>"
+
+
+class DailyCompletion(Base):
+    """Per-user count of tasks completed on each day (analytics rollup)"""
+
+    __tablename__ = "daily_completions"
+
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    completed_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<DailyCompletion(user_id={self.user_id}, day={self.day})>"
+
+
+# ============================================================================
+# FULL-TEXT SEARCH (SQLite FTS5)
+# ============================================================================
+
+# Task titles are indexed through an external-content FTS5 table kept in
+# sync by triggers. user_id is indexed too so a search is restricted to one
+# user inside the index instead of filtering all matches afterwards.
+TASK_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE tasks_fts USING fts5(
+        title, user_id,
+        content='tasks', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts(rowid, title, user_id)
+        VALUES (new.id, new.title, new.user_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, user_id)
+        VALUES ('delete', old.id, old.title, old.user_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_update
+    AFTER UPDATE OF title, user_id ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, user_id)
+        VALUES ('delete', old.id, old.title, old.user_id);
+        INSERT INTO tasks_fts(rowid, title, user_id)
+        VALUES (new.id, new.title, new.user_id);
+    END
+    """,
+]
+
+# Goals/notes are stored compressed, so their index is contentless (rowid is
+# the user id) and maintained by UserRepository.update_user_context.
+CONTEXT_SEARCH_DDL = """
+    CREATE VIRTUAL TABLE context_fts USING fts5(
+        goals, notes, content='',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+"""
+
+SEARCH_TABLES = ["tasks_fts", "context_fts"]
+
+
+def _create_search_index():
+    """Create FTS5 tables and triggers, backfilling them on first creation"""
+    if engine.dialect.name != "sqlite":
+        return
+
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        if not inspector.has_table("tasks_fts"):
+            conn.exec_driver_sql(TASK_SEARCH_DDL[0])
+            conn.exec_driver_sql("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+            logger.info("Created task search index")
+        for ddl in TASK_SEARCH_DDL[1:]:
+            conn.exec_driver_sql(ddl)
+
+    if not inspector.has_table("context_fts"):
+        db = SessionLocal()
+        try:
+            db.execute(text(CONTEXT_SEARCH_DDL))
+            for user_id, goals, notes in db.query(User.id, User.goals, User.notes):
+                if goals or notes:
+                    db.execute(
+                        text(
+                            "INSERT INTO context_fts(rowid, goals, notes) "
+                            "VALUES (:id, :goals, :notes)"
+                        ),
+                        {"id": user_id, "goals": goals or "", "notes": notes or ""},
+                    )
+            db.commit()
+            logger.info("Created context search index")
+        finally:
+            db.close()
+
+
 # ============================================================================
 # DATABASE UTILITIES
 # ============================================================================
 
 
+def _add_missing_columns():
+    """
+    Add columns and indexes introduced after a table was first created
+
+    create_all() only creates missing tables, so existing SQLite files are
+    upgraded in place with ALTER TABLE ... ADD COLUMN.
+    """
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+
+                ddl = (
+                    f"ALTER TABLE {table.name} ADD COLUMN {column.name} "
+                    f"{column.type.compile(dialect=engine.dialect)}"
+                )
+                if column.server_default is not None:
+                    default = column.server_default.arg
+                    default = getattr(default, "text", None) or f"'{default}'"
+                    ddl += f" DEFAULT {default}"
+
+                conn.exec_driver_sql(ddl)
+                if "backfill" in column.info:
+                    conn.exec_driver_sql(
+                        f"UPDATE {table.name} SET {column.name} = "
+                        f"{column.info['backfill']}"
+                    )
+                logger.info(f"Added column {table.name}.{column.name}")
+
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+
+
+def _rebuild_tasks_table():
+    """
+    Recreate a tasks table created without AUTOINCREMENT
+
+    SQLite cannot add it in place, so rows are copied into a new table with
+    the same ids, and sqlite_sequence starts after every id handed out so
+    far, archived and deleted tasks included. The whole rebuild is one
+    transaction; the search triggers are recreated by _create_search_index().
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    with engine.connect() as conn:
+        ddl = conn.exec_driver_sql(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'tasks'"
+        ).scalar()
+    if ddl is None or "AUTOINCREMENT" in ddl.upper():
+        return
+
+    tasks = Task.__table__
+    create = str(CreateTable(tasks).compile(dialect=engine.dialect)).replace(
+        "CREATE TABLE tasks ", "CREATE TABLE tasks_rebuild ", 1
+    )
+    indexes = ";".join(
+        str(CreateIndex(index).compile(dialect=engine.dialect))
+        for index in tasks.indexes
+    )
+    columns = ", ".join(column.name for column in tasks.columns)
+    connection = engine.raw_connection()
+    try:
+        connection.driver_connection.executescript(f"""
+            BEGIN;
+            {create};
+            INSERT INTO tasks_rebuild ({columns}) SELECT {columns} FROM tasks;
+            DROP TABLE tasks;
+            ALTER TABLE tasks_rebuild RENAME TO tasks;
+            {indexes};
+            DELETE FROM sqlite_sequence WHERE name = 'tasks';
+            INSERT INTO sqlite_sequence (name, seq) VALUES ('tasks', max(
+                (SELECT coalesce(max(id), 0) FROM tasks),
+                (SELECT coalesce(max(id), 0) FROM archived_tasks),
+                (SELECT coalesce(max(task_id), 0) FROM task_tombstones)
+            ));
+            COMMIT;
+            """)
+    finally:
+        connection.close()
+    logger.info("Rebuilt tasks table with AUTOINCREMENT ids")
+
+
 def init_db():
     """Initialize database by creating all tables"""
     try:
         Base.metadata.create_all(bind=engine)
+        _add_missing_columns()
+        _rebuild_tasks_table()
+        _create_search_index()
         logger.info("Database tables created successfully")
     except Exception as e:
         logger.error(f"Error initializing database: {str(e)}")
         raise
 
 
-def get_db() -> Generator[Session, None, None]:
-    """Dependency for getting database session in FastAPI routes"""
-    db = SessionLocal()
+def get_db(request: Request) -> Generator[Session, None, None]:
+    """
+    Dependency for getting database session in FastAPI routes
+
+    GET and HEAD requests get a read-only session on the read pool; other
+    methods get a read-write session.
+    """
+    factory = ReadSessionLocal if request.method in ("GET", "HEAD") else SessionLocal
+    db = factory()
     try:
         yield db
     finally:
         db.close()
 
 
+def train_context_dictionary(path: str, dict_size: int = 16384):
+    """
+    Train a zstd dictionary from existing goals/notes and write it to path
+
+    Point CONTEXT_ZSTD_DICTIONARY at the file to use it for new writes.
+    """
+    db = SessionLocal()
+    try:
+        samples = [
+            text
+            for goals, notes in db.query(User.goals, User.notes)
+            for text in (goals, notes)
+            if text
+        ]
+    finally:
+        db.close()
+
+    with open(path, "wb") as f:
+        f.write(train_dictionary(samples, dict_size))
+    logger.info(f"Trained zstd dictionary from {len(samples)} samples: {path}")
+
+
 def reset_db():
     """Reset database - drops all tables and recreates them"""
     try:
         Base.metadata.drop_all(bind=engine)
+        with engine.begin() as conn:
+            for table in SEARCH_TABLES:
+                conn.exec_driver_sql(f"DROP TABLE IF EXISTS {table}")
         logger.info("Database tables dropped")
         init_db()
         logger.info("Database reset successfully")
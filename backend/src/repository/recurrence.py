@@ -0,0 +1,231 @@
+"""
+RRULE-style recurrence evaluation for recurring tasks
+
+Supports the RFC 5545 subset the app exposes: FREQ=DAILY, WEEKLY or MONTHLY
+with INTERVAL, BYDAY (weekly), BYMONTHDAY (monthly), COUNT and UNTIL, e.g.
+"FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,TH". Occurrences keep the local time of day
+of the first one in the user's timezone. The next occurrence is computed
+arithmetically from the period the search starts in, so the cost does not
+grow with the age of a rule.
+"""
+
+import calendar
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from functools import lru_cache
+from typing import Iterator, Optional, Tuple
+
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY")
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+MAX_INTERVAL = 999
+
+# Periods searched before giving up on a rule that can never match again
+# (e.g. BYMONTHDAY=30 every 12 months starting in February)
+MAX_PERIODS = 1000
+
+
+class RRule:
+    """Parsed recurrence rule"""
+
+    __slots__ = ("freq", "interval", "by_day", "by_month_day", "count", "until")
+
+    def __init__(
+        self,
+        freq: str,
+        interval: int = 1,
+        by_day: Tuple[int, ...] = (),
+        by_month_day: Tuple[int, ...] = (),
+        count: Optional[int] = None,
+        until: Optional[datetime] = None,
+    ):
+        self.freq = freq
+        self.interval = interval
+        self.by_day = by_day
+        self.by_month_day = by_month_day
+        self.count = count
+        self.until = until
+
+    def __str__(self) -> str:
+        parts = [f"FREQ={self.freq}"]
+        if self.interval != 1:
+            parts.append(f"INTERVAL={self.interval}")
+        if self.by_day:
+            parts.append("BYDAY=" + ",".join(WEEKDAYS[day] for day in self.by_day))
+        if self.by_month_day:
+            parts.append("BYMONTHDAY=" + ",".join(map(str, self.by_month_day)))
+        if self.count is not None:
+            parts.append(f"COUNT={self.count}")
+        if self.until is not None:
+            parts.append(f"UNTIL={self.until:%Y%m%dT%H%M%SZ}")
+        return ";".join(parts)
+
+
+def _int(value: str, name: str, low: int, high: int) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer")
+    if not low <= abs(number) <= high or (number < 0 and name != "BYMONTHDAY"):
+        raise ValueError(f"{name} out of range")
+    return number
+
+
+def _until(value: str) -> datetime:
+    for fmt in ("%Y%m%dT%H%M%SZ", "%Y%m%dT%H%M%S", "%Y%m%d"):
+        try:
+            parsed = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        # A date-only UNTIL includes that whole day
+        return (
+            parsed + timedelta(days=1, microseconds=-1) if fmt == "%Y%m%d" else parsed
+        )
+    raise ValueError("UNTIL must look like 20251231 or 20251231T090000Z")
+
+
+@lru_cache(maxsize=4096)
+def parse_rrule(text: str) -> RRule:
+    """
+    Parse an RRULE string (an optional "RRULE:" prefix is allowed)
+
+    Raises:
+        ValueError: If the rule is malformed or uses unsupported parts
+    """
+    text = text.strip()
+    if text.upper().startswith("RRULE:"):
+        text = text[6:]
+    parts = {}
+    for part in filter(None, text.split(";")):
+        key, sep, value = part.partition("=")
+        key = key.strip().upper()
+        if not sep or not value.strip():
+            raise ValueError(f"Malformed rule part: {part!r}")
+        if key in parts:
+            raise ValueError(f"{key} given more than once")
+        parts[key] = value.strip().upper()
+
+    freq = parts.pop("FREQ", None)
+    if freq not in FREQUENCIES:
+        raise ValueError(f"FREQ must be one of {', '.join(FREQUENCIES)}")
+    rule = RRule(freq)
+    if "INTERVAL" in parts:
+        rule.interval = _int(parts.pop("INTERVAL"), "INTERVAL", 1, MAX_INTERVAL)
+    if "BYDAY" in parts:
+        if freq != "WEEKLY":
+            raise ValueError("BYDAY is only supported with FREQ=WEEKLY")
+        days = parts.pop("BYDAY").split(",")
+        if any(day not in WEEKDAYS for day in days):
+            raise ValueError("BYDAY takes weekdays like MO,WE,FR")
+        rule.by_day = tuple(sorted({WEEKDAYS.index(day) for day in days}))
+    if "BYMONTHDAY" in parts:
+        if freq != "MONTHLY":
+            raise ValueError("BYMONTHDAY is only supported with FREQ=MONTHLY")
+        rule.by_month_day = tuple(
+            sorted(
+                {
+                    _int(day, "BYMONTHDAY", 1, 31)
+                    for day in parts.pop("BYMONTHDAY").split(",")
+                }
+            )
+        )
+    if "COUNT" in parts and "UNTIL" in parts:
+        raise ValueError("COUNT and UNTIL cannot be combined")
+    if "COUNT" in parts:
+        rule.count = _int(parts.pop("COUNT"), "COUNT", 1, 100_000)
+    if "UNTIL" in parts:
+        rule.until = _until(parts.pop("UNTIL"))
+    if parts:
+        raise ValueError(f"Unsupported rule parts: {', '.join(sorted(parts))}")
+    return rule
+
+
+# ============================================================================
+# EVALUATION
+# ============================================================================
+
+
+def _ceil_to(value: int, step: int) -> int:
+    """Smallest multiple of step that is >= value (value >= 0)"""
+    return -(-value // step) * step
+
+
+def _candidate_days(rule: RRule, first: date, from_day: date) -> Iterator[date]:
+    """Days matching the rule on or after from_day, ascending"""
+    n = rule.interval
+    if rule.freq == "DAILY":
+        day = first + timedelta(days=_ceil_to((from_day - first).days, n))
+        for _ in range(MAX_PERIODS):
+            yield day
+            day += timedelta(days=n)
+
+    elif rule.freq == "WEEKLY":
+        week0 = first - timedelta(days=first.weekday())
+        weekdays = rule.by_day or (first.weekday(),)
+        week = _ceil_to((from_day - week0).days // 7, n)
+        for _ in range(MAX_PERIODS):
+            monday = week0 + timedelta(weeks=week)
+            for weekday in weekdays:
+                day = monday + timedelta(days=weekday)
+                if day >= from_day:
+                    yield day
+            week += n
+
+    else:
+        month0 = first.year * 12 + first.month - 1
+        month_days = rule.by_month_day or (first.day,)
+        month = month0 + _ceil_to(from_day.year * 12 + from_day.month - 1 - month0, n)
+        for _ in range(MAX_PERIODS):
+            year, index = divmod(month, 12)
+            length = calendar.monthrange(year, index + 1)[1]
+            # Negative days count from the month's end; missing days are skipped
+            days = sorted(
+                {d if d > 0 else length + d + 1 for d in month_days if abs(d) <= length}
+            )
+            for number in days:
+                day = date(year, index + 1, number)
+                if day >= from_day:
+                    yield day
+            month += n
+
+
+def _to_utc(day: date, wall: time, tz: tzinfo) -> datetime:
+    return (
+        datetime.combine(day, wall, tzinfo=tz)
+        .astimezone(timezone.utc)
+        .replace(tzinfo=None)
+    )
+
+
+def next_occurrence(
+    rule: RRule, start: datetime, after: datetime, tz: tzinfo
+) -> Optional[datetime]:
+    """
+    First occurrence strictly after a point in time
+
+    Args:
+        start: First occurrence (naive UTC); sets the local time of day
+        after: Naive UTC time to search from
+        tz: Timezone the rule's days and time of day are in
+
+    Returns:
+        Naive UTC datetime, or None if the rule has ended (UNTIL). COUNT is
+        left to the caller, which knows how many occurrences were created.
+    """
+    local_start = start.replace(tzinfo=timezone.utc).astimezone(tz)
+    first, wall = local_start.date(), local_start.time().replace(tzinfo=None)
+    local_after = after.replace(tzinfo=timezone.utc).astimezone(tz).date()
+    # A DST shift can move the occurrence on the previous local day past `after`
+    from_day = max(first, local_after - timedelta(days=1))
+
+    for day in _candidate_days(rule, first, from_day):
+        occurrence = _to_utc(day, wall, tz)
+        if occurrence <= after or occurrence < start:
+            continue
+        if rule.until is not None and occurrence > rule.until:
+            return None
+        return occurrence
+    return None
+
+
+def first_occurrence(rule: RRule, start: datetime, tz: tzinfo) -> Optional[datetime]:
+    """First occurrence at or after start (naive UTC)"""
+    return next_occurrence(rule, start, start - timedelta(microseconds=1), tz)
@@ -3,15 +3,108 @@ Repository layer for data access - separates business logic from database querie
 """
 
 import logging
-from typing import List, Optional
+import re
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
+import jsonpatch
+import jsonpointer
+from sqlalchemy import bindparam, delete, func, insert, select, text, union_all, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 
-from src.repository.database import Task, User
-from src.schemas import ContextUpdate, TaskCreate, TaskUpdate
+from src.repository.database import (
+    TAG_NAMES_SEPARATOR,
+    ArchivedTask,
+    DailyCompletion,
+    RecurrenceRule,
+    Tag,
+    Task,
+    TaskTombstone,
+    User,
+    task_tags,
+)
+from src.metrics import registry
+from src.repository.change_feed import change_feed
+from src.repository.recurrence import first_occurrence, next_occurrence, parse_rrule
+from src.repository.task_cache import CachedTask, task_cache
+from src.repository.title_index import title_index
+from src.schemas import (
+    ContextUpdate,
+    RecurrenceCreate,
+    SyncMutation,
+    TaskBatchUpdateItem,
+    TaskCreate,
+    TaskImportRow,
+    TaskUpdate,
+)
 
 logger = logging.getLogger(__name__)
 
+# Attempts at the internal compare-and-swap before giving up on a context write
+CONTEXT_UPDATE_RETRIES = 3
+
+
+_TAG_WHITESPACE = re.compile(r"\s+")
+
+_SEARCH_TOKEN = re.compile(r"\w+\*?", re.UNICODE)
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """
+    Turn free text into a safe FTS5 MATCH expression
+
+    Every word must match; words ending in * and the last word (still being
+    typed) are prefix matches. Returns None if the text has no words.
+    """
+    tokens = _SEARCH_TOKEN.findall(query)
+    if not tokens:
+        return None
+    terms = []
+    for i, token in enumerate(tokens):
+        word = token.rstrip("*")
+        prefix = token.endswith("*") or i == len(tokens) - 1
+        terms.append(f'"{word}"' + ("*" if prefix else ""))
+    return " AND ".join(terms)
+
+
+def normalize_tag(name: str) -> str:
+    """Canonical form of a tag name (trimmed, lowercase, single spaces)"""
+    return _TAG_WHITESPACE.sub(" ", name).strip().lower()
+
+
+def as_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Convert an aware datetime to the naive UTC form stored in the database"""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class VersionConflictError(Exception):
+    """Raised when a conditional write finds a newer version than expected"""
+
+    def __init__(self, message: str, current_version: Optional[int] = None):
+        super().__init__(message)
+        self.current_version = current_version
+
+
+class TaskConflictError(VersionConflictError):
+    """Raised when task updates lose their compare-and-swap"""
+
+    def __init__(
+        self,
+        message: str,
+        task_ids: List[int],
+        current_version: Optional[int] = None,
+    ):
+        super().__init__(message, current_version)
+        self.task_ids = task_ids
+
 
 # ============================================================================
 # USER REPOSITORY
@@ -36,32 +129,224 @@ class UserRepository:
         """Get all users (admin only - for development)"""
         return db.query(User).all()
 
+    @staticmethod
+    def get_context_version(db: Session, user_id: int) -> Optional[int]:
+        """Get the user's context version without loading goals or notes"""
+        return db.query(User.context_version).filter(User.id == user_id).scalar()
+
+    @staticmethod
+    def _reindex_context(
+        db: Session,
+        user_id: int,
+        old: tuple[Optional[str], Optional[str]],
+        new: tuple[Optional[str], Optional[str]],
+    ):
+        """Replace the user's row in the contentless context search index"""
+        if db.get_bind().dialect.name != "sqlite":
+            return
+        if any(old):
+            db.execute(
+                text(
+                    "INSERT INTO context_fts(context_fts, rowid, goals, notes) "
+                    "VALUES ('delete', :id, :goals, :notes)"
+                ),
+                {"id": user_id, "goals": old[0] or "", "notes": old[1] or ""},
+            )
+        if any(new):
+            db.execute(
+                text(
+                    "INSERT INTO context_fts(rowid, goals, notes) "
+                    "VALUES (:id, :goals, :notes)"
+                ),
+                {"id": user_id, "goals": new[0] or "", "notes": new[1] or ""},
+            )
+
     @staticmethod
     def update_user_context(
-        db: Session, user_id: int, context_data: ContextUpdate
+        db: Session,
+        user_id: int,
+        context_data: ContextUpdate,
+        expected_version: Optional[int] = None,
     ) -> Optional[User]:
-        """Update user's goals and notes"""
+        """
+        Update user's goals and notes and bump the context version
+
+        Args:
+            db: Database session
+            user_id: ID of the user
+            context_data: New goals and/or notes
+            expected_version: If given, only update while the stored context
+                version still equals it (compare-and-swap)
+
+        Returns:
+            Updated user or None if not found / on error
+
+        Raises:
+            VersionConflictError: If expected_version is stale
+        """
         try:
-            user = UserRepository.get_user_by_id(db, user_id)
-            if not user:
-                logger.warning(f"User {user_id} not found for context update")
-                return None
+            for _ in range(CONTEXT_UPDATE_RETRIES):
+                current = (
+                    db.query(User.context_version, User.goals, User.notes)
+                    .filter(User.id == user_id)
+                    .first()
+                )
+                if current is None:
+                    logger.warning(f"User {user_id} not found for context update")
+                    return None
+                if (
+                    expected_version is not None
+                    and current.context_version != expected_version
+                ):
+                    raise VersionConflictError(
+                        f"Context for user {user_id} has changed",
+                        current.context_version,
+                    )
 
-            if context_data.goals is not None:
-                user.goals = context_data.goals
-            if context_data.notes is not None:
-                user.notes = context_data.notes
+                goals = (
+                    current.goals if context_data.goals is None else context_data.goals
+                )
+                notes = (
+                    current.notes if context_data.notes is None else context_data.notes
+                )
+                values = {User.context_version: User.context_version + 1}
+                if context_data.goals is not None:
+                    values[User.goals] = goals
+                if context_data.notes is not None:
+                    values[User.notes] = notes
 
-            db.commit()
-            db.refresh(user)
-            logger.info(f"User {user_id} context updated successfully")
-            return user
+                # Compare-and-swap on the version just read, so the old text
+                # removed from the search index is exactly what was stored
+                updated = (
+                    db.query(User)
+                    .filter(
+                        User.id == user_id,
+                        User.context_version == current.context_version,
+                    )
+                    .update(values, synchronize_session=False)
+                )
+                if not updated:
+                    db.rollback()
+                    continue
+
+                UserRepository._reindex_context(
+                    db, user_id, (current.goals, current.notes), (goals, notes)
+                )
+                change_feed.stage_context(db, user_id, current.context_version + 1)
+                db.commit()
+                user = UserRepository.get_user_by_id(db, user_id)
+                logger.info(f"User {user_id} context updated successfully")
+                return user
 
+            raise VersionConflictError(
+                f"Context for user {user_id} is being modified concurrently"
+            )
+
+        except VersionConflictError:
+            raise
         except Exception as e:
             db.rollback()
             logger.error(f"Error updating user context: {str(e)}")
             return None
 
+    @staticmethod
+    def patch_user_context(
+        db: Session, user_id: int, operations: List[dict], expected_version: int
+    ) -> Optional[User]:
+        """
+        Apply a JSON Patch to the user's goals and notes
+
+        The patch targets {"goals": [lines], "notes": [lines]} so clients can
+        send single-line edits instead of the whole text. Only fields that
+        actually change are written, with the same compare-and-swap on the
+        context version as update_user_context.
+
+        Returns:
+            Updated user or None if not found / on error
+
+        Raises:
+            ValueError: If the patch is malformed or cannot be applied
+            VersionConflictError: If expected_version is stale
+        """
+        user = UserRepository.get_user_by_id(db, user_id)
+        if not user:
+            return None
+        if user.context_version != expected_version:
+            raise VersionConflictError(
+                f"Context for user {user_id} has changed", user.context_version
+            )
+
+        original = {"goals": user.goals or "", "notes": user.notes or ""}
+        document = {field: value.split("\n") for field, value in original.items()}
+        try:
+            patched = jsonpatch.apply_patch(document, operations)
+        except (
+            jsonpatch.JsonPatchException,
+            jsonpointer.JsonPointerException,
+            TypeError,
+        ) as e:
+            raise ValueError(f"Invalid patch: {str(e)}")
+
+        if not isinstance(patched, dict) or set(patched) - set(original):
+            raise ValueError("Patch may only modify /goals and /notes")
+
+        changes = {}
+        for field, value in patched.items():
+            if isinstance(value, list) and all(isinstance(v, str) for v in value):
+                value = "\n".join(value)
+            if value is not None and not isinstance(value, str):
+                raise ValueError(f"/{field} must be a string or a list of lines")
+            if (value or "") != original[field]:
+                changes[field] = value or ""
+        for field in set(original) - set(patched):
+            if original[field]:
+                changes[field] = ""
+
+        if not changes:
+            return user
+
+        return UserRepository.update_user_context(
+            db, user_id, ContextUpdate(**changes), expected_version
+        )
+
+    @staticmethod
+    def search_user_context(db: Session, user_id: int, query: str) -> List[dict]:
+        """
+        Search the user's goals and notes
+
+        Returns:
+            One dict per matching field with the matching lines, e.g.
+            [{"field": "notes", "lines": ["..."]}]
+        """
+        match = build_match_query(query)
+        if not match or db.get_bind().dialect.name != "sqlite":
+            return []
+
+        found = db.execute(
+            text(
+                "SELECT rowid FROM context_fts WHERE context_fts MATCH :match "
+                "AND rowid = :id"
+            ),
+            {"match": match, "id": user_id},
+        ).first()
+        if not found:
+            return []
+
+        # The index is contentless, so pick matching lines from the stored text
+        words = [word.rstrip("*").lower() for word in _SEARCH_TOKEN.findall(query)]
+        results = []
+        for field, value in zip(
+            ("goals", "notes"), UserRepository.get_user_context(db, user_id) or ()
+        ):
+            lines = [
+                line
+                for line in value.splitlines()
+                if any(word in line.lower() for word in words)
+            ]
+            if lines:
+                results.append({"field": field, "lines": lines[:5]})
+        return results
+
     @staticmethod
     def get_user_context(db: Session, user_id: int) -> Optional[tuple[str, str]]:
         """
@@ -70,10 +355,10 @@ class UserRepository:
         Returns:
             Tuple of (goals, notes) or None if user not found
         """
-        user = UserRepository.get_user_by_id(db, user_id)
-        if not user:
+        context = db.query(User.goals, User.notes).filter(User.id == user_id).first()
+        if not context:
             return None
-        return (user.goals or "", user.notes or "")
+        return (context.goals or "", context.notes or "")
 
 
 # ============================================================================
@@ -90,8 +375,16 @@ class TaskRepository:
         try:
             new_task = Task(user_id=user_id, title=task_data.title, is_completed=False)
             db.add(new_task)
+            if task_data.tags:
+                TaskRepository._set_tags(db, new_task, task_data.tags)
+            db.flush()
+            version = TaskRepository._bump_list_version(
+                db, user_id, changed=[new_task.id]
+            )
             db.commit()
             db.refresh(new_task)
+            title_index.add(user_id, new_task.id, new_task.title)
+            task_cache.apply(user_id, version, [CachedTask.from_task(new_task)])
             logger.info(f"Task created: {new_task.id} for user {user_id}")
             return new_task
 
@@ -100,50 +393,327 @@ class TaskRepository:
             logger.error(f"Error creating task: {str(e)}")
             return None
 
+    @staticmethod
+    def _bump_list_version(
+        db: Session,
+        user_id: int,
+        changed: Sequence[int] = (),
+        deleted: Sequence[int] = (),
+        resync: bool = False,
+    ):
+        """
+        Advance the user's task-list version and stage a change-feed event;
+        call in every task write with the ids it touches (or resync=True)
+
+        The changed tasks, and the user's new tasks and tombstones (whose
+        list_version is still NULL), are stamped with the new version, which
+        is the delta sync cursor.
+
+        Returns:
+            The new version, for writing through to the task list cache
+        """
+        db.flush()
+        version = db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(task_list_version=User.task_list_version + 1)
+            .returning(User.task_list_version)
+            .execution_options(synchronize_session=False)
+        ).scalar()
+        # Separate statements so each one can use an index
+        if changed:
+            db.execute(
+                update(Task)
+                .where(Task.id.in_(changed))
+                .values(list_version=version)
+                .execution_options(synchronize_session=False)
+            )
+        for model in (Task, TaskTombstone):
+            db.execute(
+                update(model)
+                .where(model.user_id == user_id, model.list_version.is_(None))
+                .values(list_version=version)
+                .execution_options(synchronize_session=False)
+            )
+        change_feed.stage_tasks(db, user_id, changed, deleted, resync)
+        return version
+
     @staticmethod
     def get_task_by_id(db: Session, task_id: int) -> Optional[Task]:
-        """Get task by ID"""
-        return db.query(Task).filter(Task.id == task_id).first()
+        """Get task by ID (no query if the session already has it loaded)"""
+        return db.get(Task, task_id)
 
     @staticmethod
-    def get_tasks_by_user(db: Session, user_id: int) -> List[Task]:
-        """Get all tasks for a user"""
-        return (
-            db.query(Task)
-            .filter(Task.user_id == user_id)
-            .order_by(Task.created_at.desc())
-            .all()
+    def find_duplicate_task(db: Session, user_id: int, title: str) -> Optional[Task]:
+        """
+        Find an existing task whose title is a near-duplicate of the given title
+
+        Uses the per-user fingerprint index, which is built from the user's
+        tasks on first use and maintained by the write methods below.
+        """
+
+        def load_titles():
+            return db.query(Task.id, Task.title).filter(Task.user_id == user_id).all()
+
+        task_id = title_index.find_duplicate(user_id, title, load_titles)
+        if task_id is None:
+            return None
+        return TaskRepository.get_task_by_id(db, task_id)
+
+    @staticmethod
+    def search_tasks(
+        db: Session,
+        user_id: int,
+        query: str,
+        limit: int = 20,
+        after: Optional[Tuple[float, int]] = None,
+    ) -> List[Tuple[Task, float, str]]:
+        """
+        Full-text search over the user's task titles, best matches first
+
+        Args:
+            db: Database session
+            user_id: Owner of the tasks
+            query: Free-text query (see build_match_query)
+            limit: Maximum number of results
+            after: (score, task_id) of the last result of the previous page
+
+        Returns:
+            List of (task, score, highlighted_title); lower scores rank higher
+        """
+        match = build_match_query(query)
+        if not match:
+            return []
+
+        sql = (
+            "SELECT rowid AS id, bm25(tasks_fts, 1.0, 0.0) AS score, "
+            "highlight(tasks_fts, 0, '[', ']') AS highlight "
+            "FROM tasks_fts WHERE tasks_fts MATCH :match"
         )
+        # Scope the words to the title so digits never match the user_id column
+        params = {
+            "match": f'user_id:"{int(user_id)}" AND title:({match})',
+            "limit": limit,
+        }
+        if after is not None:
+            sql += (
+                " AND (bm25(tasks_fts, 1.0, 0.0) > :score"
+                " OR (bm25(tasks_fts, 1.0, 0.0) = :score AND rowid > :id))"
+            )
+            params.update({"score": after[0], "id": after[1]})
+        sql += " ORDER BY score, rowid LIMIT :limit"
+
+        hits = db.execute(text(sql), params).all()
+        if not hits:
+            return []
+
+        tasks = {
+            task.id: task
+            for task in db.query(Task).filter(Task.id.in_([hit.id for hit in hits]))
+        }
+        return [
+            (tasks[hit.id], hit.score, hit.highlight) for hit in hits if hit.id in tasks
+        ]
 
     @staticmethod
-    def get_pending_tasks(db: Session, user_id: int) -> List[Task]:
-        """Get incomplete tasks for a user"""
-        return (
-            db.query(Task)
-            .filter(Task.user_id == user_id, Task.is_completed.is_(False))
-            .order_by(Task.created_at.desc())
-            .all()
+    def _user_tasks(db: Session, user_id: int, tag: Optional[str] = None):
+        """Query for a user's tasks, optionally restricted to one tag"""
+        query = db.query(Task).filter(Task.user_id == user_id)
+        if tag is not None:
+            query = (
+                query.join(task_tags, task_tags.c.task_id == Task.id)
+                .join(Tag, Tag.id == task_tags.c.tag_id)
+                .filter(Tag.user_id == user_id, Tag.name == normalize_tag(tag))
+            )
+        return query
+
+    @staticmethod
+    def _cached_tasks(db: Session, user_id: int) -> List[CachedTask]:
+        """
+        A user's tasks, newest first, from the task list cache
+
+        On a miss the list is loaded with one column query (tag names via
+        group_concat) and cached at the user's current task-list version.
+        """
+        user = db.get(User, user_id)
+        if user is None:
+            return []
+        version = user.task_list_version
+        tasks = task_cache.get(user_id, version)
+        if tasks is not None:
+            return tasks
+
+        rows = db.execute(
+            select(
+                Task.id,
+                Task.user_id,
+                Task.title,
+                Task.is_completed,
+                Task.created_at,
+                Task.updated_at,
+                Task.completed_at,
+                TaskRepository._tag_names_column(TAG_NAMES_SEPARATOR),
+                Task.due_at,
+                Task.recurrence_id,
+                Task.version,
+            )
+            .where(Task.user_id == user_id)
+            .order_by(Task.created_at.desc(), Task.id.desc())
+        ).all()
+        tasks = [
+            CachedTask._make(
+                (
+                    *row[:7],
+                    tuple(sorted(row[7].split(TAG_NAMES_SEPARATOR))) if row[7] else (),
+                    *row[8:],
+                )
+            )
+            for row in rows
+        ]
+        task_cache.put(user_id, version, tasks)
+        return tasks
+
+    @staticmethod
+    def _filter_cached(
+        tasks: List[CachedTask],
+        tag: Optional[str],
+        completed: Optional[bool] = None,
+        limit: Optional[int] = None,
+    ) -> List[CachedTask]:
+        """Apply tag/status filters and a limit to a cached list (a new list)"""
+        name = normalize_tag(tag) if tag is not None else None
+        selected = (
+            task
+            for task in tasks
+            if (completed is None or task.is_completed == completed)
+            and (name is None or name in task.tags)
         )
+        return list(islice(selected, limit))
+
+    @staticmethod
+    def get_tasks_by_user(
+        db: Session, user_id: int, tag: Optional[str] = None
+    ) -> List[CachedTask]:
+        """Get all tasks for a user, newest first (read-only snapshots)"""
+        tasks = TaskRepository._cached_tasks(db, user_id)
+        return TaskRepository._filter_cached(tasks, tag)
 
     @staticmethod
-    def get_completed_tasks(db: Session, user_id: int) -> List[Task]:
-        """Get completed tasks for a user"""
+    def get_pending_tasks(
+        db: Session,
+        user_id: int,
+        tag: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[CachedTask]:
+        """Get incomplete tasks for a user, newest first (read-only snapshots)"""
+        tasks = TaskRepository._cached_tasks(db, user_id)
+        return TaskRepository._filter_cached(tasks, tag, False, limit)
+
+    @staticmethod
+    def get_completed_tasks(
+        db: Session, user_id: int, tag: Optional[str] = None
+    ) -> List[CachedTask]:
+        """Get completed tasks for a user, newest first (read-only snapshots)"""
+        tasks = TaskRepository._cached_tasks(db, user_id)
+        return TaskRepository._filter_cached(tasks, tag, True)
+
+    @staticmethod
+    def _tag_names_column(separator: str):
+        """Correlated subquery of a task's tag names joined by separator"""
         return (
-            db.query(Task)
-            .filter(Task.user_id == user_id, Task.is_completed.is_(True))
-            .order_by(Task.created_at.desc())
-            .all()
+            select(func.group_concat(Tag.name, separator))
+            .join(task_tags, task_tags.c.tag_id == Tag.id)
+            .where(task_tags.c.task_id == Task.id)
+            .correlate(Task)
+            .scalar_subquery()
         )
 
+    @staticmethod
+    def _archived_tags_column(separator: str):
+        """Archived task tag names joined by separator"""
+        if separator == TAG_NAMES_SEPARATOR:
+            return ArchivedTask.tag_names
+        return func.replace(ArchivedTask.tag_names, TAG_NAMES_SEPARATOR, separator)
+
+    @staticmethod
+    def get_task_rows(
+        db: Session,
+        user_id: int,
+        fields: Sequence[str],
+        status_filter: Optional[str] = None,
+        tag: Optional[str] = None,
+        tag_separator: str = TAG_NAMES_SEPARATOR,
+        include_archived: bool = False,
+    ) -> List[Tuple]:
+        """
+        Get only the requested task columns as plain rows, newest first
+
+        Args:
+            fields: Task attribute names; "tags" selects tag names joined
+                by tag_separator (or None)
+            status_filter: "completed", "pending" or None for all tasks
+            include_archived: Also read archived tasks (all completed)
+        """
+        columns = [
+            (
+                TaskRepository._tag_names_column(tag_separator)
+                if field == "tags"
+                else getattr(Task, field)
+            ).label(field)
+            for field in fields
+        ]
+        query = TaskRepository._user_tasks(db, user_id, tag)
+        if status_filter in ("completed", "pending"):
+            query = query.filter(Task.is_completed.is_(status_filter == "completed"))
+        if not include_archived or status_filter == "pending":
+            return query.with_entities(*columns).order_by(Task.created_at.desc()).all()
+
+        archived = select(
+            *[
+                (
+                    TaskRepository._archived_tags_column(tag_separator)
+                    if field == "tags"
+                    else getattr(ArchivedTask, field)
+                ).label(field)
+                for field in fields
+            ],
+            ArchivedTask.created_at.label("sort_key"),
+        ).where(ArchivedTask.user_id == user_id)
+        if tag is not None:
+            sep = TAG_NAMES_SEPARATOR
+            archived = archived.where(
+                func.instr(
+                    sep + ArchivedTask.tag_names + sep, sep + normalize_tag(tag) + sep
+                )
+                > 0
+            )
+        live = query.with_entities(*columns, Task.created_at.label("sort_key"))
+        both = union_all(live.statement, archived).subquery()
+        return db.execute(
+            select(*[both.c[field] for field in fields]).order_by(
+                both.c.sort_key.desc()
+            )
+        ).all()
+
     @staticmethod
     def get_task_statistics(db: Session, user_id: int) -> dict:
-        """Get task statistics for a user"""
+        """
+        Get task statistics for a user
+
+        Archived tasks (all completed) come from the user's counter, so only
+        the live table is counted.
+        """
         total = db.query(Task).filter(Task.user_id == user_id).count()
         completed = (
             db.query(Task)
             .filter(Task.user_id == user_id, Task.is_completed.is_(True))
             .count()
         )
+        # Usually already in the session from authentication, so no query
+        user = db.get(User, user_id)
+        archived = user.archived_task_count if user else 0
+        total += archived
+        completed += archived
         pending = total - completed
 
         return {
@@ -153,30 +723,230 @@ class TaskRepository:
             "completion_rate": (completed / total * 100) if total > 0 else 0,
         }
 
+    @staticmethod
+    def _apply_task_update(db: Session, task: Task, task_data: TaskUpdate):
+        """Apply field changes to a loaded task without committing"""
+        if task_data.title is not None:
+            task.title = task_data.title
+        if task_data.tags is not None:
+            TaskRepository._set_tags(db, task, task_data.tags)
+        if (
+            task_data.is_completed is not None
+            and task_data.is_completed != task.is_completed
+        ):
+            TaskRepository._set_completed(db, task, task_data.is_completed)
+
+    @staticmethod
+    def _set_completed(db: Session, task: Task, completed: bool):
+        """Flip a task's completion state and keep the daily rollup in step"""
+        if completed:
+            task.completed_at = datetime.now(timezone.utc)
+            task.completed_day = AnalyticsRepository.record_completion(
+                db, task.user_id, task.completed_at
+            )
+        else:
+            if task.completed_at is not None:
+                AnalyticsRepository.record_completion(
+                    db, task.user_id, task.completed_at, -1, task.completed_day
+                )
+            task.completed_at = None
+            task.completed_day = None
+        task.is_completed = completed
+        TaskRepository._bump_tag_counts(db, task.tags, completed=1 if completed else -1)
+        if completed and task.recurrence_id is not None:
+            RecurrenceRepository.occurrence_completed(db, task)
+
+    # ------------------------------------------------------------------------
+    # TAGS
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def _bump_tag_counts(
+        db: Session, tags: List[Tag], total: int = 0, completed: int = 0
+    ):
+        """Adjust materialized tag counts with a single in-database UPDATE"""
+        if not tags:
+            return
+        db.query(Tag).filter(Tag.id.in_([tag.id for tag in tags])).update(
+            {
+                Tag.task_count: Tag.task_count + total,
+                Tag.completed_count: Tag.completed_count + completed,
+            },
+            synchronize_session=False,
+        )
+
+    @staticmethod
+    def _set_tags(db: Session, task: Task, names: List[str]):
+        """Replace a task's tags, creating missing ones, without committing"""
+        wanted = list(dict.fromkeys(filter(None, map(normalize_tag, names))))
+        current = {tag.name: tag for tag in task.tags}
+        if set(wanted) == set(current):
+            return
+
+        tags = {}
+        if wanted:
+            tags = {
+                tag.name: tag
+                for tag in db.query(Tag).filter(
+                    Tag.user_id == task.user_id, Tag.name.in_(wanted)
+                )
+            }
+        for name in wanted:
+            if name not in tags:
+                tags[name] = Tag(
+                    user_id=task.user_id, name=name, task_count=0, completed_count=0
+                )
+                db.add(tags[name])
+        db.flush()
+
+        done = 1 if task.is_completed else 0
+        TaskRepository._bump_tag_counts(
+            db, [tags[name] for name in wanted if name not in current], 1, done
+        )
+        TaskRepository._bump_tag_counts(
+            db,
+            [tag for name, tag in current.items() if name not in wanted],
+            -1,
+            -done,
+        )
+        task.tags = [tags[name] for name in wanted]
+        # Tag changes touch only the link table; still count as a task change
+        task.updated_at = datetime.now(timezone.utc)
+
+    @staticmethod
+    def get_tag_counts(db: Session, user_id: int) -> List[Tag]:
+        """Get the user's tags in use with their task counts, largest first"""
+        return (
+            db.query(Tag)
+            .filter(Tag.user_id == user_id, Tag.task_count > 0)
+            .order_by(Tag.task_count.desc(), Tag.name)
+            .all()
+        )
+
+    @staticmethod
+    def _remove_task(db: Session, task: Task):
+        """Delete a loaded task and leave a tombstone, without committing"""
+        TaskRepository._bump_tag_counts(
+            db, task.tags, -1, -1 if task.is_completed else 0
+        )
+        db.add(TaskTombstone(task_id=task.id, user_id=task.user_id))
+        db.delete(task)
+
     @staticmethod
     def update_task(db: Session, task_id: int, task_data: TaskUpdate) -> Optional[Task]:
-        """Update a task"""
+        """
+        Update a task
+
+        The UPDATE only matches the version that was loaded, so a concurrent
+        change is detected at commit instead of being overwritten.
+
+        Raises:
+            TaskConflictError: If task_data.expected_version is stale or the
+                task changed concurrently
+        """
         try:
             task = TaskRepository.get_task_by_id(db, task_id)
             if not task:
                 logger.warning(f"Task {task_id} not found for update")
                 return None
+            if (
+                task_data.expected_version is not None
+                and task.version != task_data.expected_version
+            ):
+                raise TaskConflictError(
+                    f"Task {task_id} has changed", [task_id], task.version
+                )
 
-            if task_data.title is not None:
-                task.title = task_data.title
-            if task_data.is_completed is not None:
-                task.is_completed = task_data.is_completed
+            TaskRepository._apply_task_update(db, task, task_data)
+            version = TaskRepository._bump_list_version(
+                db, task.user_id, changed=[task_id]
+            )
 
             db.commit()
             db.refresh(task)
+            if task_data.title is not None:
+                title_index.add(task.user_id, task.id, task.title)
+            task_cache.apply(task.user_id, version, [CachedTask.from_task(task)])
             logger.info(f"Task {task_id} updated successfully")
             return task
 
+        except TaskConflictError:
+            db.rollback()
+            raise
+        except StaleDataError:
+            db.rollback()
+            raise TaskConflictError(
+                f"Task {task_id} was changed concurrently", [task_id]
+            )
         except Exception as e:
             db.rollback()
             logger.error(f"Error updating task: {str(e)}")
             return None
 
+    @staticmethod
+    def update_tasks(
+        db: Session, user_id: int, updates: List[TaskBatchUpdateItem]
+    ) -> Optional[List[Task]]:
+        """
+        Apply several compare-and-swap updates in one transaction
+
+        Each task must still be at its expected_version; every UPDATE is also
+        conditional on the version (see Task.version). Either all updates
+        are committed or none are.
+
+        Returns:
+            The updated tasks in request order, or None on error
+
+        Raises:
+            LookupError: If a task does not exist or belongs to another user
+            TaskConflictError: With the ids of the tasks that changed
+        """
+        ids = [update.id for update in updates]
+        try:
+            tasks = {
+                task.id: task
+                for task in db.query(Task).filter(
+                    Task.id.in_(ids), Task.user_id == user_id
+                )
+            }
+            missing = [task_id for task_id in ids if task_id not in tasks]
+            if missing:
+                raise LookupError(f"Task {missing[0]} not found")
+            stale = [
+                update.id
+                for update in updates
+                if tasks[update.id].version != update.expected_version
+            ]
+            if stale:
+                raise TaskConflictError(f"{len(stale)} task(s) have changed", stale)
+
+            for update in updates:
+                TaskRepository._apply_task_update(db, tasks[update.id], update)
+            version = TaskRepository._bump_list_version(db, user_id, changed=ids)
+            db.commit()
+
+        except (LookupError, TaskConflictError):
+            db.rollback()
+            raise
+        except StaleDataError:
+            db.rollback()
+            raise TaskConflictError("Tasks were changed concurrently", ids)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error batch updating tasks: {str(e)}")
+            return None
+
+        for update in updates:
+            if update.title is not None:
+                title_index.add(user_id, update.id, update.title)
+        # Reload the committed rows with one query rather than one per task
+        db.query(Task).filter(Task.id.in_(ids)).all()
+        task_cache.apply(
+            user_id, version, [CachedTask.from_task(tasks[task_id]) for task_id in ids]
+        )
+        logger.info(f"Batch updated {len(ids)} tasks for user {user_id}")
+        return [tasks[task_id] for task_id in ids]
+
     @staticmethod
     def delete_task(db: Session, task_id: int) -> bool:
         """Delete a task"""
@@ -186,8 +956,12 @@ class TaskRepository:
                 logger.warning(f"Task {task_id} not found for deletion")
                 return False
 
-            db.delete(task)
+            user_id = task.user_id
+            TaskRepository._remove_task(db, task)
+            version = TaskRepository._bump_list_version(db, user_id, deleted=[task_id])
             db.commit()
+            title_index.remove(user_id, task_id)
+            task_cache.apply(user_id, version, deletes=[task_id])
             logger.info(f"Task {task_id} deleted successfully")
             return True
 
@@ -208,7 +982,14 @@ class TaskRepository:
                 tasks.append(new_task)
 
             db.add_all(tasks)
+            db.flush()
+            ids = [task.id for task in tasks]
+            version = TaskRepository._bump_list_version(db, user_id, changed=ids)
             db.commit()
+            title_index.invalidate(user_id)
+            # Reload the committed rows with one query rather than one per task
+            db.query(Task).filter(Task.id.in_(ids)).all()
+            task_cache.apply(user_id, version, map(CachedTask.from_task, tasks))
             logger.info(f"Bulk created {len(tasks)} tasks for user {user_id}")
             return tasks
 
@@ -216,3 +997,866 @@ class TaskRepository:
             db.rollback()
             logger.error(f"Error bulk creating tasks: {str(e)}")
             return []
+
+    # ------------------------------------------------------------------------
+    # IMPORT
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def import_task_chunk(db: Session, user: User, rows: List[TaskImportRow]) -> bool:
+        """
+        Insert a chunk of validated import rows without committing
+
+        Tasks (and tag links) are inserted with executemany; completion
+        rollups and tag counts are adjusted once per day and per tag.
+        Rolls back the whole import on error.
+
+        Returns:
+            True on success, False on error
+        """
+        try:
+            now = datetime.now(timezone.utc)
+            values, days = [], Counter()
+            for row in rows:
+                created_at = as_naive_utc(row.created_at) or now
+                completed_at = completed_day = None
+                if row.is_completed:
+                    completed_at = as_naive_utc(row.completed_at) or created_at
+                    completed_day = AnalyticsRepository.local_day(user, completed_at)
+                    days[completed_day] += 1
+                values.append(
+                    {
+                        "user_id": user.id,
+                        "title": row.title,
+                        "is_completed": row.is_completed,
+                        "created_at": created_at,
+                        "updated_at": now,
+                        "completed_at": completed_at,
+                        "completed_day": completed_day,
+                    }
+                )
+
+            tag_names = [
+                list(dict.fromkeys(filter(None, map(normalize_tag, row.tags))))
+                for row in rows
+            ]
+            tasks = Task.__table__
+            if any(tag_names):
+                # Core executemany (batched into multi-row INSERT ... RETURNING);
+                # ids come back in the order of values
+                task_ids = db.scalars(
+                    insert(tasks).returning(tasks.c.id, sort_by_parameter_order=True),
+                    values,
+                ).all()
+                TaskRepository._import_tags(db, user.id, rows, tag_names, task_ids)
+            else:
+                # Core executemany, no ORM bulk bookkeeping
+                db.execute(insert(tasks), values)
+
+            if days:
+                AnalyticsRepository.add_daily_completions(db, user.id, days)
+            return True
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error importing tasks: {str(e)}")
+            return False
+
+    @staticmethod
+    def _import_tags(db: Session, user_id: int, rows, tag_names, task_ids):
+        """Link imported tasks to their tags and bump the tag counts"""
+        wanted = {name for names in tag_names for name in names}
+        tags = {
+            tag.name: tag
+            for tag in db.query(Tag).filter(
+                Tag.user_id == user_id, Tag.name.in_(wanted)
+            )
+        }
+        for name in wanted - tags.keys():
+            tags[name] = Tag(
+                user_id=user_id, name=name, task_count=0, completed_count=0
+            )
+            db.add(tags[name])
+        db.flush()
+
+        links, counts = [], defaultdict(lambda: [0, 0])
+        for row, names, task_id in zip(rows, tag_names, task_ids):
+            for name in names:
+                links.append({"task_id": task_id, "tag_id": tags[name].id})
+                counts[name][0] += 1
+                counts[name][1] += int(row.is_completed)
+        db.execute(insert(task_tags), links)
+        for name, (total, completed) in counts.items():
+            TaskRepository._bump_tag_counts(db, [tags[name]], total, completed)
+
+    @staticmethod
+    def finish_import(db: Session, user_id: int, completed: bool) -> bool:
+        """
+        Commit an import started with import_task_chunk()
+
+        Args:
+            completed: Whether any imported task was completed (the streak
+                is then recomputed from the daily rollup)
+        """
+        try:
+            if completed:
+                AnalyticsRepository._rebuild_streak(db, db.get(User, user_id))
+            TaskRepository._bump_list_version(db, user_id, resync=True)
+            db.commit()
+            title_index.invalidate(user_id)
+            return True
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error committing task import: {str(e)}")
+            return False
+
+    # ------------------------------------------------------------------------
+    # EXPORT
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def iter_export_batches(
+        db: Session,
+        user_id: int,
+        batch_size: int = 1000,
+        tag_separator: str = TAG_NAMES_SEPARATOR,
+    ) -> Iterator[Sequence]:
+        """
+        Stream a user's tasks as plain rows in fixed-size batches
+
+        Rows are fetched from a server-side cursor (yield_per), so only one
+        batch is held in memory at a time. Each row has id, title,
+        is_completed, created_at, updated_at, completed_at and tags (tag names
+        joined by tag_separator, or None). Live tasks come first, then
+        archived ones, each in id order.
+        """
+        tags = TaskRepository._tag_names_column(tag_separator)
+        live = (
+            select(
+                Task.id,
+                Task.title,
+                Task.is_completed,
+                Task.created_at,
+                Task.updated_at,
+                Task.completed_at,
+                tags.label("tags"),
+            )
+            .where(Task.user_id == user_id)
+            .order_by(Task.id)
+        )
+        archived = (
+            select(
+                ArchivedTask.id,
+                ArchivedTask.title,
+                ArchivedTask.is_completed,
+                ArchivedTask.created_at,
+                ArchivedTask.updated_at,
+                ArchivedTask.completed_at,
+                TaskRepository._archived_tags_column(tag_separator).label("tags"),
+            )
+            .where(ArchivedTask.user_id == user_id)
+            .order_by(ArchivedTask.id)
+        )
+        for stmt in (live, archived):
+            stmt = stmt.execution_options(yield_per=batch_size)
+            yield from db.execute(stmt).partitions()
+
+    # ------------------------------------------------------------------------
+    # ARCHIVE
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def archive_completed_tasks(
+        db: Session, completed_before: datetime, batch_size: int = 500
+    ) -> int:
+        """
+        Move one batch of tasks completed before a cutoff to archived_tasks
+
+        The copy, the deletes, a tombstone per task (so synced clients drop
+        it) and the owners' archived_task_count and task_list_version bumps
+        commit together. Tag counts and the daily rollup are unchanged since
+        archived tasks still count. A batch that races a user's write fails
+        and is picked up again on the next run.
+
+        Returns:
+            Number of tasks archived; 0 when nothing is left or on error
+        """
+        try:
+            rows = (
+                db.execute(
+                    select(
+                        Task.id,
+                        Task.user_id,
+                        Task.title,
+                        Task.created_at,
+                        Task.updated_at,
+                        Task.completed_at,
+                        Task.due_at,
+                        Task.recurrence_id,
+                        Task.version,
+                        TaskRepository._tag_names_column(TAG_NAMES_SEPARATOR).label(
+                            "tag_names"
+                        ),
+                    )
+                    .where(
+                        Task.completed_at < as_naive_utc(completed_before),
+                        Task.is_completed.is_(True),
+                    )
+                    .order_by(Task.completed_at)
+                    .limit(batch_size)
+                )
+                .mappings()
+                .all()
+            )
+            if not rows:
+                return 0
+
+            now = datetime.now(timezone.utc)
+            ids = [row["id"] for row in rows]
+            db.execute(
+                insert(ArchivedTask.__table__),
+                [{**row, "is_completed": True, "archived_at": now} for row in rows],
+            )
+            db.execute(delete(task_tags).where(task_tags.c.task_id.in_(ids)))
+            db.execute(delete(Task.__table__).where(Task.id.in_(ids)))
+            db.execute(
+                insert(TaskTombstone.__table__),
+                [
+                    {"task_id": row["id"], "user_id": row["user_id"], "deleted_at": now}
+                    for row in rows
+                ],
+            )
+            users = User.__table__
+            db.execute(
+                update(users)
+                .where(users.c.id == bindparam("owner"))
+                .values(
+                    archived_task_count=users.c.archived_task_count
+                    + bindparam("archived"),
+                    task_list_version=users.c.task_list_version + 1,
+                ),
+                [
+                    {"owner": user_id, "archived": count}
+                    for user_id, count in Counter(
+                        row["user_id"] for row in rows
+                    ).items()
+                ],
+            )
+            tombstones = TaskTombstone.__table__
+            db.execute(
+                update(tombstones)
+                .where(
+                    tombstones.c.user_id.in_({row["user_id"] for row in rows}),
+                    tombstones.c.list_version.is_(None),
+                )
+                .values(
+                    list_version=select(users.c.task_list_version)
+                    .where(users.c.id == tombstones.c.user_id)
+                    .scalar_subquery()
+                )
+            )
+            for row in rows:
+                change_feed.stage_tasks(db, row["user_id"], deleted=[row["id"]])
+            db.commit()
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error archiving tasks: {str(e)}")
+            return 0
+
+        for row in rows:
+            title_index.remove(row["user_id"], row["id"])
+        logger.info(f"Archived {len(rows)} completed tasks")
+        return len(rows)
+
+    # ------------------------------------------------------------------------
+    # DELTA SYNC
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def get_changes_since(
+        db: Session, user_id: int, since: Optional[int]
+    ) -> Tuple[List[Task], List[int], int, bool]:
+        """
+        Get tasks changed and deleted after a task-list version
+
+        The user's current version is read first and only rows stamped at or
+        below it are returned, so every later write (including one that was
+        in flight) has a higher list_version and is picked up by the next
+        sync, whatever order transactions commit in.
+
+        Args:
+            db: Database session
+            user_id: Owner of the tasks
+            since: Previous sync cursor, or None for a full snapshot
+
+        Returns:
+            Tuple of (changed tasks, deleted task IDs, new cursor, full
+            resync). A cursor older than the pruned tombstones or newer than
+            the user's version gets a full snapshot.
+        """
+        version, floor = db.execute(
+            select(User.task_list_version, User.sync_floor_version).where(
+                User.id == user_id
+            )
+        ).one()
+        if since is not None and not floor <= since <= version:
+            since = None
+
+        tasks = db.query(Task).filter(
+            Task.user_id == user_id, Task.list_version <= version
+        )
+        if since is None:
+            changed = tasks.order_by(Task.list_version, Task.id).all()
+            return changed, [], version, True
+
+        changed = (
+            tasks.filter(Task.list_version > since)
+            .order_by(Task.list_version, Task.id)
+            .all()
+        )
+        deleted = (
+            db.query(TaskTombstone.task_id)
+            .filter(
+                TaskTombstone.user_id == user_id,
+                TaskTombstone.list_version > since,
+                TaskTombstone.list_version <= version,
+            )
+            .order_by(TaskTombstone.list_version, TaskTombstone.id)
+            .all()
+        )
+        return changed, [row.task_id for row in deleted], version, False
+
+    @staticmethod
+    def prune_tombstones(db: Session, older_than: datetime) -> int:
+        """
+        Delete tombstones older than the sync retention horizon
+
+        Each owner's sync_floor_version is raised to the newest pruned
+        tombstone, so cursors that could have missed it resync in full.
+        """
+        try:
+            floors = (
+                db.query(TaskTombstone.user_id, func.max(TaskTombstone.list_version))
+                .filter(TaskTombstone.deleted_at < older_than)
+                .group_by(TaskTombstone.user_id)
+                .all()
+            )
+            if floors:
+                users = User.__table__
+                db.execute(
+                    update(users)
+                    .where(users.c.id == bindparam("owner"))
+                    .values(
+                        sync_floor_version=func.max(
+                            users.c.sync_floor_version, bindparam("floor")
+                        )
+                    ),
+                    [
+                        {"owner": user_id, "floor": floor or 0}
+                        for user_id, floor in floors
+                    ],
+                )
+            count = (
+                db.query(TaskTombstone)
+                .filter(TaskTombstone.deleted_at < older_than)
+                .delete(synchronize_session=False)
+            )
+            db.commit()
+            return count
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error pruning tombstones: {str(e)}")
+            return 0
+
+    @staticmethod
+    def apply_sync_mutations(
+        db: Session, user_id: int, mutations: List[SyncMutation]
+    ) -> Optional[List[dict]]:
+        """
+        Apply a batch of offline mutations in one transaction
+
+        Updates and deletes conflict if the task changed on the server after
+        the client's base_updated_at, or no longer exists. Conflicting
+        mutations are skipped; the rest are committed together.
+
+        Returns:
+            One dict per mutation with client_id, task_id, status, detail and
+            task (the current server task, if any), or None on error
+        """
+        results = []
+        try:
+            for mutation in mutations:
+                result = {
+                    "client_id": mutation.client_id,
+                    "task_id": mutation.task_id,
+                    "status": "applied",
+                    "detail": None,
+                    "task": None,
+                }
+                results.append(result)
+
+                if mutation.op == "create":
+                    if not mutation.title:
+                        result.update(status="error", detail="title is required")
+                        continue
+                    task = Task(
+                        user_id=user_id, title=mutation.title, is_completed=False
+                    )
+                    if mutation.is_completed:
+                        TaskRepository._set_completed(db, task, True)
+                    db.add(task)
+                    db.flush()
+                    result.update(task_id=task.id, task=task)
+                    continue
+
+                task = TaskRepository.get_task_by_id(db, mutation.task_id or 0)
+                if not task or task.user_id != user_id:
+                    result.update(status="conflict", detail="Task no longer exists")
+                    continue
+
+                result["task"] = task
+                base = as_naive_utc(mutation.base_updated_at)
+                if base is not None and task.updated_at and task.updated_at > base:
+                    result.update(
+                        status="conflict", detail="Task was changed on the server"
+                    )
+                    continue
+
+                if mutation.op == "update":
+                    TaskRepository._apply_task_update(
+                        db,
+                        task,
+                        TaskUpdate(
+                            title=mutation.title, is_completed=mutation.is_completed
+                        ),
+                    )
+                    db.flush()
+                else:
+                    TaskRepository._remove_task(db, task)
+                    db.flush()
+                    result["task"] = None
+
+            applied = [r for r in results if r["status"] == "applied"]
+            if applied:
+                TaskRepository._bump_list_version(
+                    db,
+                    user_id,
+                    changed=[r["task_id"] for r in applied if r["task"] is not None],
+                    deleted=[r["task_id"] for r in applied if r["task"] is None],
+                )
+            db.commit()
+            title_index.invalidate(user_id)
+            logger.info(
+                f"Applied {len(applied)}/{len(mutations)} sync mutations "
+                f"for user {user_id}"
+            )
+            return results
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error applying sync mutations: {str(e)}")
+            return None
+
+
+# ============================================================================
+# ANALYTICS REPOSITORY
+# ============================================================================
+
+
+@lru_cache(maxsize=512)
+def _zone(name: str) -> tzinfo:
+    """Resolve an IANA timezone name, falling back to UTC if unknown"""
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        logger.warning(f"Unknown timezone {name!r}, using UTC")
+        return timezone.utc
+
+
+registry.register_cache("timezones", lambda: _zone.cache_info()[:2])
+registry.register_cache("rrules", lambda: parse_rrule.cache_info()[:2])
+
+
+class AnalyticsRepository:
+    """Repository for per-user completion rollups and streaks"""
+
+    @staticmethod
+    def local_day(user: User, when: datetime) -> date:
+        """Calendar day of a timestamp in the user's timezone"""
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return when.astimezone(_zone(user.timezone)).date()
+
+    @staticmethod
+    def record_completion(
+        db: Session,
+        user_id: int,
+        when: datetime,
+        delta: int = 1,
+        day: Optional[date] = None,
+    ) -> date:
+        """
+        Add delta to the user's completion count for the day of `when`
+
+        Runs in the caller's transaction and keeps the user's streak in step.
+        Decrements never create rows or take a count below zero.
+
+        Args:
+            day: Local day to count on instead; pass the day a completion was
+                recorded on when undoing it, as the timezone may have changed
+
+        Returns:
+            The day that was counted
+        """
+        user = db.get(User, user_id)
+        day = day or AnalyticsRepository.local_day(user, when)
+        day_filter = (DailyCompletion.user_id == user_id, DailyCompletion.day == day)
+
+        if delta > 0:
+            AnalyticsRepository.add_daily_completions(db, user_id, {day: delta})
+            AnalyticsRepository._extend_streak(db, user, day)
+        else:
+            db.query(DailyCompletion).filter(*day_filter).update(
+                {
+                    DailyCompletion.completed_count: func.max(
+                        DailyCompletion.completed_count + delta, 0
+                    )
+                },
+                synchronize_session=False,
+            )
+            remaining = (
+                db.query(DailyCompletion.completed_count).filter(*day_filter).scalar()
+            )
+            if not remaining:
+                AnalyticsRepository._rebuild_streak(db, user)
+        return day
+
+    @staticmethod
+    def add_daily_completions(db: Session, user_id: int, counts: Dict[date, int]):
+        """Add per-day counts to the rollup, creating rows as needed (no commit)"""
+        stmt = sqlite_insert(DailyCompletion.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "day"],
+            set_={
+                "completed_count": DailyCompletion.__table__.c.completed_count
+                + stmt.excluded.completed_count
+            },
+        )
+        db.execute(
+            stmt,
+            [
+                {"user_id": user_id, "day": day, "completed_count": count}
+                for day, count in counts.items()
+            ],
+        )
+
+    @staticmethod
+    def _extend_streak(db: Session, user: User, day: date):
+        """Account for a completion on `day` in O(1)"""
+        last = user.last_active_day
+        if last == day:
+            return
+        if last is not None and day < last:
+            # Completion counted before the latest active day (e.g. after a
+            # timezone change); rare enough to recount from the rollup
+            AnalyticsRepository._rebuild_streak(db, user)
+            return
+
+        if last == day - timedelta(days=1):
+            user.current_streak += 1
+        else:
+            user.current_streak = 1
+        user.last_active_day = day
+        user.longest_streak = max(user.longest_streak, user.current_streak)
+
+    @staticmethod
+    def _rebuild_streak(db: Session, user: User):
+        """
+        Recompute streak state from the daily rollup
+
+        Only needed when a day loses its last completion, which may split the
+        current streak or shorten the longest one. Reads one row per active day.
+        """
+        days = [
+            row.day
+            for row in db.query(DailyCompletion.day)
+            .filter(
+                DailyCompletion.user_id == user.id, DailyCompletion.completed_count > 0
+            )
+            .order_by(DailyCompletion.day)
+        ]
+
+        current = longest = 0
+        previous = None
+        for day in days:
+            current = current + 1 if previous == day - timedelta(days=1) else 1
+            longest = max(longest, current)
+            previous = day
+
+        user.current_streak = current
+        user.longest_streak = longest
+        user.last_active_day = previous
+
+    @staticmethod
+    def get_streak(user: User) -> dict:
+        """
+        Get the user's streak as of today in their timezone
+
+        A streak stays current until the end of the day after the last
+        active day, so it is not lost before the user had a chance to act.
+        """
+        today = AnalyticsRepository.local_day(user, datetime.now(timezone.utc))
+        last = user.last_active_day
+        alive = last is not None and last >= today - timedelta(days=1)
+        return {
+            "current_streak": user.current_streak if alive else 0,
+            "longest_streak": user.longest_streak,
+            "last_active_day": last,
+            "active_today": last == today,
+            "timezone": user.timezone,
+        }
+
+    @staticmethod
+    def set_timezone(db: Session, user_id: int, name: str) -> Optional[User]:
+        """
+        Set the timezone used for completion days and streaks
+
+        Raises:
+            ValueError: If the name is not a known IANA timezone
+        """
+        try:
+            ZoneInfo(name)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"Unknown timezone: {name}")
+
+        try:
+            user = db.get(User, user_id)
+            if not user:
+                return None
+            user.timezone = name
+            db.commit()
+            db.refresh(user)
+            logger.info(f"Timezone for user {user_id} set to {name}")
+            return user
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error setting timezone: {str(e)}")
+            return None
+
+    @staticmethod
+    def get_daily_completions(
+        db: Session, user_id: int, start: date, end: date
+    ) -> List[Tuple[date, int]]:
+        """
+        Get non-zero daily completion counts in an inclusive date range
+
+        Returns:
+            List of (day, completed_count) ordered by day
+        """
+        rows = (
+            db.query(DailyCompletion.day, DailyCompletion.completed_count)
+            .filter(
+                DailyCompletion.user_id == user_id,
+                DailyCompletion.day >= start,
+                DailyCompletion.day <= end,
+                DailyCompletion.completed_count > 0,
+            )
+            .order_by(DailyCompletion.day)
+            .all()
+        )
+        return [(row.day, row.completed_count) for row in rows]
+
+
+# ============================================================================
+# RECURRENCE REPOSITORY
+# ============================================================================
+
+
+class RecurrenceRepository:
+    """Repository for recurring task rules and their occurrences"""
+
+    @staticmethod
+    def create_rule(
+        db: Session, user: User, data: RecurrenceCreate
+    ) -> Optional[RecurrenceRule]:
+        """
+        Create a recurring task; the first occurrence is created if it is due
+
+        Raises:
+            ValueError: If the rule is invalid or has no occurrences
+        """
+        spec = parse_rrule(data.rule)
+        now = datetime.now(timezone.utc)
+        start = as_naive_utc(data.starts_at) or as_naive_utc(now)
+        first = first_occurrence(spec, start, _zone(user.timezone))
+        if first is None:
+            raise ValueError("The rule has no occurrences")
+
+        try:
+            tags = list(dict.fromkeys(filter(None, map(normalize_tag, data.tags))))
+            rule = RecurrenceRule(
+                user_id=user.id,
+                title=data.title,
+                rule=str(spec),
+                tag_names=TAG_NAMES_SEPARATOR.join(tags) or None,
+                starts_at=first,
+                next_due_at=first,
+                occurrence_count=0,
+            )
+            db.add(rule)
+            db.flush()
+            task = None
+            if first <= as_naive_utc(now):
+                task = RecurrenceRepository._materialize(db, rule, user.timezone, now)
+            db.commit()
+            db.refresh(rule)
+            if task is not None:
+                title_index.add(user.id, task.id, task.title)
+            logger.info(f"Recurrence rule created: {rule.id} for user {user.id}")
+            return rule
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error creating recurrence rule: {str(e)}")
+            return None
+
+    @staticmethod
+    def get_rule_by_id(db: Session, rule_id: int) -> Optional[RecurrenceRule]:
+        """Get a recurrence rule by ID"""
+        return db.get(RecurrenceRule, rule_id)
+
+    @staticmethod
+    def get_rules_by_user(db: Session, user_id: int) -> List[RecurrenceRule]:
+        """Get a user's recurrence rules, oldest first"""
+        return (
+            db.query(RecurrenceRule)
+            .filter(RecurrenceRule.user_id == user_id)
+            .order_by(RecurrenceRule.id)
+            .all()
+        )
+
+    @staticmethod
+    def delete_rule(db: Session, rule_id: int) -> bool:
+        """Delete a rule; its existing occurrences are kept as plain tasks"""
+        try:
+            rule = RecurrenceRepository.get_rule_by_id(db, rule_id)
+            if not rule:
+                logger.warning(f"Recurrence rule {rule_id} not found for deletion")
+                return False
+
+            # SQLite does not enforce ON DELETE SET NULL without the pragma
+            db.query(Task).filter(Task.recurrence_id == rule_id).update(
+                {
+                    Task.recurrence_id: None,
+                    Task.updated_at: datetime.now(timezone.utc),
+                    Task.version: Task.version + 1,
+                    # Stamped with the new list version below
+                    Task.list_version: None,
+                },
+                synchronize_session=False,
+            )
+            TaskRepository._bump_list_version(db, rule.user_id, resync=True)
+            db.delete(rule)
+            db.commit()
+            logger.info(f"Recurrence rule {rule_id} deleted successfully")
+            return True
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error deleting recurrence rule: {str(e)}")
+            return False
+
+    @staticmethod
+    def _materialize(
+        db: Session, rule: RecurrenceRule, tz_name: str, now: datetime
+    ) -> Task:
+        """
+        Create the rule's next occurrence and advance next_due_at, without
+        committing
+
+        Occurrences missed while nothing ran are skipped rather than created
+        in bulk: the next due time is searched from now.
+        """
+        task = Task(
+            user_id=rule.user_id,
+            title=rule.title,
+            is_completed=False,
+            due_at=rule.next_due_at,
+            recurrence_id=rule.id,
+        )
+        db.add(task)
+        if rule.tag_names:
+            TaskRepository._set_tags(db, task, rule.tags)
+        db.flush()
+
+        rule.occurrence_count += 1
+        rule.current_task_id = task.id
+        spec = parse_rrule(rule.rule)
+        if spec.count is not None and rule.occurrence_count >= spec.count:
+            rule.next_due_at = None
+        else:
+            rule.next_due_at = next_occurrence(
+                spec,
+                rule.starts_at,
+                max(as_naive_utc(now), rule.next_due_at),
+                _zone(tz_name),
+            )
+        TaskRepository._bump_list_version(db, rule.user_id, changed=[task.id])
+        return task
+
+    @staticmethod
+    def occurrence_completed(db: Session, task: Task):
+        """Create the next occurrence early when the latest one is completed"""
+        rule = RecurrenceRepository.get_rule_by_id(db, task.recurrence_id)
+        if rule is None or rule.current_task_id != task.id or rule.next_due_at is None:
+            return
+        user = db.get(User, rule.user_id)
+        task = RecurrenceRepository._materialize(
+            db, rule, user.timezone, datetime.now(timezone.utc)
+        )
+        # Looked up by id before use, so a rolled-back entry is harmless
+        title_index.add(task.user_id, task.id, task.title)
+
+    @staticmethod
+    def materialize_due(db: Session, now: datetime, batch_size: int = 500) -> int:
+        """
+        Create the occurrences whose due time has arrived, one batch
+
+        Due rules are found through the next_due_at index, so the cost
+        depends on how many are due, not on how many rules exist.
+
+        Returns:
+            Number of occurrences created; 0 when none are due or on error
+        """
+        try:
+            due = (
+                db.query(RecurrenceRule, User.timezone)
+                .join(User, User.id == RecurrenceRule.user_id)
+                .filter(RecurrenceRule.next_due_at <= as_naive_utc(now))
+                .order_by(RecurrenceRule.next_due_at)
+                .limit(batch_size)
+                .all()
+            )
+            # Keep what the title index needs; commit expires the instances
+            created = [
+                (task.user_id, task.id, task.title)
+                for task in (
+                    RecurrenceRepository._materialize(db, rule, tz_name, now)
+                    for rule, tz_name in due
+                )
+            ]
+            db.commit()
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error creating recurring task occurrences: {str(e)}")
+            return 0
+
+        for user_id, task_id, title in created:
+            title_index.add(user_id, task_id, title)
+        if created:
+            logger.info(f"Created {len(created)} recurring task occurrences")
+        return len(created)
@@ -0,0 +1,165 @@
+"""
+In-process cache of per-user task lists
+
+Each cached list holds one plain tuple per task (CachedTask) instead of ORM
+objects and is tagged with the user's task_list_version. A lookup is a hit
+only if the cached version is at least the version the caller has, so any
+write that bumps the version (imports, sync, archiving, ...) makes older
+lists miss without having to know about the cache. create/update/delete
+paths write through: they apply their change to the cached list and move it
+to the version they committed. Lists are evicted least-recently-used once
+their estimated size exceeds the memory budget.
+"""
+
+import logging
+import os
+import sys
+import threading
+from datetime import datetime
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from cachetools import LRUCache
+
+from src.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Memory budget for all cached lists (estimated bytes)
+TASK_CACHE_MAX_BYTES = int(os.getenv("TASK_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+
+class CachedTask(NamedTuple):
+    """Read-only snapshot of a task, field for field like TaskResponse"""
+
+    id: int
+    user_id: int
+    title: str
+    is_completed: bool
+    created_at: datetime
+    updated_at: Optional[datetime]
+    completed_at: Optional[datetime]
+    tags: Tuple[str, ...]
+    due_at: Optional[datetime]
+    recurrence_id: Optional[int]
+    version: int
+
+    @classmethod
+    def from_task(cls, task) -> "CachedTask":
+        return cls(
+            task.id,
+            task.user_id,
+            task.title,
+            task.is_completed,
+            task.created_at,
+            task.updated_at,
+            task.completed_at,
+            tuple(tag.name for tag in task.tags),
+            task.due_at,
+            task.recurrence_id,
+            task.version,
+        )
+
+
+# Tuple, three datetimes and small ints; titles and tag names are added
+_ROW_BYTES = sys.getsizeof(tuple(range(len(CachedTask._fields)))) + 3 * 48 + 64
+
+
+def _sort_key(task: CachedTask):
+    return task.created_at, task.id
+
+
+class _TaskList:
+    """A user's tasks, newest first, as of a task-list version"""
+
+    __slots__ = ("version", "tasks", "size")
+
+    def __init__(self, version: int, tasks: List[CachedTask]):
+        self.version = version
+        self.tasks = tasks
+        self.size = sum(
+            _ROW_BYTES + len(task.title) + sum(49 + len(tag) for tag in task.tags)
+            for task in tasks
+        )
+
+
+class TaskListCache:
+    """LRU cache of per-user task lists bounded by estimated memory"""
+
+    def __init__(self, max_bytes: int = TASK_CACHE_MAX_BYTES):
+        self._lists: LRUCache = LRUCache(
+            maxsize=max_bytes, getsizeof=lambda entry: entry.size
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int, version: int) -> Optional[List[CachedTask]]:
+        """The user's tasks if a list at least as new as version is cached"""
+        with self._lock:
+            entry = self._lists.get(user_id)
+            if entry is None or entry.version < version:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry.tasks
+
+    def put(self, user_id: int, version: int, tasks: List[CachedTask]):
+        """Cache a list loaded at version, unless a newer one is cached"""
+        entry = _TaskList(version, sorted(tasks, key=_sort_key, reverse=True))
+        with self._lock:
+            current = self._lists.get(user_id)
+            if current is not None and current.version >= version:
+                return
+            self._store(user_id, entry)
+
+    def apply(
+        self,
+        user_id: int,
+        version: int,
+        upserts: Iterable[CachedTask] = (),
+        deletes: Iterable[int] = (),
+    ):
+        """
+        Write through a committed change that moved the list to version
+
+        Applies only to the list at version - 1; any other cached list for
+        the user is dropped, and it is reloaded on the next read.
+        """
+        with self._lock:
+            current = self._lists.get(user_id)
+            if current is None or current.version >= version:
+                return
+            if current.version != version - 1:
+                del self._lists[user_id]
+                return
+            upserts = {task.id: task for task in upserts}
+            removed = upserts.keys() | set(deletes)
+            tasks = [task for task in current.tasks if task.id not in removed]
+            tasks.extend(upserts.values())
+            tasks.sort(key=_sort_key, reverse=True)
+            self._store(user_id, _TaskList(version, tasks))
+
+    def _store(self, user_id: int, entry: _TaskList):
+        try:
+            self._lists[user_id] = entry
+        except ValueError:
+            # Larger than the whole budget; serve this user from the database
+            self._lists.pop(user_id, None)
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._lists.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._lists.clear()
+
+    @property
+    def size(self) -> int:
+        """Estimated bytes held"""
+        return self._lists.currsize
+
+
+# Shared instance used by the repository layer
+task_cache = TaskListCache()
+registry.register_cache("task_lists", lambda: (task_cache.hits, task_cache.misses))
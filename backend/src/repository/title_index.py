@@ -0,0 +1,270 @@
+"""
+In-process near-duplicate index for task titles
+
+Keeps a per-user MinHash/LSH index of normalized title fingerprints so that
+task creation can detect near-identical titles without scanning every task
+the user owns. Indexes are built lazily from the database on first use and
+kept in sync by the TaskRepository write paths.
+"""
+
+import logging
+import os
+import re
+import threading
+import unicodedata
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import xxhash
+from cachetools import LRUCache
+
+from src.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Jaccard similarity (over character shingles) above which two titles are duplicates
+DUPLICATE_SIMILARITY_THRESHOLD = float(
+    os.getenv("DUPLICATE_SIMILARITY_THRESHOLD", "0.8")
+)
+
+# Maximum number of per-user indexes kept in memory
+TITLE_INDEX_MAX_USERS = int(os.getenv("TITLE_INDEX_MAX_USERS", "1024"))
+
+# MinHash / LSH parameters: 8 bands of 4 rows over 32 hash functions
+NUM_PERMUTATIONS = 32
+LSH_BANDS = 8
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+SHINGLE_SIZE = 3
+
+_MERSENNE_PRIME = (1 << 61) - 1
+
+# Fixed permutation coefficients so fingerprints are stable across processes
+_PERMUTATIONS: List[Tuple[int, int]] = [
+    (
+        xxhash.xxh64_intdigest(f"a{i}") % (_MERSENNE_PRIME - 1) + 1,
+        xxhash.xxh64_intdigest(f"b{i}") % _MERSENNE_PRIME,
+    )
+    for i in range(NUM_PERMUTATIONS)
+]
+
+_NON_ALNUM = re.compile(r"[\W_]+", re.UNICODE)
+
+Signature = Tuple[int, ...]
+
+
+# ============================================================================
+# FINGERPRINTING
+# ============================================================================
+
+
+def normalize_title(title: str) -> str:
+    """Normalize a title for comparison (case, accents, punctuation, spacing)"""
+    text = unicodedata.normalize("NFKD", title)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return _NON_ALNUM.sub(" ", text.lower()).strip()
+
+
+def title_signature(normalized: str) -> Signature:
+    """
+    Compute the MinHash signature of a normalized title
+
+    Args:
+        normalized: Output of normalize_title()
+
+    Returns:
+        Tuple of NUM_PERMUTATIONS minimum hash values
+    """
+    if len(normalized) <= SHINGLE_SIZE:
+        shingles = {normalized}
+    else:
+        shingles = {
+            normalized[i : i + SHINGLE_SIZE]
+            for i in range(len(normalized) - SHINGLE_SIZE + 1)
+        }
+
+    hashes = [xxhash.xxh32_intdigest(s) for s in shingles]
+    return tuple(
+        [min([(a * h + b) % _MERSENNE_PRIME for h in hashes]) for a, b in _PERMUTATIONS]
+    )
+
+
+def _bands(signature: Signature) -> Iterable[Tuple[int, Tuple[int, ...]]]:
+    for band in range(LSH_BANDS):
+        start = band * LSH_ROWS
+        yield band, signature[start : start + LSH_ROWS]
+
+
+def _similarity(a: Signature, b: Signature) -> float:
+    """Estimate Jaccard similarity from two MinHash signatures"""
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERMUTATIONS
+
+
+# ============================================================================
+# PER-USER INDEX
+# ============================================================================
+
+
+class _UserTitleIndex:
+    """Fingerprints and LSH buckets for a single user's tasks"""
+
+    def __init__(self):
+        self.signatures: Dict[int, Signature] = {}
+        self.normalized: Dict[int, str] = {}
+        self.exact: Dict[str, Set[int]] = {}
+        self.buckets: List[Dict[Tuple[int, ...], Set[int]]] = [
+            {} for _ in range(LSH_BANDS)
+        ]
+
+    def add(self, task_id: int, title: str):
+        self.remove(task_id)
+        normalized = normalize_title(title)
+        signature = title_signature(normalized)
+        self.signatures[task_id] = signature
+        self.normalized[task_id] = normalized
+        self.exact.setdefault(normalized, set()).add(task_id)
+        for band, key in _bands(signature):
+            self.buckets[band].setdefault(key, set()).add(task_id)
+
+    def remove(self, task_id: int):
+        signature = self.signatures.pop(task_id, None)
+        if signature is None:
+            return
+        normalized = self.normalized.pop(task_id)
+        ids = self.exact.get(normalized)
+        if ids is not None:
+            ids.discard(task_id)
+            if not ids:
+                del self.exact[normalized]
+        for band, key in _bands(signature):
+            ids = self.buckets[band].get(key)
+            if ids is not None:
+                ids.discard(task_id)
+                if not ids:
+                    del self.buckets[band][key]
+
+    def find(self, title: str, threshold: float) -> Optional[int]:
+        normalized = normalize_title(title)
+        exact = self.exact.get(normalized)
+        if exact:
+            return min(exact)
+
+        signature = title_signature(normalized)
+        candidates: Set[int] = set()
+        for band, key in _bands(signature):
+            candidates.update(self.buckets[band].get(key, ()))
+
+        best_id, best_score = None, threshold
+        for task_id in candidates:
+            score = _similarity(signature, self.signatures[task_id])
+            if score >= best_score:
+                best_id, best_score = task_id, score
+        return best_id
+
+
+# ============================================================================
+# TITLE INDEX
+# ============================================================================
+
+
+class TitleIndex:
+    """LRU-bounded collection of per-user title indexes"""
+
+    def __init__(self, max_users: int = TITLE_INDEX_MAX_USERS):
+        self._indexes: LRUCache = LRUCache(maxsize=max_users)
+        self._lock = threading.Lock()
+        # User ID -> change lists of the loads in progress for that user
+        self._loading: Dict[int, List[List[tuple]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def find_duplicate(
+        self,
+        user_id: int,
+        title: str,
+        loader: Callable[[], Iterable[Tuple[int, str]]],
+        threshold: float = DUPLICATE_SIMILARITY_THRESHOLD,
+    ) -> Optional[int]:
+        """
+        Find a task whose title is a near-duplicate of the given title
+
+        Args:
+            user_id: Owner of the tasks
+            title: Candidate title
+            loader: Returns (task_id, title) pairs if the index must be built
+            threshold: Minimum estimated Jaccard similarity
+
+        Returns:
+            ID of the most similar existing task, or None
+        """
+        with self._lock:
+            index = self._indexes.get(user_id)
+            if index is not None:
+                self.hits += 1
+                return index.find(title, threshold)
+            self.misses += 1
+            # Changes made while the titles load are replayed onto the index
+            changes: List[tuple] = []
+            self._loading.setdefault(user_id, []).append(changes)
+
+        # Load without the lock so a cold user does not stall everyone else
+        index = _UserTitleIndex()
+        try:
+            for task_id, existing_title in loader():
+                index.add(task_id, existing_title)
+        finally:
+            with self._lock:
+                loading = self._loading[user_id]
+                loading.remove(changes)
+                if not loading:
+                    del self._loading[user_id]
+
+        with self._lock:
+            stale = False
+            for change in changes:
+                if change[0] == "add":
+                    index.add(change[1], change[2])
+                elif change[0] == "remove":
+                    index.remove(change[1])
+                else:
+                    stale = True
+            current = self._indexes.get(user_id)
+            if current is not None:
+                # Another request built it first
+                index = current
+            elif not stale:
+                self._indexes[user_id] = index
+                logger.debug(
+                    f"Built title index for user {user_id} "
+                    f"({len(index.signatures)} tasks)"
+                )
+            return index.find(title, threshold)
+
+    def _record(self, user_id: int, change: tuple):
+        for changes in self._loading.get(user_id, ()):
+            changes.append(change)
+
+    def add(self, user_id: int, task_id: int, title: str):
+        """Add or replace a task title (no-op if the user's index is not loaded)"""
+        with self._lock:
+            self._record(user_id, ("add", task_id, title))
+            index = self._indexes.get(user_id)
+            if index is not None:
+                index.add(task_id, title)
+
+    def remove(self, user_id: int, task_id: int):
+        """Remove a task from the user's index (no-op if not loaded)"""
+        with self._lock:
+            self._record(user_id, ("remove", task_id))
+            index = self._indexes.get(user_id)
+            if index is not None:
+                index.remove(task_id)
+
+    def invalidate(self, user_id: int):
+        """Drop a user's index so it is rebuilt on next use"""
+        with self._lock:
+            self._record(user_id, ("invalidate",))
+            self._indexes.pop(user_id, None)
+
+
+# Shared instance used by the repository layer
+title_index = TitleIndex()
+registry.register_cache("title_index", lambda: (title_index.hits, title_index.misses))
@@ -2,10 +2,10 @@
 Pydantic schemas for request/response validation
 """
 
-from datetime import datetime
-from typing import List, Optional
+from datetime import date, datetime
+from typing import Annotated, Any, List, Literal, Optional
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, field_validator
 
 # ============================================================================
 # AUTHENTICATION SCHEMAS
@@ -76,14 +76,23 @@ class TokenResponse(BaseModel):
 # ============================================================================
 
 
+TagName = Annotated[str, Field(min_length=1, max_length=32)]
+
+
 class TaskCreate(BaseModel):
     """Schema for creating a new task"""
 
     title: str = Field(..., min_length=1, max_length=255, description="Task title")
+    tags: List[TagName] = Field(
+        default_factory=list, max_length=10, description="Category tags"
+    )
 
     model_config = {
         "json_schema_extra": {
-            "example": {"title": "Implement authentication API endpoints"}
+            "example": {
+                "title": "Implement authentication API endpoints",
+                "tags": ["backend"],
+            }
         }
     }
 
@@ -95,17 +104,45 @@ class TaskUpdate(BaseModel):
         None, min_length=1, max_length=255, description="Task title"
     )
     is_completed: Optional[bool] = Field(None, description="Completion status")
+    tags: Optional[List[TagName]] = Field(
+        None, max_length=10, description="Replacement set of category tags"
+    )
+    expected_version: Optional[int] = Field(
+        None, ge=1, description="Reject with 409 unless the task is at this version"
+    )
 
     model_config = {
         "json_schema_extra": {
             "example": {
                 "title": "Implement authentication API endpoints",
                 "is_completed": False,
+                "tags": ["backend"],
+                "expected_version": 3,
             }
         }
     }
 
 
+class TaskBatchUpdateItem(TaskUpdate):
+    """Schema for one compare-and-swap update in a batch"""
+
+    id: int = Field(..., description="Task ID")
+    expected_version: int = Field(..., ge=1, description="Version the client last saw")
+
+
+class TaskBatchUpdate(BaseModel):
+    """Schema for updating several tasks at once, all or nothing"""
+
+    updates: List[TaskBatchUpdateItem] = Field(..., min_length=1, max_length=500)
+
+    @field_validator("updates")
+    @classmethod
+    def _unique_ids(cls, updates):
+        if len({update.id for update in updates}) != len(updates):
+            raise ValueError("each task may appear only once per batch")
+        return updates
+
+
 class TaskResponse(BaseModel):
     """Schema for task response"""
 
@@ -114,6 +151,18 @@ class TaskResponse(BaseModel):
     title: str
     is_completed: bool
     created_at: datetime
+    updated_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    tags: List[str] = Field(default_factory=list)
+    due_at: Optional[datetime] = Field(None, description="Due time of an occurrence")
+    recurrence_id: Optional[int] = Field(None, description="Rule that created it")
+    version: int = Field(1, description="Incremented on every change")
+
+    @field_validator("tags", mode="before")
+    @classmethod
+    def _tag_names(cls, value):
+        # Accept Tag ORM objects as well as plain names
+        return [getattr(tag, "name", tag) for tag in value or []]
 
     model_config = {
         "from_attributes": True,
@@ -124,6 +173,9 @@ class TaskResponse(BaseModel):
                 "title": "Implement authentication API endpoints",
                 "is_completed": False,
                 "created_at": "2025-10-18T12:00:00",
+                "updated_at": "2025-10-18T12:00:00",
+                "completed_at": None,
+                "tags": ["backend"],
             }
         },
     }
@@ -138,6 +190,169 @@ class TaskListResponse(BaseModel):
     pending: int
 
 
+class SparseTaskResponse(BaseModel):
+    """Schema for a task in a sparse fieldset: only the requested fields"""
+
+    id: Optional[int] = None
+    user_id: Optional[int] = None
+    title: Optional[str] = None
+    is_completed: Optional[bool] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    tags: Optional[List[str]] = None
+    due_at: Optional[datetime] = None
+    recurrence_id: Optional[int] = None
+    version: Optional[int] = None
+
+
+class SparseTaskListResponse(BaseModel):
+    """Schema for a task list with ?fields= or ?include_stats=false"""
+
+    tasks: List[SparseTaskResponse]
+    total: Optional[int] = Field(None, description="Absent with include_stats=false")
+    completed: Optional[int] = Field(
+        None, description="Absent with include_stats=false"
+    )
+    pending: Optional[int] = Field(None, description="Absent with include_stats=false")
+
+
+class TaskBatchUpdateResponse(BaseModel):
+    """Schema for the tasks changed by a batch update, in request order"""
+
+    tasks: List[TaskResponse]
+
+
+class TaskSearchHit(TaskResponse):
+    """Schema for a task returned by full-text search"""
+
+    score: float = Field(..., description="BM25 relevance (lower is better)")
+    highlight: str = Field(..., description="Title with matches wrapped in [ ]")
+
+
+class ContextSearchMatch(BaseModel):
+    """Schema for matching lines in the user's goals or notes"""
+
+    field: str = Field(..., description="'goals' or 'notes'")
+    lines: List[str] = Field(default_factory=list, description="Matching lines")
+
+
+class TaskSearchResponse(BaseModel):
+    """Schema for a page of task search results"""
+
+    tasks: List[TaskSearchHit]
+    next_cursor: Optional[str] = Field(
+        None, description="Pass as cursor to fetch the next page"
+    )
+    context_matches: Optional[List[ContextSearchMatch]] = Field(
+        None, description="Matches in goals/notes (only with include_notes=true)"
+    )
+
+
+class TaskSyncResponse(BaseModel):
+    """Schema for task changes since a sync cursor"""
+
+    changed: List[TaskResponse] = Field(
+        default_factory=list, description="Tasks created or updated since cursor"
+    )
+    deleted: List[int] = Field(
+        default_factory=list, description="IDs of tasks deleted since cursor"
+    )
+    cursor: str = Field(..., description="Pass as since on the next sync")
+    full_resync: bool = Field(
+        False, description="True if changed is a full snapshot (replace local list)"
+    )
+
+
+class SyncMutation(BaseModel):
+    """Schema for one offline task mutation"""
+
+    op: Literal["create", "update", "delete"]
+    client_id: Optional[str] = Field(
+        None, description="Client-side identifier echoed back in the result"
+    )
+    task_id: Optional[int] = Field(None, description="Server task ID (update/delete)")
+    title: Optional[str] = Field(None, min_length=1, max_length=255)
+    is_completed: Optional[bool] = None
+    base_updated_at: Optional[datetime] = Field(
+        None,
+        description="updated_at the client last saw; newer server changes conflict",
+    )
+
+
+class SyncRequest(BaseModel):
+    """Schema for a batch of offline task mutations"""
+
+    mutations: List[SyncMutation] = Field(..., max_length=500)
+
+
+class SyncMutationResult(BaseModel):
+    """Schema for the outcome of one offline mutation"""
+
+    client_id: Optional[str] = None
+    task_id: Optional[int] = None
+    status: Literal["applied", "conflict", "error"]
+    detail: Optional[str] = None
+    task: Optional[TaskResponse] = Field(
+        None, description="Current server version of the task"
+    )
+
+
+class SyncPushResponse(BaseModel):
+    """Schema for the result of pushing offline mutations"""
+
+    results: List[SyncMutationResult]
+    applied: int
+    conflicts: int
+
+
+class TaskImportRow(BaseModel):
+    """Schema for one row of a task import (NDJSON object or CSV record)"""
+
+    title: str = Field(..., min_length=1, max_length=255)
+    is_completed: bool = False
+    created_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    tags: List[TagName] = Field(default_factory=list, max_length=10)
+
+    @field_validator("tags", mode="before")
+    @classmethod
+    def _split_tags(cls, value):
+        # CSV exports carry tags as one ';'-separated cell
+        if isinstance(value, str):
+            return [tag for tag in value.split(";") if tag.strip()]
+        return value
+
+
+class TaskImportError(BaseModel):
+    """Schema for a row that could not be imported"""
+
+    line: int = Field(..., description="1-based line number in the request body")
+    error: str
+
+
+class TaskImportResponse(BaseModel):
+    """Schema for the result of a bulk task import"""
+
+    imported: int
+    failed: int
+    errors: List[TaskImportError] = Field(
+        default_factory=list, description="First failed rows (see errors_truncated)"
+    )
+    errors_truncated: bool = False
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "imported": 1998,
+                "failed": 2,
+                "errors": [{"line": 17, "error": "title: Field required"}],
+                "errors_truncated": False,
+            }
+        }
+    }
+
+
 # ============================================================================
 # CONTEXT SCHEMAS (Goals and Notes)
 # ============================================================================
@@ -159,6 +374,29 @@ class ContextUpdate(BaseModel):
     }
 
 
+class ContextPatchOperation(BaseModel):
+    """
+    Schema for one JSON Patch (RFC 6902) operation on the user's context
+
+    The patched document is {"goals": [lines], "notes": [lines]}, so a single
+    edited line is addressed as e.g. /notes/12.
+    """
+
+    op: Literal["add", "remove", "replace", "move", "copy", "test"]
+    path: str = Field(..., description="JSON Pointer, e.g. /notes/3")
+    value: Optional[Any] = Field(None, description="Value for add/replace/test")
+    from_: Optional[str] = Field(
+        None, alias="from", description="Source pointer for move/copy"
+    )
+
+    model_config = {
+        "populate_by_name": True,
+        "json_schema_extra": {
+            "example": {"op": "replace", "path": "/notes/2", "value": "New line"}
+        },
+    }
+
+
 class ContextResponse(BaseModel):
     """Schema for context response"""
 
@@ -207,6 +445,9 @@ class AISuggestionResponse(BaseModel):
     query_context: Optional[str] = Field(
         None, description="User's goals and notes context sent to AI"
     )
+    source: Optional[str] = Field(
+        None, description="Where suggestions came from: 'ai' or 'local' templates"
+    )
 
     model_config = {
         "json_schema_extra": {
@@ -224,11 +465,193 @@ class AISuggestionResponse(BaseModel):
                 ],
                 "message": "Generated 2 context-aware task suggestions",
                 "query_context": "Goals: Learn FastAPI, build portfolio. Notes: Backend focus.",
+                "source": "ai",
+            }
+        }
+    }
+
+
+# ============================================================================
+# ANALYTICS SCHEMAS
+# ============================================================================
+
+
+class DailyCompletionPoint(BaseModel):
+    """Schema for the number of tasks completed on one day"""
+
+    date: date
+    completed: int
+
+
+class DailyCompletionsResponse(BaseModel):
+    """Schema for daily completion counts over a date range"""
+
+    from_date: date
+    to_date: date
+    days: List[DailyCompletionPoint] = Field(
+        default_factory=list, description="Days with at least one completion"
+    )
+    total_completed: int
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "from_date": "2025-01-01",
+                "to_date": "2025-12-31",
+                "days": [{"date": "2025-10-18", "completed": 3}],
+                "total_completed": 3,
+            }
+        }
+    }
+
+
+class CategoryCount(BaseModel):
+    """Schema for the number of tasks carrying one tag"""
+
+    name: str
+    total: int
+    completed: int
+
+
+class CategoryDistributionResponse(BaseModel):
+    """Schema for per-tag task counts"""
+
+    categories: List[CategoryCount] = Field(default_factory=list)
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "categories": [
+                    {"name": "backend", "total": 12, "completed": 7},
+                    {"name": "health", "total": 5, "completed": 5},
+                ]
             }
         }
     }
 
 
+class StreakResponse(BaseModel):
+    """Schema for the user's completion streak"""
+
+    current_streak: int = Field(..., description="Consecutive active days up to today")
+    longest_streak: int
+    last_active_day: Optional[date] = None
+    active_today: bool
+    timezone: str
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "current_streak": 4,
+                "longest_streak": 12,
+                "last_active_day": "2025-10-18",
+                "active_today": True,
+                "timezone": "Asia/Colombo",
+            }
+        }
+    }
+
+
+class TimezoneUpdate(BaseModel):
+    """Schema for setting the timezone streaks are counted in"""
+
+    timezone: str = Field(..., max_length=64, description="IANA timezone name")
+
+    model_config = {"json_schema_extra": {"example": {"timezone": "Asia/Colombo"}}}
+
+
+# ============================================================================
+# RECURRENCE SCHEMAS
+# ============================================================================
+
+
+class RecurrenceCreate(BaseModel):
+    """Schema for creating a recurring task"""
+
+    title: str = Field(..., min_length=1, max_length=255, description="Task title")
+    rule: str = Field(
+        ...,
+        max_length=200,
+        description="RRULE: FREQ=DAILY|WEEKLY|MONTHLY with INTERVAL, BYDAY, "
+        "BYMONTHDAY, COUNT or UNTIL",
+    )
+    starts_at: Optional[datetime] = Field(
+        None, description="First occurrence (default: now); its local time is kept"
+    )
+    tags: List[TagName] = Field(
+        default_factory=list, max_length=10, description="Tags for each occurrence"
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "title": "Daily standup",
+                "rule": "FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR",
+                "starts_at": "2025-10-20T09:30:00+05:30",
+                "tags": ["work"],
+            }
+        }
+    }
+
+
+class RecurrenceResponse(BaseModel):
+    """Schema for a recurring task rule"""
+
+    id: int
+    title: str
+    rule: str
+    tags: List[str] = Field(default_factory=list)
+    starts_at: datetime
+    next_due_at: Optional[datetime] = Field(
+        None, description="When the next occurrence is created; null once ended"
+    )
+    occurrence_count: int
+    current_task_id: Optional[int] = Field(None, description="Latest occurrence")
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class RecurrenceListResponse(BaseModel):
+    """Schema for the user's recurring task rules"""
+
+    rules: List[RecurrenceResponse]
+
+
+# ============================================================================
+# DASHBOARD SCHEMAS
+# ============================================================================
+
+
+class TaskStatsSummary(BaseModel):
+    """Schema for task totals shown on the dashboard"""
+
+    total: int
+    completed: int
+    pending: int
+    completion_rate: float = Field(..., description="Percent of tasks completed")
+
+
+class ContextSummary(BaseModel):
+    """Schema for a shortened view of the user's goals and notes"""
+
+    goals: str = Field("", description="Goals, truncated for display")
+    notes: str = Field("", description="Notes, truncated for display")
+    truncated: bool = Field(False, description="Whether either field was shortened")
+    context_version: int
+
+
+class DashboardResponse(BaseModel):
+    """Schema for everything the dashboard screen needs in one response"""
+
+    pending_tasks: List[TaskResponse] = Field(
+        default_factory=list, description="Newest pending tasks, up to the limit"
+    )
+    stats: TaskStatsSummary
+    streak: StreakResponse
+    context: ContextSummary
+
+
 # ============================================================================
 # ERROR SCHEMAS
 # ============================================================================
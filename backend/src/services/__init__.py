@@ -12,6 +12,7 @@ from .auth_service import (
     verify_password,
 )
 from .langchain_service import langchain_service
+from .local_suggestion_service import local_suggestion_service
 
 __all__ = [
     "hash_password",
@@ -24,4 +25,5 @@ __all__ = [
     "create_token_response",
     "get_current_user",
     "langchain_service",
+    "local_suggestion_service",
 ]
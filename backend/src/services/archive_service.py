@@ -0,0 +1,67 @@
+"""
+Task archiving - Moves old completed tasks out of the live tasks table
+
+Runs as a background loop started with the app. Each pass archives in small
+batches (one short transaction each) with a pause in between, so user writes
+are never blocked behind a long archive transaction.
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from src.repository.database import SessionLocal
+from src.repository.repositories import TaskRepository
+
+logger = logging.getLogger(__name__)
+
+# Completed tasks older than this are archived; 0 disables archiving
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "90"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+ARCHIVE_INTERVAL_SECONDS = int(os.getenv("ARCHIVE_INTERVAL_SECONDS", "3600"))
+# Gives waiting user writes the SQLite write lock between batches
+ARCHIVE_BATCH_PAUSE_SECONDS = float(os.getenv("ARCHIVE_BATCH_PAUSE_SECONDS", "0.05"))
+
+
+def archive_cutoff(now: Optional[datetime] = None) -> datetime:
+    """Tasks completed before this moment are due for archiving"""
+    return (now or datetime.now(timezone.utc)) - timedelta(days=ARCHIVE_AFTER_DAYS)
+
+
+def archive_batch(completed_before: datetime) -> int:
+    """Archive one batch in its own session; returns the number of tasks moved"""
+    db = SessionLocal()
+    try:
+        return TaskRepository.archive_completed_tasks(
+            db, completed_before, ARCHIVE_BATCH_SIZE
+        )
+    finally:
+        db.close()
+
+
+async def archive_old_tasks() -> int:
+    """Archive every due task, batch by batch; returns the total moved"""
+    cutoff = archive_cutoff()
+    total = 0
+    while True:
+        moved = await run_in_threadpool(archive_batch, cutoff)
+        total += moved
+        if moved < ARCHIVE_BATCH_SIZE:
+            return total
+        await asyncio.sleep(ARCHIVE_BATCH_PAUSE_SECONDS)
+
+
+async def run_archiver():
+    """Archive due tasks now and then every ARCHIVE_INTERVAL_SECONDS"""
+    while True:
+        try:
+            total = await archive_old_tasks()
+            if total:
+                logger.info(f"Archived {total} tasks completed before the cutoff")
+        except Exception as e:
+            logger.error(f"Task archiver pass failed: {str(e)}")
+        await asyncio.sleep(ARCHIVE_INTERVAL_SECONDS)
@@ -0,0 +1,145 @@
+"""
+Task export encoding - Streams task rows as NDJSON or CSV
+
+Rows arrive in batches from TaskRepository.iter_export_batches() and are
+encoded (and optionally compressed) one batch at a time, so memory use does
+not depend on how many tasks are exported.
+"""
+
+import csv
+import io
+import logging
+import zlib
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+import orjson
+import zstandard
+
+from src.repository.database import TAG_NAMES_SEPARATOR
+
+logger = logging.getLogger(__name__)
+
+EXPORT_COLUMNS = [
+    "id",
+    "title",
+    "is_completed",
+    "created_at",
+    "updated_at",
+    "completed_at",
+    "tags",
+]
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+COMPRESSED_MEDIA_TYPES = {"gzip": "application/gzip", "zstd": "application/zstd"}
+FILE_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+
+def _tags(value: Optional[str]) -> List[str]:
+    return sorted(value.split(TAG_NAMES_SEPARATOR)) if value else []
+
+
+# ============================================================================
+# ENCODERS
+# ============================================================================
+
+
+def encode_ndjson(batches: Iterable[Sequence]) -> Iterator[bytes]:
+    """Encode row batches as newline-delimited JSON, one chunk per batch"""
+    for rows in batches:
+        yield b"".join(
+            orjson.dumps(
+                {
+                    "id": row.id,
+                    "title": row.title,
+                    "is_completed": row.is_completed,
+                    "created_at": row.created_at,
+                    "updated_at": row.updated_at,
+                    "completed_at": row.completed_at,
+                    "tags": _tags(row.tags),
+                },
+                option=orjson.OPT_APPEND_NEWLINE,
+            )
+            for row in rows
+        )
+
+
+def encode_csv(batches: Iterable[Sequence]) -> Iterator[bytes]:
+    """Encode row batches as CSV with a header row; tags are ';'-separated"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for rows in batches:
+        writer.writerows(
+            (
+                row.id,
+                row.title,
+                int(row.is_completed),
+                row.created_at.isoformat() if row.created_at else "",
+                row.updated_at.isoformat() if row.updated_at else "",
+                row.completed_at.isoformat() if row.completed_at else "",
+                ";".join(_tags(row.tags)),
+            )
+            for row in rows
+        )
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only, for users without tasks
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+ENCODERS = {"ndjson": encode_ndjson, "csv": encode_csv}
+
+
+# ============================================================================
+# COMPRESSION
+# ============================================================================
+
+
+def compress_chunks(
+    chunks: Iterable[bytes], compression: Optional[str]
+) -> Iterator[bytes]:
+    """
+    Compress a byte stream on the fly
+
+    Args:
+        chunks: Encoded export chunks
+        compression: "gzip", "zstd" or None to pass chunks through
+
+    Returns:
+        Iterator over compressed chunks (empty chunks are skipped)
+    """
+    if compression is None:
+        yield from chunks
+        return
+
+    if compression == "gzip":
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    else:
+        compressor = zstandard.ZstdCompressor(level=3).compressobj()
+
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_stream(
+    batches: Iterable[Sequence], format: str, compression: Optional[str] = None
+) -> Iterator[bytes]:
+    """Encode and optionally compress row batches for a streaming response"""
+    return compress_chunks(ENCODERS[format](batches), compression)
+
+
+def export_filename(format: str, compression: Optional[str] = None) -> str:
+    """Download file name for an export"""
+    return f"tasks.{format}{FILE_SUFFIXES.get(compression, '')}"
+
+
+def export_media_type(format: str, compression: Optional[str] = None) -> str:
+    """Content type for an export"""
+    if compression:
+        return COMPRESSED_MEDIA_TYPES[compression]
+    return MEDIA_TYPES[format]
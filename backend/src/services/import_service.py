@@ -0,0 +1,212 @@
+"""
+Task import - Parses NDJSON/CSV request bodies incrementally
+
+The body is decoded chunk by chunk as it arrives, rows are validated one at
+a time and valid rows are handed to the repository in fixed-size chunks,
+all inside one transaction. Memory use is bounded by the chunk size, not by
+the size of the upload.
+"""
+
+import codecs
+import csv
+import logging
+import os
+from typing import AsyncIterable, AsyncIterator, List, Optional, Tuple
+
+import orjson
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from src.repository.database import User
+from src.repository.repositories import TaskRepository
+from src.schemas import TaskImportError, TaskImportResponse, TaskImportRow
+
+logger = logging.getLogger(__name__)
+
+# Rows inserted per executemany batch
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "1000"))
+# Maximum rows accepted by a single import request
+IMPORT_MAX_ROWS = int(os.getenv("IMPORT_MAX_ROWS", "100000"))
+# Maximum size of one line (or one multi-line CSV record), in characters
+IMPORT_MAX_LINE_CHARS = 64 * 1024
+# Row errors reported back in the response (all of them are counted)
+IMPORT_MAX_ERRORS = 100
+
+Record = Tuple[int, Optional[dict], Optional[str]]
+
+
+class ImportFormatError(ValueError):
+    """The body cannot be parsed as a whole (bad header, oversized line)"""
+
+
+class ImportLimitError(ValueError):
+    """The body contains more rows than IMPORT_MAX_ROWS"""
+
+
+# ============================================================================
+# PARSING
+# ============================================================================
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[Tuple[int, str]]:
+    """Split a UTF-8 byte stream into (line_number, line) pairs"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    line_no = 0
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            line_no += 1
+            yield line_no, line.rstrip("\r")
+        if len(pending) > IMPORT_MAX_LINE_CHARS:
+            raise ImportFormatError(f"Line {line_no + 1} is too long")
+
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield line_no + 1, pending.rstrip("\r")
+
+
+async def iter_ndjson_records(chunks: AsyncIterable[bytes]) -> AsyncIterator[Record]:
+    """Yield (line, object, error) for each non-blank NDJSON line"""
+    async for line_no, line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        try:
+            value = orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            yield line_no, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(value, dict):
+            yield line_no, None, "Expected a JSON object"
+            continue
+        yield line_no, value, None
+
+
+async def iter_csv_records(chunks: AsyncIterable[bytes]) -> AsyncIterator[Record]:
+    """
+    Yield (line, record, error) for each CSV record after the header
+
+    Quoted fields may span lines: a record is complete once it contains an
+    even number of quote characters. Empty cells are omitted from the record.
+    """
+    header: Optional[List[str]] = None
+    record_lines: List[str] = []
+    quotes = start = 0
+
+    async for line_no, line in iter_lines(chunks):
+        if not record_lines:
+            start = line_no
+        record_lines.append(line)
+        quotes += line.count('"')
+        if quotes % 2:
+            if sum(map(len, record_lines)) > IMPORT_MAX_LINE_CHARS:
+                raise ImportFormatError(f"Record at line {start} is too long")
+            continue
+
+        record = "\n".join(record_lines)
+        record_lines, quotes = [], 0
+        if not record.strip():
+            continue
+        fields = next(csv.reader([record]))
+
+        if header is None:
+            header = [name.strip().lower() for name in fields]
+            if "title" not in header:
+                raise ImportFormatError("CSV header must include a 'title' column")
+            continue
+        if len(fields) != len(header):
+            yield start, None, f"Expected {len(header)} fields, got {len(fields)}"
+            continue
+        yield start, {k: v for k, v in zip(header, fields) if v != ""}, None
+
+    if record_lines:
+        yield start, None, "Unterminated quoted field"
+
+
+PARSERS = {"ndjson": iter_ndjson_records, "csv": iter_csv_records}
+
+
+def validate_record(record: dict) -> Tuple[Optional[TaskImportRow], Optional[str]]:
+    """Validate one parsed record, returning (row, None) or (None, error)"""
+    if record.get("tags") is None:
+        record.pop("tags", None)
+    try:
+        return TaskImportRow.model_validate(record), None
+    except ValidationError as e:
+        error = e.errors()[0]
+        location = ".".join(str(part) for part in error["loc"])
+        return None, f"{location}: {error['msg']}" if location else error["msg"]
+
+
+# ============================================================================
+# IMPORT
+# ============================================================================
+
+
+async def import_tasks(
+    db: Session, user: User, chunks: AsyncIterable[bytes], format: str
+) -> Optional[TaskImportResponse]:
+    """
+    Import tasks from a streamed request body in one transaction
+
+    Invalid rows are skipped and reported; valid rows are committed together.
+
+    Args:
+        db: Database session
+        user: Owner of the imported tasks
+        chunks: Request body stream
+        format: "ndjson" or "csv"
+
+    Returns:
+        Import summary, or None if the database write failed
+
+    Raises:
+        ImportFormatError: If the body cannot be parsed (nothing is imported)
+        ImportLimitError: If the body has more than IMPORT_MAX_ROWS rows
+    """
+    imported = failed = 0
+    errors: List[TaskImportError] = []
+    chunk: List[TaskImportRow] = []
+    completed = False
+
+    try:
+        async for line_no, record, error in PARSERS[format](chunks):
+            row = None
+            if error is None:
+                row, error = validate_record(record)
+            if error is not None:
+                failed += 1
+                if len(errors) < IMPORT_MAX_ERRORS:
+                    errors.append(TaskImportError(line=line_no, error=error))
+                continue
+
+            if imported + len(chunk) >= IMPORT_MAX_ROWS:
+                raise ImportLimitError(
+                    f"Imports are limited to {IMPORT_MAX_ROWS} rows per request"
+                )
+            chunk.append(row)
+            completed = completed or row.is_completed
+            if len(chunk) >= IMPORT_CHUNK_SIZE:
+                if not TaskRepository.import_task_chunk(db, user, chunk):
+                    return None
+                imported += len(chunk)
+                chunk = []
+    except ValueError:
+        db.rollback()
+        raise
+
+    if chunk:
+        if not TaskRepository.import_task_chunk(db, user, chunk):
+            return None
+        imported += len(chunk)
+    if not TaskRepository.finish_import(db, user.id, completed):
+        return None
+
+    logger.info(f"Imported {imported} tasks for user {user.id} ({failed} failed)")
+    return TaskImportResponse(
+        imported=imported,
+        failed=failed,
+        errors=errors,
+        errors_truncated=failed > len(errors),
+    )
@@ -7,7 +7,8 @@ import json
 import logging
 import os
 import re
-from typing import List
+from time import perf_counter
+from typing import Any, List
 
 from dotenv import load_dotenv
 from langchain_core.output_parsers import JsonOutputParser
@@ -17,8 +18,10 @@ from langchain_core.prompts import PromptTemplate
 from langchain_google_genai import ChatGoogleGenerativeAI
 from sqlalchemy.orm import Session
 
+from src.metrics import registry
 from src.repository.repositories import UserRepository
 from src.schemas import AISuggestionResponse, SuggestedTask
+from src.services.local_suggestion_service import local_suggestion_service
 
 logger = logging.getLogger(__name__)
 
@@ -27,10 +30,21 @@ load_dotenv()
 
 # Initialize Gemini LLM
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+AI_TIMEOUT_SECONDS = float(os.getenv("AI_TIMEOUT_SECONDS", "30"))
 
 if not GOOGLE_API_KEY:
     logger.warning("GOOGLE_API_KEY not set in environment variables")
 
+LLM_REQUEST_SECONDS = registry.histogram(
+    "llm_request_duration_seconds",
+    "Latency of LLM calls",
+    ("model", "outcome"),
+    buckets=(0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0),
+)
+LLM_TOKENS = registry.counter(
+    "llm_tokens_total", "Tokens used by LLM calls", ("model", "kind")
+)
+
 
 # ============================================================================
 # PROMPT TEMPLATES
@@ -86,13 +100,34 @@ class LangChainService:
                     api_key=GOOGLE_API_KEY,
                     temperature=self.temperature,
                     max_output_tokens=1024,
-                    timeout=30,
+                    timeout=AI_TIMEOUT_SECONDS,
                 )
                 logger.info(f"LangChain initialized with {self.model_name}")
             except Exception as e:
                 logger.error(f"Error initializing LangChain: {str(e)}")
                 self.llm = None
 
+    def _invoke(self, runnable, payload) -> Any:
+        """Call the LLM (or a chain ending in it), recording latency and tokens"""
+        started = perf_counter()
+        try:
+            response = runnable.invoke(payload)
+        except Exception:
+            LLM_REQUEST_SECONDS.observe(
+                (self.model_name, "error"), perf_counter() - started
+            )
+            raise
+        LLM_REQUEST_SECONDS.observe(
+            (self.model_name, "success"), perf_counter() - started
+        )
+
+        usage = getattr(response, "usage_metadata", None) or {}
+        for kind in ("input", "output"):
+            tokens = usage.get(f"{kind}_tokens")
+            if tokens:
+                LLM_TOKENS.inc((self.model_name, kind), tokens)
+        return response
+
     def _parse_ai_response(self, response_text: str) -> List[SuggestedTask]:
         """
         Parse AI response into structured task suggestions
@@ -179,12 +214,40 @@ class LangChainService:
 
         return suggestions
 
+    def _local_fallback(
+        self, db: Session, user_id: int, query: str, failure: AISuggestionResponse
+    ) -> AISuggestionResponse:
+        """
+        Answer from the local template engine when the LLM cannot be used
+
+        Args:
+            db: Database session
+            user_id: ID of the user
+            query: Natural language query from user
+            failure: Response to return if the local engine has nothing either
+
+        Returns:
+            Local suggestions, or the original failure response
+        """
+        fallback = local_suggestion_service.generate_suggestions(db, user_id, query)
+        if not fallback.suggestions:
+            return failure
+
+        fallback.message = (
+            f"AI service is unavailable, showing {len(fallback.suggestions)} "
+            "suggestions from task templates"
+        )
+        return fallback
+
     def generate_suggestions(
         self, db: Session, user_id: int, query: str
     ) -> AISuggestionResponse:
         """
         Generate AI task suggestions based on user context and query
 
+        Falls back to the local template engine if the LLM is not configured
+        or the call fails (for example on timeout).
+
         Args:
             db: Database session
             user_id: ID of the user
@@ -196,11 +259,16 @@ class LangChainService:
         # Check if LLM is initialized
         if not self.llm:
             logger.error("LangChain LLM not initialized")
-            return AISuggestionResponse(
-                success=False,
-                suggestions=[],
-                message="AI service is not available. Please check API configuration.",
-                query_context=None,
+            return self._local_fallback(
+                db,
+                user_id,
+                query,
+                AISuggestionResponse(
+                    success=False,
+                    suggestions=[],
+                    message="AI service is not available. Please check API configuration.",
+                    query_context=None,
+                ),
             )
 
         try:
@@ -237,12 +305,13 @@ class LangChainService:
 
             # Generate suggestions
             logger.info(f"Generating suggestions for user {user_id}")
-            response = chain.invoke(
+            response = self._invoke(
+                chain,
                 {
                     "goals": goals or "No goals set",
                     "notes": notes or "No notes available",
                     "query": query,
-                }
+                },
             )
 
             # Extract text from response
@@ -268,6 +337,7 @@ class LangChainService:
                     suggestions=[],
                     message="Unable to generate suggestions from AI response. Please try rephrasing your query.",
                     query_context=query_context,
+                    source="ai",
                 )
 
             return AISuggestionResponse(
@@ -275,15 +345,21 @@ class LangChainService:
                 suggestions=suggestions,
                 message=f"Generated {len(suggestions)} task suggestions based on your context",
                 query_context=query_context,
+                source="ai",
             )
 
         except Exception as e:
             logger.error(f"Error generating suggestions: {str(e)}")
-            return AISuggestionResponse(
-                success=False,
-                suggestions=[],
-                message=f"Error generating suggestions: {str(e)}",
-                query_context=None,
+            return self._local_fallback(
+                db,
+                user_id,
+                query,
+                AISuggestionResponse(
+                    success=False,
+                    suggestions=[],
+                    message=f"Error generating suggestions: {str(e)}",
+                    query_context=None,
+                ),
             )
 
     def validate_connection(self) -> bool:
@@ -299,7 +375,7 @@ class LangChainService:
         try:
             # Send a simple test prompt
             test_prompt = "Say 'OK' in one word."
-            _ = self.llm.invoke(test_prompt)
+            _ = self._invoke(self.llm, test_prompt)
             logger.info("LangChain connection validated")
             return True
         except Exception as e:
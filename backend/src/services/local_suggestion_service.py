@@ -0,0 +1,425 @@
+"""
+Local, LLM-free task suggestion engine
+Scores a library of task templates against the user's goals, notes and query
+with TF-IDF keyword matching. Used as a degraded-mode fallback when Gemini is
+unavailable and as an instant first response while the LLM result is pending.
+"""
+
+import logging
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from src.repository.repositories import UserRepository
+from src.schemas import AISuggestionResponse, SuggestedTask
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# TEMPLATE LIBRARY
+# ============================================================================
+
+# Each template has a title, a reason and extra keywords describing when it applies.
+# Extend at runtime with LocalSuggestionService.register_templates().
+DEFAULT_TASK_TEMPLATES: List[Dict[str, str]] = [
+    {
+        "title": "Break your main goal into weekly milestones",
+        "reason": "Concrete milestones make a large goal easier to track",
+        "keywords": "goal plan roadmap milestone project objective long term",
+    },
+    {
+        "title": "Schedule a 25-minute focus session for your top priority",
+        "reason": "Short, distraction-free blocks build momentum",
+        "keywords": "focus productivity priority pomodoro time deep work distraction",
+    },
+    {
+        "title": "Review and prioritize today's task list",
+        "reason": "A quick review keeps effort on what matters most",
+        "keywords": "today daily priority organize list review plan productivity",
+    },
+    {
+        "title": "Write a short weekly reflection",
+        "reason": "Reflection highlights what worked and what to change",
+        "keywords": "reflect review week journal progress improve habit",
+    },
+    {
+        "title": "Complete one tutorial chapter and take notes",
+        "reason": "Steady, structured study compounds over time",
+        "keywords": "learn study course tutorial chapter skill education read",
+    },
+    {
+        "title": "Build a small practice project with the new technology",
+        "reason": "Hands-on practice turns reading into real skill",
+        "keywords": "learn build practice project code technology framework skill",
+    },
+    {
+        "title": "Read the official documentation for one core concept",
+        "reason": "Primary sources give the most accurate understanding",
+        "keywords": "documentation docs learn read api framework library concept",
+    },
+    {
+        "title": "Write unit tests for an untested module",
+        "reason": "Tests protect existing work and speed up future changes",
+        "keywords": "test testing code quality bug backend frontend module coverage",
+    },
+    {
+        "title": "Refactor one function that is hard to read",
+        "reason": "Small refactors keep a codebase maintainable",
+        "keywords": "refactor code quality clean maintain readable technical debt",
+    },
+    {
+        "title": "Write or update the project README",
+        "reason": "Good documentation makes a project easy to understand and share",
+        "keywords": "documentation readme project portfolio write docs github",
+    },
+    {
+        "title": "Deploy the current version of your project",
+        "reason": "Shipping early exposes real problems and shows progress",
+        "keywords": "deploy release ship production project server hosting launch",
+    },
+    {
+        "title": "Add a finished project to your portfolio",
+        "reason": "A visible portfolio demonstrates your skills to others",
+        "keywords": "portfolio project showcase github resume job career website",
+    },
+    {
+        "title": "Fix the highest-priority open bug",
+        "reason": "Resolving blockers first keeps the project moving",
+        "keywords": "bug fix issue error debug backend frontend app",
+    },
+    {
+        "title": "Design the API endpoints for the next feature",
+        "reason": "A clear interface up front avoids rework later",
+        "keywords": "api design backend endpoint feature fastapi rest server",
+    },
+    {
+        "title": "Sketch the screens for the next app feature",
+        "reason": "Quick sketches clarify the user experience before coding",
+        "keywords": "design ui ux mobile app screen frontend react native feature",
+    },
+    {
+        "title": "Contribute a small fix to an open-source project",
+        "reason": "Open-source contributions build skills and visibility",
+        "keywords": "open source contribute github community pull request",
+    },
+    {
+        "title": "Update your resume with recent achievements",
+        "reason": "An up-to-date resume is ready when opportunities appear",
+        "keywords": "resume cv career job achievement experience update",
+    },
+    {
+        "title": "Apply to two roles that match your goals",
+        "reason": "Consistent applications keep the job search moving",
+        "keywords": "job apply application career hiring role position search",
+    },
+    {
+        "title": "Reach out to one person in your professional network",
+        "reason": "Regular networking opens doors to new opportunities",
+        "keywords": "network networking career linkedin connect mentor contact",
+    },
+    {
+        "title": "Practice one interview question out loud",
+        "reason": "Rehearsal builds confidence for real interviews",
+        "keywords": "interview practice job career question preparation",
+    },
+    {
+        "title": "Go for a 30-minute walk",
+        "reason": "Light exercise improves energy and focus",
+        "keywords": "health exercise fitness walk energy wellbeing outdoor",
+    },
+    {
+        "title": "Complete a 20-minute workout",
+        "reason": "Regular workouts support long-term health goals",
+        "keywords": "fitness workout exercise gym health strength training run",
+    },
+    {
+        "title": "Plan healthy meals for the week",
+        "reason": "Meal planning saves time and supports better habits",
+        "keywords": "health diet meal food nutrition cook plan weight",
+    },
+    {
+        "title": "Set a consistent bedtime for tonight",
+        "reason": "Good sleep underpins focus and productivity",
+        "keywords": "sleep rest health energy habit routine bedtime",
+    },
+    {
+        "title": "Meditate for 10 minutes",
+        "reason": "A short mindfulness break reduces stress",
+        "keywords": "meditate mindfulness stress calm mental health wellbeing",
+    },
+    {
+        "title": "Review your monthly budget",
+        "reason": "Tracking spending keeps financial goals on course",
+        "keywords": "budget finance money spending save expense track",
+    },
+    {
+        "title": "Set up an automatic transfer to savings",
+        "reason": "Automation makes saving effortless and consistent",
+        "keywords": "save saving finance money invest emergency fund",
+    },
+    {
+        "title": "Read 20 pages of a book",
+        "reason": "Daily reading steadily builds knowledge",
+        "keywords": "read reading book learn knowledge habit",
+    },
+    {
+        "title": "Write a draft blog post about something you learned",
+        "reason": "Writing clarifies thinking and shares your knowledge",
+        "keywords": "write writing blog article post content share learn",
+    },
+    {
+        "title": "Practice a language for 15 minutes",
+        "reason": "Short daily practice is the fastest way to progress",
+        "keywords": "language learn practice speak vocabulary spanish french",
+    },
+    {
+        "title": "Clear your inbox and archive old messages",
+        "reason": "An empty inbox reduces mental clutter",
+        "keywords": "email inbox organize clean message communication admin",
+    },
+    {
+        "title": "Declutter and organize your workspace",
+        "reason": "A tidy workspace makes it easier to focus",
+        "keywords": "organize clean workspace desk clutter environment focus",
+    },
+    {
+        "title": "Block time on your calendar for deep work",
+        "reason": "Protected time prevents important work from being crowded out",
+        "keywords": "calendar schedule time block deep work focus plan",
+    },
+    {
+        "title": "Identify and eliminate one recurring distraction",
+        "reason": "Removing distractions frees attention for your goals",
+        "keywords": "distraction focus productivity phone social media habit",
+    },
+    {
+        "title": "Start a daily habit tracker",
+        "reason": "Tracking habits makes consistency visible",
+        "keywords": "habit track routine daily consistency streak",
+    },
+    {
+        "title": "Prepare an agenda for your next meeting",
+        "reason": "A clear agenda keeps meetings short and productive",
+        "keywords": "meeting agenda team work communication prepare",
+    },
+    {
+        "title": "Send a progress update to your team or mentor",
+        "reason": "Sharing progress builds accountability",
+        "keywords": "team update progress mentor communication accountability report",
+    },
+    {
+        "title": "Experiment with a prompt for an AI-powered feature",
+        "reason": "Iterating on prompts is the core of building with LLMs",
+        "keywords": "ai llm langchain gemini prompt machine learning model",
+    },
+    {
+        "title": "Set up a database schema for your project",
+        "reason": "A solid data model simplifies every later feature",
+        "keywords": "database schema sql sqlite postgres data model backend",
+    },
+    {
+        "title": "Write end-to-end tests for the main user flow",
+        "reason": "End-to-end coverage catches regressions users would notice",
+        "keywords": "test e2e mobile app frontend flow quality",
+    },
+]
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = frozenset("""
+    a about above after again all am an and any are as at be because been before
+    being below between both but by can could did do does doing down during each
+    few for from further had has have having he her here hers him his how i if in
+    into is it its itself just me more most my myself no nor not now of off on
+    once only or other our ours out over own same she should so some such than
+    that the their theirs them then there these they this those through to too
+    under until up very was we were what when where which while who whom why will
+    with would you your yours want need like get make also task tasks suggest
+    """.split())
+
+
+def _stem(token: str) -> str:
+    """Very small suffix stripper so 'learning' and 'learn' share a term"""
+    for suffix in ("ing", "ed", "es", "s"):
+        if len(token) > len(suffix) + 2 and token.endswith(suffix):
+            return token[: -len(suffix)]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, split, drop stopwords and stem"""
+    return [
+        _stem(token)
+        for token in _TOKEN_PATTERN.findall(text.lower())
+        if token not in _STOPWORDS and len(token) > 1
+    ]
+
+
+# ============================================================================
+# LOCAL SUGGESTION SERVICE
+# ============================================================================
+
+
+class LocalSuggestionService:
+    """TF-IDF matcher over an extensible library of task templates"""
+
+    def __init__(self, templates: Optional[Iterable[Dict[str, str]]] = None):
+        self.max_suggestions = 5
+        self._lock = threading.Lock()
+        self._templates: List[Dict[str, str]] = []
+        self._postings: Dict[str, List[Tuple[int, float]]] = {}
+        self._idf: Dict[str, float] = {}
+        self.register_templates(
+            DEFAULT_TASK_TEMPLATES if templates is None else templates
+        )
+
+    @property
+    def template_count(self) -> int:
+        return len(self._templates)
+
+    def register_templates(self, templates: Iterable[Dict[str, str]]):
+        """
+        Add templates to the library and rebuild the index
+
+        Args:
+            templates: Dicts with "title" and optional "reason" and "keywords"
+        """
+        with self._lock:
+            for template in templates:
+                if not template.get("title"):
+                    continue
+                self._templates.append(
+                    {
+                        "title": template["title"],
+                        "reason": template.get("reason") or "",
+                        "keywords": template.get("keywords") or "",
+                    }
+                )
+            self._build_index()
+
+    def _build_index(self):
+        """Build normalized TF-IDF vectors as an inverted index of postings"""
+        term_counts = [
+            Counter(tokenize(f"{t['title']} {t['keywords']} {t['keywords']}"))
+            for t in self._templates
+        ]
+        document_frequency = Counter(
+            term for counts in term_counts for term in counts.keys()
+        )
+        total = len(self._templates)
+        self._idf = {
+            term: math.log((1 + total) / (1 + df)) + 1.0
+            for term, df in document_frequency.items()
+        }
+
+        postings: Dict[str, List[Tuple[int, float]]] = {}
+        for doc_id, counts in enumerate(term_counts):
+            weights = {
+                term: (1.0 + math.log(count)) * self._idf[term]
+                for term, count in counts.items()
+            }
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            for term, weight in weights.items():
+                postings.setdefault(term, []).append((doc_id, weight / norm))
+        self._postings = postings
+
+    def rank(self, text: str, limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        Rank templates by cosine similarity to the given text
+
+        Returns:
+            List of (template_index, score) sorted by descending score
+        """
+        counts = Counter(term for term in tokenize(text) if term in self._idf)
+        if not counts:
+            return []
+
+        query_weights = {
+            term: (1.0 + math.log(count)) * self._idf[term]
+            for term, count in counts.items()
+        }
+        norm = math.sqrt(sum(w * w for w in query_weights.values()))
+
+        scores: Dict[int, float] = {}
+        for term, query_weight in query_weights.items():
+            for doc_id, doc_weight in self._postings[term]:
+                scores[doc_id] = scores.get(doc_id, 0.0) + query_weight * doc_weight
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return [(doc_id, score / norm) for doc_id, score in ranked[: limit or None]]
+
+    def suggest(
+        self, goals: str, notes: str, query: str, limit: Optional[int] = None
+    ) -> List[SuggestedTask]:
+        """
+        Suggest tasks from the template library
+
+        The query is weighted above goals, and goals above notes.
+
+        Args:
+            goals: User's goals text
+            notes: User's notes text
+            query: Natural language query
+
+        Returns:
+            List of SuggestedTask objects (possibly empty)
+        """
+        text = f"{query} {query} {goals} {goals} {notes}"
+        ranked = self.rank(text, limit or self.max_suggestions)
+        return [
+            SuggestedTask(
+                title=self._templates[doc_id]["title"],
+                reason=self._templates[doc_id]["reason"],
+            )
+            for doc_id, _ in ranked
+        ]
+
+    def generate_suggestions(
+        self, db: Session, user_id: int, query: str
+    ) -> AISuggestionResponse:
+        """
+        Generate suggestions for a user without calling the LLM
+
+        Args:
+            db: Database session
+            user_id: ID of the user
+            query: Natural language query from user
+
+        Returns:
+            AISuggestionResponse with source="local"
+        """
+        context = UserRepository.get_user_context(db, user_id)
+        if not context:
+            return AISuggestionResponse(
+                success=False,
+                suggestions=[],
+                message="User not found",
+                query_context=None,
+                source="local",
+            )
+
+        goals, notes = context
+        suggestions = self.suggest(goals, notes, query)
+        logger.info(
+            f"Local engine produced {len(suggestions)} suggestions for user {user_id}"
+        )
+        return AISuggestionResponse(
+            success=True,
+            suggestions=suggestions,
+            message=f"Generated {len(suggestions)} quick suggestions from task templates",
+            query_context=f"Goals: {goals or 'None set'} | Notes: {notes or 'None set'}",
+            source="local",
+        )
+
+
+# ============================================================================
+# SERVICE INITIALIZATION
+# ============================================================================
+
+# Initialize service (singleton pattern)
+local_suggestion_service = LocalSuggestionService()
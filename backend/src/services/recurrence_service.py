@@ -0,0 +1,52 @@
+"""
+Recurring task scheduler - Creates occurrences as they fall due
+
+Runs as a background loop started with the app. Each pass asks the
+next_due_at index for due rules and creates their occurrences in batches;
+when nothing is due a pass is a single index probe.
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime, timezone
+
+from starlette.concurrency import run_in_threadpool
+
+from src.repository.database import SessionLocal
+from src.repository.repositories import RecurrenceRepository
+
+logger = logging.getLogger(__name__)
+
+RECURRENCE_SWEEP_SECONDS = int(os.getenv("RECURRENCE_SWEEP_SECONDS", "60"))
+RECURRENCE_BATCH_SIZE = int(os.getenv("RECURRENCE_BATCH_SIZE", "500"))
+
+
+def materialize_batch(now: datetime) -> int:
+    """Create one batch of due occurrences in its own session"""
+    db = SessionLocal()
+    try:
+        return RecurrenceRepository.materialize_due(db, now, RECURRENCE_BATCH_SIZE)
+    finally:
+        db.close()
+
+
+async def materialize_due_occurrences() -> int:
+    """Create every occurrence that is due now; returns how many were created"""
+    now = datetime.now(timezone.utc)
+    total = 0
+    while True:
+        created = await run_in_threadpool(materialize_batch, now)
+        total += created
+        if created < RECURRENCE_BATCH_SIZE:
+            return total
+
+
+async def run_recurrence_scheduler():
+    """Create due occurrences now and then every RECURRENCE_SWEEP_SECONDS"""
+    while True:
+        try:
+            await materialize_due_occurrences()
+        except Exception as e:
+            logger.error(f"Recurring task sweep failed: {str(e)}")
+        await asyncio.sleep(RECURRENCE_SWEEP_SECONDS)
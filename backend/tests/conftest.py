@@ -0,0 +1,109 @@
+"""Shared fixtures: a throwaway SQLite database and per-test users"""
+
+import asyncio
+import os
+import tempfile
+import uuid
+
+# Configure before the application modules read the environment
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+os.environ.setdefault("GOOGLE_API_KEY", "")
+
+import pytest  # noqa: E402
+
+from src.repository.database import SessionLocal, User, init_db  # noqa: E402
+from src.services.auth_service import create_access_token  # noqa: E402
+
+init_db()
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: large data sets (seconds to run)")
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def user(db) -> User:
+    """A new user, so tests never share tasks or cached state"""
+    user = User(email=f"{uuid.uuid4().hex[:12]}@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def auth(user) -> dict:
+    """Authorization header for the user fixture"""
+    token = create_access_token({"sub": str(user.id)})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Test client for the API (background tasks of the lifespan not started)"""
+    from fastapi.testclient import TestClient
+
+    import main
+
+    return TestClient(main.app)
+
+
+@pytest.fixture(scope="session")
+def stream():
+    """
+    Send a GET straight to the ASGI app, passing each body chunk to on_chunk
+
+    Unlike the test client nothing is buffered, so chunking and memory use
+    are those of a real server. Returns the status and response headers.
+    """
+    import main
+
+    def get(path: str, on_chunk, headers: dict = None, query: str = ""):
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "server": ("testserver", 80),
+            "client": ("testclient", 50000),
+            "root_path": "",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "headers": [(b"host", b"testserver")]
+            + [
+                (name.lower().encode(), value.encode())
+                for name, value in (headers or {}).items()
+            ],
+        }
+        start = {}
+        requested = False
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            # Stays connected; the response cancels this wait when it is done
+            await asyncio.Event().wait()
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                on_chunk(message.get("body", b""))
+
+        asyncio.run(main.app(scope, receive, send))
+        headers = {name.decode(): value.decode() for name, value in start["headers"]}
+        return start["status"], headers
+
+    return get
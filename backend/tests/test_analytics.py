@@ -0,0 +1,34 @@
+"""Tests for daily completion rollups and streaks"""
+
+from datetime import datetime, timezone
+
+from src.repository.database import User
+from src.repository.repositories import AnalyticsRepository, TaskRepository
+from src.schemas import TaskCreate, TaskUpdate
+
+
+def counts(db, user_id):
+    db.expire_all()
+    return dict(
+        AnalyticsRepository.get_daily_completions(
+            db, user_id, datetime(2000, 1, 1).date(), datetime(2100, 1, 1).date()
+        )
+    )
+
+
+def test_uncomplete_after_timezone_change_decrements_original_day(db, user):
+    task = TaskRepository.create_task(db, user.id, TaskCreate(title="run"))
+    TaskRepository.update_task(db, task.id, TaskUpdate(is_completed=True))
+    completed_on = AnalyticsRepository.local_day(
+        db.get(User, user.id), datetime.now(timezone.utc)
+    )
+    assert counts(db, user.id) == {completed_on: 1}
+
+    # A zone whose calendar day differs from UTC right now
+    other = "Etc/GMT-14" if datetime.now(timezone.utc).hour >= 10 else "Etc/GMT+12"
+    AnalyticsRepository.set_timezone(db, user.id, other)
+    TaskRepository.update_task(db, task.id, TaskUpdate(is_completed=False))
+
+    assert counts(db, user.id) == {}
+    user = db.get(User, user.id)
+    assert (user.current_streak, user.longest_streak) == (0, 0)
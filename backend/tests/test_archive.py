@@ -0,0 +1,27 @@
+"""Tests for archiving old completed tasks"""
+
+from datetime import datetime, timedelta, timezone
+
+from src.repository.database import ArchivedTask
+from src.repository.repositories import TaskRepository
+from src.schemas import TaskCreate, TaskUpdate
+
+
+def test_new_task_never_reuses_an_archived_or_deleted_id(db, user):
+    ids = []
+    for title in ("Water the plants", "Book dentist", "Renew passport"):
+        task = TaskRepository.create_task(db, user.id, TaskCreate(title=title))
+        TaskRepository.update_task(db, task.id, TaskUpdate(is_completed=True))
+        ids.append(task.id)
+
+    cutoff = datetime.now(timezone.utc) + timedelta(seconds=1)
+    while TaskRepository.archive_completed_tasks(db, cutoff):
+        pass
+    archived = db.query(ArchivedTask.id).filter(ArchivedTask.user_id == user.id)
+    assert sorted(row.id for row in archived) == ids
+
+    third = TaskRepository.create_task(db, user.id, TaskCreate(title="Pay rent"))
+    assert TaskRepository.delete_task(db, third.id)
+
+    task = TaskRepository.create_task(db, user.id, TaskCreate(title="Call mom"))
+    assert task.id > third.id > max(ids)
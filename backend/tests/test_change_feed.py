@@ -0,0 +1,111 @@
+"""Tests for the change feed and its WebSocket"""
+
+import asyncio
+
+import orjson
+
+from src.repository.change_feed import RESYNC, ChangeFeed, change_feed
+from src.repository.database import SessionLocal, User
+from src.repository.repositories import TaskRepository
+from src.schemas import TaskBatchUpdateItem, TaskCreate
+
+
+def drain(subscription) -> list:
+    """Events delivered to a subscription so far, decoded"""
+    events = []
+    while not subscription.queue.empty():
+        events.append(orjson.loads(subscription.queue.get_nowait()))
+    return events
+
+
+def test_commit_publishes_one_merged_event_per_user(db, user):
+    first = TaskRepository.create_task(db, user.id, TaskCreate(title="Book dentist"))
+    second = TaskRepository.create_task(db, user.id, TaskCreate(title="Pay rent"))
+
+    async def run():
+        mine = change_feed.subscribe(user.id)
+        other = change_feed.subscribe(user.id + 10_000)
+        try:
+            TaskRepository.update_tasks(
+                db,
+                user.id,
+                [
+                    TaskBatchUpdateItem(id=first.id, expected_version=1, title="A"),
+                    TaskBatchUpdateItem(id=second.id, expected_version=1, title="B"),
+                ],
+            )
+            await asyncio.sleep(0)
+            return drain(mine), drain(other)
+        finally:
+            change_feed.unsubscribe(mine)
+            change_feed.unsubscribe(other)
+
+    mine, other = asyncio.run(run())
+    assert mine == [
+        {"type": "tasks.changed", "changed": [first.id, second.id], "deleted": []}
+    ]
+    assert other == []
+
+
+def test_rollback_publishes_nothing(db, user):
+    async def run():
+        subscription = change_feed.subscribe(user.id)
+        try:
+            change_feed.stage_tasks(db, user.id, changed=[1, 2])
+            change_feed.stage_context(db, user.id, 3)
+            db.rollback()
+            # Nothing staged survives into the next transaction
+            db.commit()
+            await asyncio.sleep(0)
+            return drain(subscription)
+        finally:
+            change_feed.unsubscribe(subscription)
+
+    assert asyncio.run(run()) == []
+
+
+def test_overflow_collapses_to_one_resync():
+    feed = ChangeFeed(queue_size=3)
+
+    async def run():
+        subscription = feed.subscribe(1)
+        for task_id in range(10):
+            feed.publish(1, {"type": "tasks.changed", "changed": [task_id]})
+        await asyncio.sleep(0)
+        assert subscription.queue.qsize() == 1
+        assert await subscription.get() == RESYNC
+        assert subscription.dropped == 10
+
+        # Delivery resumes once the client has taken the resync
+        feed.publish(1, {"type": "tasks.changed", "changed": [10]})
+        await asyncio.sleep(0)
+        return drain(subscription)
+
+    assert asyncio.run(run()) == [{"type": "tasks.changed", "changed": [10]}]
+
+
+def test_socket_reports_versions_read_after_subscribing(
+    db, user, client, auth, monkeypatch
+):
+    subscribe = change_feed.subscribe
+
+    def subscribe_then_write(user_id):
+        subscription = subscribe(user_id)
+        # Commits after subscribing must be in the versions sent as ready
+        with SessionLocal() as writer:
+            TaskRepository.create_task(writer, user_id, TaskCreate(title="Race"))
+        return subscription
+
+    monkeypatch.setattr(change_feed, "subscribe", subscribe_then_write)
+    token = auth["Authorization"].split()[1]
+    with client.websocket_connect(f"/api/v1/ws?token={token}") as socket:
+        ready = socket.receive_json()
+        db.expire_all()
+        current = db.get(User, user.id)
+        assert ready == {
+            "type": "ready",
+            "task_list_version": current.task_list_version,
+            "context_version": current.context_version,
+        }
+        assert current.task_list_version > 0
+        assert socket.receive_json()["type"] == "tasks.changed"
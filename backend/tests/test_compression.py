@@ -0,0 +1,115 @@
+"""Tests for response compression and the ETags of compressed bodies"""
+
+import zstandard
+from sqlalchemy import insert
+from starlette.applications import Starlette
+from starlette.responses import Response
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from src.api.etags import if_match, if_none_match, make_etag
+from src.middleware.compression import (
+    SUPPORTED_ENCODINGS,
+    CompressionMiddleware,
+    negotiate_encoding,
+)
+from src.repository.database import Task
+
+ETAG = make_etag("task", 7, 3)
+
+
+def _app() -> TestClient:
+    async def task(request):
+        body = b'{"title": "' + b"x" * 4096 + b'"}'
+        return Response(body, media_type="application/json", headers={"ETag": ETAG})
+
+    async def small(request):
+        return Response(b"{}", media_type="application/json", headers={"ETag": ETAG})
+
+    app = Starlette(routes=[Route("/task", task), Route("/small", small)])
+    app.add_middleware(CompressionMiddleware)
+    return TestClient(app)
+
+
+def add_tasks(db, user_id: int, count: int):
+    db.execute(
+        insert(Task),
+        [{"user_id": user_id, "title": f"task number {i}"} for i in range(count)],
+    )
+    db.commit()
+
+
+def test_negotiation_prefers_zstd_and_honours_q_values():
+    assert negotiate_encoding("gzip, deflate, zstd") == "zstd"
+    assert negotiate_encoding("gzip, zstd;q=0.5") == "gzip"
+    assert negotiate_encoding("*") == "zstd"
+    assert negotiate_encoding("*, zstd;q=0") == SUPPORTED_ENCODINGS[1]
+    assert negotiate_encoding("gzip;q=0, identity") is None
+    assert negotiate_encoding("") is None
+
+
+def test_small_responses_pass_through():
+    response = _app().get("/small", headers={"Accept-Encoding": "zstd"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == ETAG
+    assert response.content == b"{}"
+
+
+def test_compressed_body_gets_its_own_etag():
+    client = _app()
+
+    gzipped = client.get("/task", headers={"Accept-Encoding": "gzip"})
+    zstd = client.get("/task", headers={"Accept-Encoding": "zstd"})
+    plain = client.get("/task", headers={"Accept-Encoding": "identity"})
+
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.headers["etag"] == '"task-7-3-gzip"'
+    assert zstd.headers["etag"] == '"task-7-3-zstd"'
+    assert plain.headers["etag"] == ETAG
+
+
+def test_conditional_headers_accept_encoded_etags():
+    for sent in ('"task-7-3-zstd"', 'W/"task-7-3-gzip"', '"other", "task-7-3-br"'):
+        assert if_none_match(sent, ETAG)
+    assert not if_none_match('"task-7-4-zstd"', ETAG)
+
+    assert if_match('"task-7-3-gzip"', ETAG)
+    assert not if_match('W/"task-7-3-gzip"', ETAG)
+    assert not if_match('"task-7-4-gzip"', ETAG)
+
+
+def test_export_is_compressed_chunk_by_chunk(db, user, auth, stream):
+    add_tasks(db, user.id, 3000)
+    path, query = "/api/v1/tasks/export", "format=ndjson"
+
+    plain = []
+    stream(path, plain.append, headers=auth, query=query)
+    chunks = []
+    status, headers = stream(
+        path, chunks.append, headers={**auth, "Accept-Encoding": "zstd"}, query=query
+    )
+
+    assert status == 200
+    assert headers["content-encoding"] == "zstd"
+    assert "content-length" not in headers
+    # One compressed chunk per export batch, each decodable on arrival
+    assert len([chunk for chunk in chunks if chunk]) >= 3
+    decoder = zstandard.ZstdDecompressor().decompressobj()
+    decoded = [decoder.decompress(chunk) for chunk in chunks]
+    assert decoded[0] and decoded[0].endswith(b"\n")
+    assert b"".join(decoded) == b"".join(plain)
+
+
+def test_encoded_etag_revalidates_to_304(db, user, auth, client):
+    add_tasks(db, user.id, 50)
+    headers = {**auth, "Accept-Encoding": "gzip"}
+
+    first = client.get("/api/v1/tasks", headers=headers)
+    assert first.headers["content-encoding"] == "gzip"
+    etag = first.headers["etag"]
+    assert etag.endswith('-gzip"')
+    assert first.json()["total"] == 50
+
+    again = client.get("/api/v1/tasks", headers={**headers, "If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
@@ -0,0 +1,108 @@
+"""Tests for optimistic concurrency on task updates"""
+
+from sqlalchemy import update
+
+from src.repository.database import SessionLocal, Task
+from src.repository.repositories import TaskRepository
+from src.schemas import TaskCreate
+
+
+def create(db, user, title: str) -> Task:
+    return TaskRepository.create_task(db, user.id, TaskCreate(title=title))
+
+
+def bump_elsewhere(task_id: int):
+    """Change a task from another session, as a concurrent request would"""
+    with SessionLocal() as other:
+        other.execute(
+            update(Task)
+            .where(Task.id == task_id)
+            .values(title="changed elsewhere", version=Task.version + 1)
+        )
+        other.commit()
+
+
+def test_stale_expected_version_is_409(db, user, client, auth):
+    task = create(db, user, "Water the plants")
+    url = f"/api/v1/tasks/{task.id}"
+
+    ok = client.put(url, json={"title": "Water", "expected_version": 1}, headers=auth)
+    assert ok.status_code == 200
+    assert ok.json()["version"] == 2
+
+    stale = client.put(url, json={"title": "Nope", "expected_version": 1}, headers=auth)
+    assert stale.status_code == 409
+    assert "current version 2" in stale.json()["detail"]
+
+
+def test_stale_if_match_is_412(db, user, client, auth):
+    task = create(db, user, "Water the plants")
+    url = f"/api/v1/tasks/{task.id}"
+    etag = client.get(url, headers=auth).headers["etag"]
+
+    ok = client.put(url, json={"title": "Water"}, headers={**auth, "If-Match": etag})
+    assert ok.status_code == 200
+    assert ok.headers["etag"] != etag
+
+    stale = client.put(url, json={"title": "Nope"}, headers={**auth, "If-Match": etag})
+    assert stale.status_code == 412
+    db.expire_all()
+    assert db.get(Task, task.id).title == "Water"
+
+
+def test_batch_update_is_all_or_nothing(db, user, client, auth):
+    first = create(db, user, "Book dentist")
+    second = create(db, user, "Renew passport")
+    bump_elsewhere(second.id)
+
+    response = client.patch(
+        "/api/v1/tasks",
+        json={
+            "updates": [
+                {"id": first.id, "expected_version": 1, "is_completed": True},
+                {"id": second.id, "expected_version": 1, "is_completed": True},
+            ]
+        },
+        headers=auth,
+    )
+    assert response.status_code == 409
+    assert response.json()["detail"].endswith(f": {second.id}")
+
+    db.expire_all()
+    assert not db.get(Task, first.id).is_completed
+    assert db.get(Task, first.id).version == 1
+
+    response = client.patch(
+        "/api/v1/tasks",
+        json={
+            "updates": [
+                {"id": first.id, "expected_version": 1, "is_completed": True},
+                {"id": second.id, "expected_version": 2, "is_completed": True},
+            ]
+        },
+        headers=auth,
+    )
+    assert response.status_code == 200
+    assert [task["version"] for task in response.json()["tasks"]] == [2, 3]
+
+
+def test_write_between_read_and_flush_is_409(db, user, client, auth, monkeypatch):
+    task = create(db, user, "Water the plants")
+    get_task = TaskRepository.get_task_by_id
+
+    def get_then_change(session, task_id):
+        # The route has loaded the task; another request commits first
+        loaded = get_task(session, task_id)
+        if loaded is not None and loaded.version == 1:
+            bump_elsewhere(task_id)
+        return loaded
+
+    monkeypatch.setattr(TaskRepository, "get_task_by_id", get_then_change)
+    response = client.put(
+        f"/api/v1/tasks/{task.id}", json={"title": "Mine"}, headers=auth
+    )
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Task has been modified concurrently"
+
+    db.expire_all()
+    assert db.get(Task, task.id).title == "changed elsewhere"
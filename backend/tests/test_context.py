@@ -0,0 +1,81 @@
+"""Tests for conditional requests on the user's goals and notes"""
+
+import pytest
+
+from src.repository.database import User
+from src.repository.repositories import UserRepository
+from src.schemas import ContextUpdate
+
+URL = "/api/v1/context"
+
+
+def put_context(client, auth, body: dict, **headers):
+    return client.put(URL, json=body, headers={**auth, **headers})
+
+
+def test_get_with_matching_etag_is_304(client, auth):
+    put_context(client, auth, {"goals": "Run a marathon"})
+    first = client.get(URL, headers=auth)
+    etag = first.headers["etag"]
+    assert first.json()["goals"] == "Run a marathon"
+
+    cached = client.get(URL, headers={**auth, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+
+    put_context(client, auth, {"notes": "Mornings work best"})
+    changed = client.get(URL, headers={**auth, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_put_with_stale_if_match_is_412(client, auth):
+    etag = put_context(client, auth, {"goals": "v1"}).headers["etag"]
+
+    ok = put_context(client, auth, {"goals": "v2"}, **{"If-Match": etag})
+    assert ok.status_code == 200
+    stale = put_context(client, auth, {"goals": "v3"}, **{"If-Match": etag})
+    assert stale.status_code == 412
+
+    assert client.get(URL, headers=auth).json()["goals"] == "v2"
+
+
+def test_patch_requires_if_match(client, auth):
+    operations = [{"op": "replace", "path": "/goals/0", "value": "Swim"}]
+    for headers in ({}, {"If-Match": "*"}):
+        response = client.patch(URL, json=operations, headers={**auth, **headers})
+        assert response.status_code == 428
+
+
+def test_patch_edits_lines_and_rejects_stale_if_match(client, auth):
+    etag = put_context(client, auth, {"notes": "one\ntwo\nthree"}).headers["etag"]
+    operations = [{"op": "replace", "path": "/notes/1", "value": "TWO"}]
+
+    ok = client.patch(URL, json=operations, headers={**auth, "If-Match": etag})
+    assert ok.status_code == 200
+    assert ok.json()["notes"] == "one\nTWO\nthree"
+
+    stale = client.patch(URL, json=operations, headers={**auth, "If-Match": etag})
+    assert stale.status_code == 412
+
+
+def test_failing_test_op_rejects_the_whole_patch(db, user):
+    UserRepository.update_user_context(db, user.id, ContextUpdate(notes="a\nb"), None)
+    version = db.get(User, user.id).context_version
+    operations = [
+        {"op": "replace", "path": "/notes/0", "value": "A"},
+        {"op": "test", "path": "/notes/1", "value": "not b"},
+    ]
+
+    with pytest.raises(ValueError, match="Invalid patch"):
+        UserRepository.patch_user_context(db, user.id, operations, version)
+    db.expire_all()
+    assert db.get(User, user.id).notes == "a\nb"
+    assert db.get(User, user.id).context_version == version
+
+
+def test_failing_test_op_is_422(client, auth):
+    etag = put_context(client, auth, {"goals": "Run"}).headers["etag"]
+    operations = [{"op": "test", "path": "/goals/0", "value": "Swim"}]
+    response = client.patch(URL, json=operations, headers={**auth, "If-Match": etag})
+    assert response.status_code == 422
@@ -0,0 +1,123 @@
+"""
+Tests for the streaming task export
+
+The export is read with the stream fixture rather than the test client,
+which buffers whole response bodies. Memory is compared at two row
+counts, ten times apart; the large one is scaled down from the 1M rows of
+benchmarks/bench_task_export.py (EXPORT_TEST_ROWS=1000000 runs it at full
+size).
+"""
+
+import csv
+import io
+import os
+import tracemalloc
+import uuid
+from datetime import datetime, timezone
+
+import orjson
+import pytest
+from sqlalchemy import insert
+
+from src.repository.database import Task, User
+from src.services.auth_service import create_access_token
+from src.services.export_service import EXPORT_COLUMNS
+
+# Scaled down from 1M so the suite stays fast; SMALL_ROWS is still two
+# export batches
+LARGE_ROWS = int(os.getenv("EXPORT_TEST_ROWS", "20000"))
+SMALL_ROWS = LARGE_ROWS // 10
+BATCH = 10_000
+
+
+def load_tasks(db, user_id: int, count: int):
+    now = datetime.now(timezone.utc)
+    for offset in range(0, count, BATCH):
+        db.execute(
+            insert(Task),
+            [
+                {
+                    "user_id": user_id,
+                    "title": f"exported task {i}, with a comma",
+                    "is_completed": i % 3 == 0,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(offset, min(offset + BATCH, count))
+            ],
+        )
+    db.commit()
+
+
+def export(stream, auth: dict, format: str, on_chunk) -> int:
+    """Run GET /tasks/export; returns the status"""
+    status, _ = stream(
+        "/api/v1/tasks/export", on_chunk, headers=auth, query=f"format={format}"
+    )
+    return status
+
+
+def export_peak(stream, auth: dict, format: str) -> tuple:
+    """Rows streamed and peak traced heap while draining the export"""
+    rows = 0
+
+    def count(chunk: bytes):
+        nonlocal rows
+        rows += chunk.count(b"\n")
+
+    tracemalloc.start()
+    try:
+        assert export(stream, auth, format, count) == 200
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return rows, peak
+
+
+@pytest.fixture
+def exporter(db):
+    """Make a user with a number of tasks; returns their auth header"""
+
+    def make(count: int) -> dict:
+        user = User(email=f"{uuid.uuid4().hex[:12]}@example.com", hashed_password="x")
+        db.add(user)
+        db.commit()
+        load_tasks(db, user.id, count)
+        token = create_access_token({"sub": str(user.id)})
+        return {"Authorization": f"Bearer {token}"}
+
+    return make
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("format", ["ndjson", "csv"])
+def test_export_memory_does_not_grow_with_rows(exporter, stream, format):
+    small, large = exporter(SMALL_ROWS), exporter(LARGE_ROWS)
+    # Warm up imports and caches so they do not count as export memory
+    export_peak(stream, small, format)
+
+    small_rows, small_peak = export_peak(stream, small, format)
+    large_rows, large_peak = export_peak(stream, large, format)
+
+    header = 1 if format == "csv" else 0
+    assert small_rows == SMALL_ROWS + header
+    assert large_rows == LARGE_ROWS + header
+    # Ten times the rows; the peak is one batch either way
+    assert large_peak < small_peak * 1.25
+
+
+def test_export_rows_and_csv_header(db, user, auth, stream):
+    load_tasks(db, user.id, 3)
+    body = bytearray()
+    assert export(stream, auth, "csv", body.extend) == 200
+    records = list(csv.reader(io.StringIO(body.decode())))
+    assert records[0] == EXPORT_COLUMNS
+    assert [record[1] for record in records[1:]] == [
+        f"exported task {i}, with a comma" for i in range(3)
+    ]
+
+    body = bytearray()
+    assert export(stream, auth, "ndjson", body.extend) == 200
+    rows = [orjson.loads(line) for line in body.splitlines()]
+    assert len(rows) == 3
+    assert list(rows[0]) == EXPORT_COLUMNS
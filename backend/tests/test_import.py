@@ -0,0 +1,20 @@
+"""Tests for the bulk task import"""
+
+from src.repository.database import Task
+from src.repository.repositories import TaskRepository
+from src.schemas import TaskImportRow
+
+
+def test_imported_tags_link_to_their_own_rows(db, user):
+    rows = [TaskImportRow(title=f"Imported {i}", tags=[f"tag-{i}"]) for i in range(5)]
+    rows.insert(2, TaskImportRow(title="Untagged"))
+
+    assert TaskRepository.import_task_chunk(db, user, rows)
+    assert TaskRepository.finish_import(db, user.id, completed=False)
+
+    tasks = db.query(Task).filter(Task.user_id == user.id).all()
+    tags = {task.title: [tag.name for tag in task.tags] for task in tasks}
+    assert tags == {
+        **{f"Imported {i}": [f"tag-{i}"] for i in range(5)},
+        "Untagged": [],
+    }
@@ -0,0 +1,117 @@
+"""Tests for the local suggestion engine and the LLM fallback that uses it"""
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from src.repository.repositories import UserRepository
+from src.schemas import ContextUpdate
+from src.services.langchain_service import langchain_service
+from src.services.local_suggestion_service import LocalSuggestionService
+
+# One template per topic with nothing in common, so scores depend only on
+# where a topic's word appears in the input
+TOPIC_TEMPLATES = [
+    {"title": topic.title(), "reason": f"{topic} reason", "keywords": topic}
+    for topic in ("garden", "guitar", "kayak")
+]
+
+
+def titles(suggestions) -> list:
+    return [suggestion.title for suggestion in suggestions]
+
+
+def test_rank_orders_by_descending_score():
+    engine = LocalSuggestionService()
+    ranked = engine.rank("deploy the project to a production server")
+
+    scores = [score for _, score in ranked]
+    assert scores == sorted(scores, reverse=True)
+    assert titles(engine.suggest("", "", "deploy to production server"))[0] == (
+        "Deploy the current version of your project"
+    )
+    assert len(engine.rank("learn project code", limit=2)) == 2
+
+
+@pytest.mark.parametrize(
+    "query, goals, notes",
+    [
+        ("garden", "guitar", "kayak"),
+        ("kayak", "garden", "guitar"),
+        ("guitar", "kayak", "garden"),
+    ],
+)
+def test_query_outweighs_goals_outweighs_notes(query, goals, notes):
+    engine = LocalSuggestionService(TOPIC_TEMPLATES)
+    suggested = engine.suggest(goals=goals, notes=notes, query=query)
+    assert titles(suggested) == [query.title(), goals.title(), notes.title()]
+
+
+def test_stopword_only_input_suggests_nothing():
+    engine = LocalSuggestionService()
+    assert engine.rank("the and to of with your") == []
+    assert engine.suggest("I want to", "a", "suggest some tasks for me") == []
+
+
+def test_register_templates_extends_the_index():
+    engine = LocalSuggestionService(TOPIC_TEMPLATES)
+    assert engine.suggest("", "", "pottery") == []
+
+    engine.register_templates([{"title": "Throw a pot", "keywords": "pottery"}])
+    assert engine.template_count == 4
+    assert titles(engine.suggest("", "", "pottery")) == ["Throw a pot"]
+
+
+# ============================================================================
+# LLM FALLBACK
+# ============================================================================
+
+
+@pytest.fixture
+def with_goals(db, user):
+    UserRepository.update_user_context(
+        db, user.id, ContextUpdate(goals="Get fit with a workout routine")
+    )
+    return user
+
+
+def failing_llm(error: Exception):
+    def call(_):
+        raise error
+
+    return RunnableLambda(call)
+
+
+@pytest.mark.parametrize(
+    "error",
+    [RuntimeError("quota exceeded"), TimeoutError("deadline exceeded")],
+    ids=["raises", "times-out"],
+)
+def test_llm_failure_falls_back_to_local(monkeypatch, db, with_goals, error):
+    monkeypatch.setattr(langchain_service, "llm", failing_llm(error))
+
+    response = langchain_service.generate_suggestions(db, with_goals.id, "gym exercise")
+    assert response.success
+    assert response.source == "local"
+    assert "Complete a 20-minute workout" in titles(response.suggestions)
+    assert response.message.startswith("AI service is unavailable")
+
+
+def test_unconfigured_llm_falls_back_to_local(monkeypatch, db, with_goals):
+    monkeypatch.setattr(langchain_service, "llm", None)
+
+    response = langchain_service.generate_suggestions(db, with_goals.id, "workout")
+    assert response.source == "local"
+    assert response.suggestions
+
+
+def test_fallback_keeps_failure_when_local_has_nothing(monkeypatch, db, user):
+    monkeypatch.setattr(
+        langchain_service, "llm", failing_llm(TimeoutError("deadline exceeded"))
+    )
+    # Nothing here survives tokenizing, so the templates cannot match
+    UserRepository.update_user_context(db, user.id, ContextUpdate(goals="a b c"))
+
+    response = langchain_service.generate_suggestions(db, user.id, "the and")
+    assert not response.success
+    assert response.source != "local"
+    assert "deadline exceeded" in response.message
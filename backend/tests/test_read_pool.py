@@ -0,0 +1,70 @@
+"""Tests for routing reads to the read-only pool"""
+
+import pytest
+from cachetools import TTLCache
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from starlette.requests import Request
+
+from src.repository import database
+from src.repository.database import (
+    DATABASE_READ_PIN_SECONDS,
+    ReadSession,
+    ReadSessionLocal,
+    SessionLocal,
+    User,
+    engine,
+    get_db,
+    read_engine,
+)
+
+
+def session_for(method: str):
+    request = Request({"type": "http", "method": method, "headers": []})
+    dependency = get_db(request)
+    return dependency, next(dependency)
+
+
+def test_get_requests_use_a_query_only_session():
+    assert read_engine is not engine
+    dependency, db = session_for("GET")
+    try:
+        assert isinstance(db, ReadSession)
+        assert db.execute(text("PRAGMA query_only")).scalar() == 1
+        db.add(User(email="readonly@example.com", hashed_password="x"))
+        with pytest.raises(OperationalError, match="readonly"):
+            db.flush()
+    finally:
+        dependency.close()
+
+    dependency, db = session_for("POST")
+    try:
+        assert not isinstance(db, ReadSession)
+        assert db.execute(text("PRAGMA query_only")).scalar() == 0
+    finally:
+        dependency.close()
+
+
+def test_recent_writer_is_pinned_to_the_primary(user, monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(
+        database,
+        "_recent_writers",
+        TTLCache(maxsize=100, ttl=DATABASE_READ_PIN_SECONDS, timer=lambda: now[0]),
+    )
+    reader = ReadSessionLocal(info={"user_id": user.id})
+    other = ReadSessionLocal(info={"user_id": user.id + 10_000})
+    try:
+        assert reader.get_bind() is read_engine
+
+        with SessionLocal(info={"user_id": user.id}) as writer:
+            writer.get(User, user.id).timezone = "Europe/Paris"
+            writer.commit()
+        assert reader.get_bind() is engine
+        assert other.get_bind() is read_engine
+
+        now[0] += DATABASE_READ_PIN_SECONDS + 0.1
+        assert reader.get_bind() is read_engine
+    finally:
+        reader.close()
+        other.close()
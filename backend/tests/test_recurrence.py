@@ -0,0 +1,117 @@
+"""Tests for recurring tasks and their lazily created occurrences"""
+
+from datetime import datetime, timedelta, timezone
+
+from src.repository.database import RecurrenceRule, Task
+from src.repository.recurrence import first_occurrence, next_occurrence, parse_rrule
+from src.repository.repositories import RecurrenceRepository, TaskRepository
+from src.schemas import RecurrenceCreate, TaskUpdate
+
+UTC = timezone.utc
+
+
+def occurrences(db, user):
+    db.expire_all()
+    return (
+        db.query(Task)
+        .filter(Task.user_id == user.id)
+        .order_by(Task.due_at, Task.id)
+        .all()
+    )
+
+
+def make_rule(db, user, starts_at: datetime, rule: str = "FREQ=DAILY"):
+    return RecurrenceRepository.create_rule(
+        db,
+        user,
+        RecurrenceCreate(title="Stand-up", rule=rule, starts_at=starts_at),
+    )
+
+
+def naive(value: datetime) -> datetime:
+    return value.astimezone(UTC).replace(tzinfo=None)
+
+
+def test_next_occurrence_follows_weekdays_and_time_of_day():
+    spec = parse_rrule("FREQ=WEEKLY;BYDAY=MO,TH")
+    # Wednesday 2030-01-02 09:30 UTC; first occurrence is Thursday
+    start = first_occurrence(spec, datetime(2030, 1, 2, 9, 30), UTC)
+    assert start == datetime(2030, 1, 3, 9, 30)
+    assert next_occurrence(spec, start, start, UTC) == datetime(2030, 1, 7, 9, 30)
+
+
+def test_occurrences_are_created_only_when_due(db, user):
+    start = (datetime.now(UTC) + timedelta(hours=1)).replace(microsecond=0)
+    rule = make_rule(db, user, start)
+    assert occurrences(db, user) == []
+
+    RecurrenceRepository.materialize_due(db, start - timedelta(minutes=1))
+    assert occurrences(db, user) == []
+
+    RecurrenceRepository.materialize_due(db, start)
+    [task] = occurrences(db, user)
+    assert (task.title, task.due_at, task.recurrence_id) == (
+        "Stand-up",
+        naive(start),
+        rule.id,
+    )
+    db.refresh(rule)
+    assert rule.next_due_at == naive(start + timedelta(days=1))
+
+
+def test_running_twice_creates_no_duplicates(db, user):
+    start = datetime.now(UTC).replace(microsecond=0) + timedelta(hours=1)
+    make_rule(db, user, start)
+
+    # Days were missed: one occurrence is created, not one per missed day
+    later = start + timedelta(days=3, hours=1)
+    RecurrenceRepository.materialize_due(db, later)
+    RecurrenceRepository.materialize_due(db, later)
+    assert len(occurrences(db, user)) == 1
+
+
+def test_completing_an_occurrence_creates_the_next(db, user):
+    start = datetime.now(UTC).replace(microsecond=0) - timedelta(minutes=1)
+    rule = make_rule(db, user, start)
+    [first] = occurrences(db, user)
+
+    TaskRepository.update_task(db, first.id, TaskUpdate(is_completed=True))
+    tasks = occurrences(db, user)
+    assert [task.due_at for task in tasks] == [
+        naive(start),
+        naive(start + timedelta(days=1)),
+    ]
+    db.refresh(rule)
+    assert rule.current_task_id == tasks[1].id
+
+    # Only the latest occurrence spawns another one
+    TaskRepository.update_task(db, first.id, TaskUpdate(is_completed=False))
+    TaskRepository.update_task(db, first.id, TaskUpdate(is_completed=True))
+    assert len(occurrences(db, user)) == 2
+
+
+def test_count_limits_occurrences(db, user):
+    start = datetime.now(UTC).replace(microsecond=0) - timedelta(minutes=1)
+    rule = make_rule(db, user, start, "FREQ=DAILY;COUNT=2")
+    [first] = occurrences(db, user)
+    TaskRepository.update_task(db, first.id, TaskUpdate(is_completed=True))
+    second = occurrences(db, user)[1]
+    TaskRepository.update_task(db, second.id, TaskUpdate(is_completed=True))
+
+    assert len(occurrences(db, user)) == 2
+    db.refresh(rule)
+    assert rule.next_due_at is None
+
+
+def test_deleting_a_rule_keeps_its_occurrences(db, user):
+    start = datetime.now(UTC).replace(microsecond=0) - timedelta(minutes=1)
+    rule = make_rule(db, user, start)
+    rule_id = rule.id
+
+    assert RecurrenceRepository.delete_rule(db, rule_id)
+    assert db.get(RecurrenceRule, rule_id) is None
+    [task] = occurrences(db, user)
+    assert (task.title, task.recurrence_id) == ("Stand-up", None)
+
+    RecurrenceRepository.materialize_due(db, start + timedelta(days=5))
+    assert len(occurrences(db, user)) == 1
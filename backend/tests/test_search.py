@@ -0,0 +1,26 @@
+"""Tests for full-text task search"""
+
+from src.repository.repositories import TaskRepository
+from src.schemas import TaskCreate
+
+
+def titles(results):
+    return sorted(task.title for task, _, _ in results)
+
+
+def test_search_matches_title_words(db, user):
+    TaskRepository.create_task(db, user.id, TaskCreate(title="Review budget"))
+    TaskRepository.create_task(db, user.id, TaskCreate(title="Buy milk"))
+
+    assert titles(TaskRepository.search_tasks(db, user.id, "budg")) == ["Review budget"]
+
+
+def test_numeric_query_does_not_match_user_id(db, user):
+    TaskRepository.create_task(db, user.id, TaskCreate(title="Buy milk"))
+    TaskRepository.create_task(db, user.id, TaskCreate(title="Room 42 keys"))
+
+    # Only titles count, whatever the user's id happens to be
+    for query in (str(user.id), "1", "42"):
+        found = titles(TaskRepository.search_tasks(db, user.id, query))
+        assert "Buy milk" not in found
+    assert titles(TaskRepository.search_tasks(db, user.id, "42")) == ["Room 42 keys"]
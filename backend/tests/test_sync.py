@@ -0,0 +1,82 @@
+"""Tests for delta sync cursors"""
+
+from datetime import datetime, timedelta, timezone
+
+from src.repository.database import SessionLocal, User
+from src.repository.repositories import RecurrenceRepository, TaskRepository
+from src.schemas import RecurrenceCreate, TaskCreate, TaskUpdate
+
+
+def sync(db, user_id, since=None):
+    db.expire_all()
+    changed, deleted, cursor, full = TaskRepository.get_changes_since(
+        db, user_id, since
+    )
+    return {task.title for task in changed}, deleted, cursor, full
+
+
+def test_changes_and_deletions_after_cursor(db, user):
+    keep = TaskRepository.create_task(db, user.id, TaskCreate(title="keep"))
+    gone = TaskRepository.create_task(db, user.id, TaskCreate(title="gone"))
+    titles, deleted, cursor, full = sync(db, user.id)
+    assert (titles, deleted, full) == ({"keep", "gone"}, [], True)
+
+    TaskRepository.update_task(db, keep.id, TaskUpdate(title="kept"))
+    gone_id = gone.id
+    TaskRepository.delete_task(db, gone_id)
+    TaskRepository.create_task(db, user.id, TaskCreate(title="new"))
+
+    titles, deleted, next_cursor, full = sync(db, user.id, cursor)
+    assert (titles, deleted, full) == ({"kept", "new"}, [gone_id], False)
+    assert sync(db, user.id, next_cursor)[:2] == (set(), [])
+
+
+def test_write_in_flight_during_sync_is_not_skipped(db, user):
+    task = TaskRepository.create_task(db, user.id, TaskCreate(title="before"))
+    cursor = sync(db, user.id)[2]
+
+    writer = SessionLocal()
+    try:
+        # Stamped and flushed, but not committed while the reader syncs
+        row = writer.get(type(task), task.id)
+        row.title = "late"
+        TaskRepository._bump_list_version(writer, user.id, changed=[task.id])
+        titles, _, cursor, _ = sync(db, user.id, cursor)
+        assert titles == set()
+        writer.commit()
+    finally:
+        writer.close()
+
+    assert sync(db, user.id, cursor)[0] == {"late"}
+
+
+def test_detached_occurrences_are_synced(db, user):
+    rule = RecurrenceRepository.create_rule(
+        db, user, RecurrenceCreate(title="water plants", rule="FREQ=DAILY")
+    )
+    cursor = sync(db, user.id)[2]
+
+    RecurrenceRepository.delete_rule(db, rule.id)
+
+    assert sync(db, user.id, cursor)[0] == {"water plants"}
+
+
+def test_cursor_older_than_pruned_tombstones_resyncs(db, user):
+    task = TaskRepository.create_task(db, user.id, TaskCreate(title="old"))
+    TaskRepository.create_task(db, user.id, TaskCreate(title="current"))
+    cursor = sync(db, user.id)[2]
+    TaskRepository.delete_task(db, task.id)
+    after_delete = sync(db, user.id)[2]
+
+    future = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(days=1)
+    assert TaskRepository.prune_tombstones(db, future) >= 1
+    assert db.get(User, user.id).sync_floor_version == after_delete
+
+    titles, deleted, _, full = sync(db, user.id, cursor)
+    assert (titles, deleted, full) == ({"current"}, [], True)
+    assert sync(db, user.id, after_delete)[3] is False
+
+
+def test_cursor_from_the_future_resyncs(db, user):
+    TaskRepository.create_task(db, user.id, TaskCreate(title="only"))
+    assert sync(db, user.id, 10_000)[3] is True
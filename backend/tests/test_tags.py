@@ -0,0 +1,140 @@
+"""Tests that the materialized per-tag counts match the tasks they count"""
+
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func
+
+from src.repository.database import (
+    TAG_NAMES_SEPARATOR,
+    ArchivedTask,
+    Tag,
+    Task,
+    task_tags,
+)
+from src.repository.repositories import TaskRepository
+from src.schemas import TaskBatchUpdateItem, TaskCreate, TaskUpdate
+
+
+def stored_counts(db, user_id: int) -> dict:
+    """Tag name -> (task_count, completed_count) as materialized on the tag"""
+    db.expire_all()
+    return {
+        tag.name: (tag.task_count, tag.completed_count)
+        for tag in db.query(Tag).filter(Tag.user_id == user_id)
+        if tag.task_count or tag.completed_count
+    }
+
+
+def recounted(db, user_id: int) -> dict:
+    """The same counts from a fresh COUNT(*) over live and archived tasks"""
+    totals, completed = Counter(), Counter()
+    rows = (
+        db.query(Tag.name, Task.is_completed, func.count())
+        .join(task_tags, task_tags.c.tag_id == Tag.id)
+        .join(Task, Task.id == task_tags.c.task_id)
+        .filter(Tag.user_id == user_id)
+        .group_by(Tag.name, Task.is_completed)
+    )
+    for name, is_completed, count in rows:
+        totals[name] += count
+        if is_completed:
+            completed[name] += count
+    # Archived tasks keep counting towards their tags
+    archived = db.query(ArchivedTask.tag_names).filter(
+        ArchivedTask.user_id == user_id, ArchivedTask.tag_names.isnot(None)
+    )
+    for (tag_names,) in archived:
+        for name in tag_names.split(TAG_NAMES_SEPARATOR):
+            totals[name] += 1
+            completed[name] += 1
+    return {name: (totals[name], completed[name]) for name in totals}
+
+
+def create(db, user_id: int, title: str, tags: list) -> Task:
+    return TaskRepository.create_task(db, user_id, TaskCreate(title=title, tags=tags))
+
+
+def test_create_and_retag_keep_counts(db, user):
+    first = create(db, user.id, "Plan sprint", ["Work", "planning"])
+    create(db, user.id, "Book flights", ["travel", " WORK "])
+    assert stored_counts(db, user.id) == {
+        "work": (2, 0),
+        "planning": (1, 0),
+        "travel": (1, 0),
+    }
+
+    TaskRepository.update_task(db, first.id, TaskUpdate(is_completed=True))
+    TaskRepository.update_task(db, first.id, TaskUpdate(tags=["work", "review"]))
+    assert stored_counts(db, user.id) == recounted(db, user.id)
+    assert stored_counts(db, user.id) == {
+        "work": (2, 1),
+        "review": (1, 1),
+        "travel": (1, 0),
+    }
+
+    TaskRepository.update_task(db, first.id, TaskUpdate(tags=[]))
+    assert stored_counts(db, user.id) == recounted(db, user.id)
+    assert stored_counts(db, user.id) == {"work": (1, 0), "travel": (1, 0)}
+
+
+def test_completion_flips_and_batch_updates_keep_counts(db, user):
+    tasks = [create(db, user.id, f"Chapter {i}", ["reading"]) for i in range(3)]
+    TaskRepository.update_tasks(
+        db,
+        user.id,
+        [
+            TaskBatchUpdateItem(id=task.id, expected_version=task.version, **change)
+            for task, change in zip(
+                tasks,
+                [
+                    {"is_completed": True},
+                    {"is_completed": True, "tags": ["reading", "notes"]},
+                    {"tags": ["notes"]},
+                ],
+            )
+        ],
+    )
+    assert stored_counts(db, user.id) == recounted(db, user.id)
+    assert stored_counts(db, user.id) == {"reading": (2, 2), "notes": (2, 1)}
+
+    TaskRepository.update_task(db, tasks[0].id, TaskUpdate(is_completed=False))
+    assert stored_counts(db, user.id) == recounted(db, user.id)
+    assert stored_counts(db, user.id)["reading"] == (2, 1)
+
+
+def test_delete_keeps_counts(db, user):
+    done = create(db, user.id, "File taxes", ["finance", "admin"])
+    create(db, user.id, "Renew insurance", ["admin"])
+    TaskRepository.update_task(db, done.id, TaskUpdate(is_completed=True))
+
+    assert TaskRepository.delete_task(db, done.id)
+    assert stored_counts(db, user.id) == recounted(db, user.id)
+    assert stored_counts(db, user.id) == {"admin": (1, 0)}
+
+
+def test_archived_tasks_still_count(db, user):
+    done = create(db, user.id, "Ship release", ["project", "milestone"])
+    create(db, user.id, "Write changelog", ["project"])
+    TaskRepository.update_task(db, done.id, TaskUpdate(is_completed=True))
+    done_id = done.id
+    before = stored_counts(db, user.id)
+
+    cutoff = datetime.now(timezone.utc) + timedelta(seconds=1)
+    while TaskRepository.archive_completed_tasks(db, cutoff):
+        pass
+    assert db.get(Task, done_id) is None
+    assert stored_counts(db, user.id) == before == recounted(db, user.id)
+    assert before == {"project": (2, 1), "milestone": (1, 1)}
+
+
+def test_categories_endpoint_serves_the_counts(client, db, user, auth):
+    create(db, user.id, "Stretch", ["health"])
+    create(db, user.id, "Run 5k", ["health", "outdoor"])
+
+    response = client.get("/api/v1/analytics/categories", headers=auth)
+    assert response.status_code == 200
+    assert response.json()["categories"] == [
+        {"name": "health", "total": 2, "completed": 0},
+        {"name": "outdoor", "total": 1, "completed": 0},
+    ]
@@ -0,0 +1,156 @@
+"""Tests that the cached task lists match the database after every write"""
+
+from datetime import datetime, timedelta, timezone
+
+from src.repository.database import SessionLocal, Task
+from src.repository.repositories import RecurrenceRepository, TaskRepository
+from src.repository.task_cache import CachedTask
+from src.schemas import (
+    RecurrenceCreate,
+    SyncMutation,
+    TaskBatchUpdateItem,
+    TaskCreate,
+    TaskImportRow,
+    TaskUpdate,
+)
+
+
+def fresh_tasks(user_id: int):
+    """The user's tasks read straight from the database, newest first"""
+    with SessionLocal() as db:
+        tasks = (
+            db.query(Task)
+            .filter(Task.user_id == user_id)
+            .order_by(Task.created_at.desc(), Task.id.desc())
+        )
+        return [CachedTask.from_task(task) for task in tasks]
+
+
+def assert_cache_matches_db(db, user_id: int):
+    expected = fresh_tasks(user_id)
+    assert TaskRepository.get_tasks_by_user(db, user_id) == expected
+    assert TaskRepository.get_pending_tasks(db, user_id) == [
+        task for task in expected if not task.is_completed
+    ]
+    assert TaskRepository.get_completed_tasks(db, user_id) == [
+        task for task in expected if task.is_completed
+    ]
+
+
+def create(db, user, title: str, tags=()) -> Task:
+    return TaskRepository.create_task(db, user.id, TaskCreate(title=title, tags=tags))
+
+
+def test_create_update_and_delete(db, user):
+    assert_cache_matches_db(db, user.id)
+
+    task = create(db, user, "Water the plants", ["home"])
+    assert_cache_matches_db(db, user.id)
+
+    TaskRepository.update_task(
+        db, task.id, TaskUpdate(title="Water the garden", is_completed=True)
+    )
+    assert_cache_matches_db(db, user.id)
+
+    TaskRepository.update_task(db, task.id, TaskUpdate(tags=["garden", "home"]))
+    assert_cache_matches_db(db, user.id)
+
+    assert TaskRepository.delete_task(db, task.id)
+    assert_cache_matches_db(db, user.id)
+
+
+def test_batch_update(db, user):
+    first = create(db, user, "Book dentist")
+    second = create(db, user, "Renew passport", ["admin"])
+    assert_cache_matches_db(db, user.id)
+
+    TaskRepository.update_tasks(
+        db,
+        user.id,
+        [
+            TaskBatchUpdateItem(
+                id=first.id, expected_version=first.version, is_completed=True
+            ),
+            TaskBatchUpdateItem(
+                id=second.id, expected_version=second.version, tags=["travel"]
+            ),
+        ],
+    )
+    assert_cache_matches_db(db, user.id)
+
+
+def test_bulk_create(db, user):
+    create(db, user, "Pay rent")
+    assert_cache_matches_db(db, user.id)
+
+    TaskRepository.bulk_create_tasks(db, user.id, ["Call mom", "Buy milk"])
+    assert_cache_matches_db(db, user.id)
+
+
+def test_import(db, user):
+    create(db, user, "Pay rent")
+    assert_cache_matches_db(db, user.id)
+
+    rows = [
+        TaskImportRow(title="Imported", tags=["old"]),
+        TaskImportRow(
+            title="Imported and done",
+            is_completed=True,
+            completed_at=datetime.now(timezone.utc),
+        ),
+    ]
+    assert TaskRepository.import_task_chunk(db, user, rows)
+    assert TaskRepository.finish_import(db, user.id, completed=True)
+    assert_cache_matches_db(db, user.id)
+
+
+def test_sync_push(db, user):
+    kept = create(db, user, "Book dentist")
+    dropped = create(db, user, "Renew passport")
+    assert_cache_matches_db(db, user.id)
+
+    results = TaskRepository.apply_sync_mutations(
+        db,
+        user.id,
+        [
+            SyncMutation(op="create", client_id="a", title="Written offline"),
+            SyncMutation(op="update", task_id=kept.id, is_completed=True),
+            SyncMutation(op="delete", task_id=dropped.id),
+        ],
+    )
+    assert [result["status"] for result in results] == ["applied"] * 3
+    assert_cache_matches_db(db, user.id)
+
+
+def test_archive(db, user):
+    task = create(db, user, "Water the plants")
+    create(db, user, "Pay rent")
+    TaskRepository.update_task(db, task.id, TaskUpdate(is_completed=True))
+    assert_cache_matches_db(db, user.id)
+
+    cutoff = datetime.now(timezone.utc) + timedelta(seconds=1)
+    while TaskRepository.archive_completed_tasks(db, cutoff):
+        pass
+    assert_cache_matches_db(db, user.id)
+
+
+def test_recurrence_materialize_and_delete(db, user):
+    rule = RecurrenceRepository.create_rule(
+        db,
+        user,
+        RecurrenceCreate(
+            title="Stand-up",
+            rule="FREQ=DAILY",
+            starts_at=datetime.now(timezone.utc) - timedelta(minutes=1),
+            tags=["work"],
+        ),
+    )
+    assert_cache_matches_db(db, user.id)
+
+    assert RecurrenceRepository.materialize_due(
+        db, datetime.now(timezone.utc) + timedelta(days=2)
+    )
+    assert_cache_matches_db(db, user.id)
+
+    assert RecurrenceRepository.delete_rule(db, rule.id)
+    assert_cache_matches_db(db, user.id)
@@ -0,0 +1,107 @@
+"""Tests for GET /tasks sparse fieldsets and the stats opt-out"""
+
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from src.repository.database import engine, read_engine
+from src.repository.repositories import TaskRepository
+from src.schemas import TaskCreate
+
+
+@contextmanager
+def recorded_statements():
+    """SQL run on either engine while the block executes"""
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement.lower())
+
+    engines = {engine, read_engine}
+    for target in engines:
+        event.listen(target, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        for target in engines:
+            event.remove(target, "before_cursor_execute", record)
+
+
+def test_unknown_or_empty_fields_are_rejected(client, auth):
+    for fields in ("id,owner", "", " , "):
+        response = client.get("/api/v1/tasks", params={"fields": fields}, headers=auth)
+        assert response.status_code == 400
+
+
+def test_sparse_fields_only(db, user, client, auth):
+    TaskRepository.create_task(db, user.id, TaskCreate(title="Buy milk", tags=["home"]))
+
+    response = client.get(
+        "/api/v1/tasks", params={"fields": "title,tags"}, headers=auth
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "tasks": [{"title": "Buy milk", "tags": ["home"]}],
+        "total": 1,
+        "completed": 0,
+        "pending": 1,
+    }
+
+
+def test_stats_opt_out_skips_count_queries(db, user, client, auth):
+    TaskRepository.create_task(db, user.id, TaskCreate(title="Buy milk"))
+
+    with recorded_statements() as statements:
+        response = client.get(
+            "/api/v1/tasks", params={"include_stats": "false"}, headers=auth
+        )
+    assert response.status_code == 200
+    assert set(response.json()) == {"tasks"}
+    assert statements and not any("count(" in sql for sql in statements)
+
+    with recorded_statements() as statements:
+        client.get("/api/v1/tasks", headers=auth)
+    assert any("count(" in sql for sql in statements)
+
+
+def test_etag_varies_per_fieldset(db, user, client, auth):
+    TaskRepository.create_task(db, user.id, TaskCreate(title="Buy milk"))
+    variants = [
+        {},
+        {"fields": "id"},
+        {"fields": "id,title"},
+        {"fields": "title,id"},
+        {"include_stats": "false"},
+    ]
+    etags = [
+        client.get("/api/v1/tasks", params=params, headers=auth).headers["etag"]
+        for params in variants
+    ]
+    assert len(set(etags)) == len(etags)
+
+    # A validator for one fieldset does not revalidate another
+    stale = client.get(
+        "/api/v1/tasks",
+        params={"fields": "id"},
+        headers={**auth, "If-None-Match": etags[2]},
+    )
+    assert stale.status_code == 200
+    fresh = client.get(
+        "/api/v1/tasks",
+        params={"fields": "id"},
+        headers={**auth, "If-None-Match": etags[1]},
+    )
+    assert fresh.status_code == 304
+
+
+def test_openapi_documents_the_sparse_shape(client):
+    schema = client.get("/openapi.json").json()
+    body = schema["paths"]["/api/v1/tasks"]["get"]["responses"]["200"]["content"]
+    refs = {ref["$ref"] for ref in body["application/json"]["schema"]["anyOf"]}
+    assert refs == {
+        "#/components/schemas/TaskListResponse",
+        "#/components/schemas/SparseTaskListResponse",
+    }
+    sparse = schema["components"]["schemas"]["SparseTaskListResponse"]
+    assert sparse["required"] == ["tasks"]
+    assert "required" not in schema["components"]["schemas"]["SparseTaskResponse"]
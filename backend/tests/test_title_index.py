@@ -0,0 +1,50 @@
+"""Tests for the in-process title index"""
+
+from src.repository.title_index import TitleIndex
+
+
+def test_find_duplicate_matches_loaded_titles():
+    index = TitleIndex()
+    found = index.find_duplicate(1, "Buy milk", lambda: [(7, "buy milk")])
+    assert found == 7
+
+
+def test_loader_runs_without_the_index_lock():
+    index = TitleIndex()
+    other_user = []
+
+    def loader():
+        # Would deadlock if the loader ran under the lock
+        other_user.append(
+            index.find_duplicate(2, "Call mom", lambda: [(3, "call mom")])
+        )
+        return [(1, "Water the plants")]
+
+    assert index.find_duplicate(1, "Pay rent", loader) is None
+    assert other_user == [3]
+
+
+def test_changes_during_load_are_applied():
+    index = TitleIndex()
+
+    def loader():
+        rows = [(1, "Water the plants"), (2, "Book dentist")]
+        index.add(1, 3, "Renew passport")
+        index.remove(1, 2)
+        return rows
+
+    assert index.find_duplicate(1, "Something else", loader) is None
+    assert index.find_duplicate(1, "Renew passport", lambda: []) == 3
+    assert index.find_duplicate(1, "Book dentist", lambda: []) is None
+
+
+def test_invalidate_during_load_is_not_cached():
+    index = TitleIndex()
+
+    def loader():
+        index.invalidate(1)
+        return [(1, "Water the plants")]
+
+    assert index.find_duplicate(1, "Water the plants", loader) == 1
+    # Rebuilt from the new loader instead of the stale titles
+    assert index.find_duplicate(1, "Water the plants", lambda: []) is None